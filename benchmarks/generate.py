@@ -0,0 +1,243 @@
+from collections.abc import Iterator, AsyncIterator
+from datetime import date, timedelta
+from pathlib import Path
+from random import Random
+import argparse
+import asyncio
+import typing as t
+import uuid
+
+from src.shemas import CreateWelderShema, CreateWelderCertificationShema, CreateNDTShema
+from src.utils.funcs import validate_insert, validate_method, validate_certification_number, validate_name
+
+
+KLEYMO_ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+KLEYMO_SPACE = len(KLEYMO_ALPHABET) ** 4
+KLEYMO_STEP = 1_299_709
+
+FIRST_NAMES = ["Ахмед", "Иван", "Руслан", "Магомед", "Сергей", "Алексей", "Тимур", "Олег", "Murat", "Ali"]
+LAST_NAMES = ["Иванов", "Магомедов", "Петров", "Алиев", "Сидоров", "Гасанов", "Kaya", "Yilmaz", "Смирнов", "Кузнецов"]
+NATIONS = ["RUS", "TUR", "UZB", "KAZ", "AZE"]
+
+METHODS = ["РД", "РАД", "МП", "ААД", "АФ", "ЗН", "НИ"]
+INSERTS = ["В1", "В2", "В3", None]
+CENTERS = ["АЦСТ", "АЦСМ", "ЦСП", "АЦ"]
+GTD = ["ГДО", "КО", "МО", "НГДО", "ОХНВП", "ПТО", "СК", "СМ", "ТТ"]
+MATERIALS_GROUPS = ["M01", "M02", "M03", "M04", "M05", "M07", "M11"]
+POSITIONS = ["H1", "H2", "PA", "PB", "PC", "PD", "PE", "PF", "PG", "J-L045", "H-L045"]
+JOB_TITLES = ["Сварщик", "Сварщик ручной сварки", "Электрогазосварщик"]
+DETAILS_TYPES = ["Т", "Л", "Т+Л"]
+JOINT_TYPES = ["СС", "УШ", "ТС", "НС"]
+COMPANIES = ["Ренессанс", "Велесстрой", "Стройтрансгаз", "Газпром инвест"]
+SUBCOMPANIES = ["Участок 1", "Участок 2", "Участок 3", None]
+PROJECTS = ["Амурский ГПЗ", "Арктик СПГ", "Балтийский ГХК", "Северный поток"]
+NDT_TYPES = ["РК", "УЗК", "ВИК"]
+
+START_DATE = date(2015, 1, 1)
+
+
+def dump_kleymo(index: int) -> str:
+    value = (index * KLEYMO_STEP) % KLEYMO_SPACE
+    kleymo = ""
+
+    for _ in range(4):
+        value, rest = divmod(value, len(KLEYMO_ALPHABET))
+        kleymo = KLEYMO_ALPHABET[rest] + kleymo
+
+    return kleymo
+
+
+def dump_uuid(random: Random) -> uuid.UUID:
+    return uuid.UUID(int=random.getrandbits(128), version=4)
+
+
+def generate_welder(random: Random, index: int) -> dict[str, t.Any]:
+    name = f"{random.choice(LAST_NAMES)} {random.choice(FIRST_NAMES)}"
+
+    assert validate_name(name)
+
+    return {
+        "ident": dump_uuid(random),
+        "kleymo": dump_kleymo(index),
+        "name": name,
+        "birthday": START_DATE - timedelta(days=random.randint(8000, 20000)),
+        "passport_number": f"{random.choice('ABCDEFGHJKT')}{random.randint(10_000_000, 99_999_999)}",
+        "sicil": str(random.randint(1_000_000, 9_999_999)),
+        "nation": random.choice(NATIONS),
+        "status": random.choice([0, 0, 0, 1])
+    }
+
+
+def generate_certification(random: Random, kleymo: str, number: int) -> dict[str, t.Any]:
+    method = random.choice(METHODS)
+    insert = random.choice(INSERTS)
+    certification_number = f"{random.choice(CENTERS)}-{random.randint(1, 99)}{random.choice('АБВГ')}-{random.choice(['I', 'II', 'III', 'IV'])}-{number % 100_000:05d}"
+    certification_date = START_DATE + timedelta(days=random.randint(0, 3650))
+    expiration_date = certification_date + timedelta(days=730)
+    thikness_from = random.choice([None, 1.0, 2.0, 3.0, 4.0, 6.0])
+    diameter_from = random.choice([None, 14.0, 25.0, 57.0, 159.0])
+    rod_from = random.choice([None, None, None, 8.0, 12.0])
+
+    assert validate_method(method)
+    assert validate_certification_number(certification_number)
+    assert insert is None or validate_insert(insert)
+
+    return {
+        "ident": dump_uuid(random),
+        "kleymo": kleymo,
+        "job_title": random.choice(JOB_TITLES),
+        "certification_number": certification_number,
+        "certification_date": certification_date,
+        "expiration_date": expiration_date,
+        "expiration_date_fact": expiration_date - timedelta(days=random.choice([0, 0, 0, 90, 365])),
+        "insert": insert,
+        "certification_type": random.choice(["первичная", "периодическая", "дополнительная"]),
+        "company": random.choice(COMPANIES),
+        "gtd": random.sample(GTD, random.randint(1, 4)),
+        "method": method,
+        "details_type": random.sample(DETAILS_TYPES, 1),
+        "joint_type": random.sample(JOINT_TYPES, random.randint(1, 2)),
+        "welding_materials_groups": random.sample(MATERIALS_GROUPS, random.randint(1, 3)),
+        "welding_materials": random.choice(["LB-52U", "OK 46.00", "УОНИ-13/55", None]),
+        "details_thikness_from": thikness_from,
+        "details_thikness_before": thikness_from + random.choice([6.0, 12.0, 24.0]) if thikness_from else None,
+        "outer_diameter_from": diameter_from,
+        "outer_diameter_before": random.choice([None, 1420.0]) if diameter_from else None,
+        "welding_position": ", ".join(random.sample(POSITIONS, random.randint(1, 3))),
+        "connection_type": random.choice(["с подкладкой", "без подкладки", None]),
+        "rod_diameter_from": rod_from,
+        "rod_diameter_before": rod_from + 28.0 if rod_from else None,
+        "rod_axis_position": None,
+        "weld_type": random.choice(["СШ", "УШ"]),
+        "joint_layer": random.choice(["ос", "ос, кр", None]),
+        "sdr": None,
+        "automation_level": random.choice(["ручная", "механизированная"]),
+        "details_diameter_from": None,
+        "details_diameter_before": None,
+        "welding_equipment": None
+    }
+
+
+def generate_ndt(random: Random, kleymo: str, welding_date: date) -> dict[str, t.Any]:
+    total_welded = round(random.uniform(1, 40), 1)
+    total_ndt = round(total_welded * random.uniform(0.1, 1), 1)
+    rejected = round(total_ndt * random.choice([0, 0, 0, 0.05, 0.2]), 1)
+
+    return {
+        "ident": dump_uuid(random),
+        "kleymo": kleymo,
+        "company": random.choice(COMPANIES),
+        "subcompany": random.choice(SUBCOMPANIES),
+        "project": random.choice(PROJECTS),
+        "welding_date": welding_date,
+        "ndt_type": random.choice(NDT_TYPES),
+        "total_welded": total_welded,
+        "total_ndt": total_ndt,
+        "accepted": round(total_ndt - rejected, 1),
+        "rejected": rejected
+    }
+
+
+def generate(
+        welders: int,
+        certifications_per_welder: int,
+        ndts_per_welder: int,
+        seed: int = 0,
+        offset: int = 0
+    ) -> Iterator[tuple[str, dict[str, t.Any]]]:
+    if offset + welders > KLEYMO_SPACE:
+        raise ValueError(f"At most {KLEYMO_SPACE} welders can be generated")
+
+    random = Random(seed)
+    number = 0
+
+    for index in range(offset, offset + welders):
+        welder = generate_welder(random, index)
+
+        yield ("welders", welder)
+
+        for _ in range(random.randint(max(certifications_per_welder - 1, 0), certifications_per_welder + 1)):
+            number += 1
+            yield ("welder_certifications", generate_certification(random, welder["kleymo"], number))
+
+        welding_date = START_DATE + timedelta(days=random.randint(0, 365))
+
+        for _ in range(random.randint(max(ndts_per_welder - 2, 0), ndts_per_welder + 2)):
+            welding_date += timedelta(days=random.randint(1, 14))
+            yield ("ndts", generate_ndt(random, welder["kleymo"], welding_date))
+
+
+SHEMAS = {
+    "welders": CreateWelderShema,
+    "welder_certifications": CreateWelderCertificationShema,
+    "ndts": CreateNDTShema
+}
+
+
+def write(output: Path, rows: Iterator[tuple[str, dict[str, t.Any]]]) -> dict[str, int]:
+    output.mkdir(parents=True, exist_ok=True)
+
+    files = {name: open(output / f"{name}.ndjson", "w", encoding="utf-8") for name in SHEMAS}
+    counts = dict.fromkeys(SHEMAS, 0)
+
+    try:
+        for name, row in rows:
+            files[name].write(SHEMAS[name].model_validate(row).model_dump_json())
+            files[name].write("\n")
+            counts[name] += 1
+    finally:
+        for file in files.values():
+            file.close()
+
+    return counts
+
+
+async def _iter_lines(path: Path) -> AsyncIterator[bytes]:
+    with open(path, "rb") as file:
+        for line in file:
+            yield line
+
+
+async def load(output: Path) -> dict[str, dict[str, t.Any]]:
+    from src.database import session_maker
+    from src.services.db_services import WelderDBService, WelderCertificationDBService, NDTDBService
+
+    result = {}
+
+    for name, service in (
+        ("welders", WelderDBService),
+        ("welder_certifications", WelderCertificationDBService),
+        ("ndts", NDTDBService)
+    ):
+        async with session_maker() as session:
+            summary = await service(session).bulk_add(_iter_lines(output / f"{name}.ndjson"))
+
+        result[name] = {"inserted": summary["inserted"], "rejected": summary["rejected"]}
+
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic dataset")
+    parser.add_argument("--welders", type=int, default=10_000)
+    parser.add_argument("--certifications-per-welder", type=int, default=3)
+    parser.add_argument("--ndts-per-welder", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--offset", type=int, default=0, help="first welder index, for datasets that must not overlap")
+    parser.add_argument("--output", type=Path, default=Path("benchmarks/data"))
+    parser.add_argument("--load", action="store_true", help="bulk load the generated files into the database")
+    args = parser.parse_args()
+
+    counts = write(
+        args.output,
+        generate(args.welders, args.certifications_per_welder, args.ndts_per_welder, args.seed, args.offset)
+    )
+
+    print(counts)
+
+    if args.load:
+        print(asyncio.run(load(args.output)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+from collections.abc import Callable, Awaitable
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import count, islice
+from pathlib import Path
+from random import Random
+from time import perf_counter
+import subprocess
+import argparse
+import asyncio
+import typing as t
+import json
+
+import httpx
+
+from benchmarks.generate import generate, KLEYMO_SPACE
+
+
+type RequestFactory = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+@dataclass
+class Scenario:
+    name: str
+    request: RequestFactory
+    requests: int | None = None
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    latencies: list[float] = field(default_factory=list)
+    statuses: dict[int, int] = field(default_factory=dict)
+    errors: int = 0
+    elapsed: float = 0.0
+
+
+    def dump(self) -> dict[str, t.Any]:
+        latencies = sorted(self.latencies)
+
+        return {
+            "requests": len(latencies),
+            "errors": self.errors,
+            "statuses": {str(status): amount for status, amount in sorted(self.statuses.items())},
+            "throughput": len(latencies) / self.elapsed if self.elapsed else 0.0,
+            "mean": sum(latencies) / len(latencies) if latencies else None,
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": latencies[-1] if latencies else None
+        }
+
+
+def percentile(latencies: list[float], rank: float) -> float | None:
+    if not latencies:
+        return None
+
+    index = max(int(round(rank / 100 * len(latencies) + 0.5)) - 1, 0)
+
+    return latencies[min(index, len(latencies) - 1)]
+
+
+def load_sample(data: Path, name: str, size: int) -> list[dict[str, t.Any]]:
+    with open(data / f"{name}.ndjson", "rb") as file:
+        return [json.loads(line) for line in islice(file, size)]
+
+
+def build_scenarios(data: Path, sample_size: int, seed: int) -> list[Scenario]:
+    welders = load_sample(data, "welders", sample_size)
+    certifications = load_sample(data, "welder_certifications", sample_size)
+    ndts = load_sample(data, "ndts", sample_size)
+
+    random = Random(seed)
+
+    def pick(rows: list[dict[str, t.Any]], key: str) -> Callable[[], t.Any]:
+        return lambda: random.choice(rows)[key]
+
+    welder_ident = pick(welders, "ident")
+    welder_kleymo = pick(welders, "kleymo")
+    certification_ident = pick(certifications, "ident")
+    ndt_ident = pick(ndts, "ident")
+
+    fresh = generate(sample_size, 1, 1, seed=seed + 1, offset=KLEYMO_SPACE - sample_size)
+    fresh_rows: dict[str, list[dict[str, t.Any]]] = {"welders": [], "welder_certifications": [], "ndts": []}
+
+    for name, row in fresh:
+        fresh_rows[name].append(json.loads(json.dumps(row, default=str)))
+
+    created = {name: iter(rows) for name, rows in fresh_rows.items()}
+    deleted = {name: iter(rows) for name, rows in fresh_rows.items()}
+
+    def joint() -> dict[str, t.Any]:
+        certification = random.choice(certifications)
+        thikness = certification["details_thikness_from"]
+
+        return {
+            "method": certification["method"],
+            "details_thikness": thikness + 1 if thikness is not None else None,
+            "as_of": certification["certification_date"]
+        }
+
+    scenarios = [
+        Scenario("GET /welders/{ident}", lambda client, _: client.get(f"/welders/{welder_kleymo()}")),
+        Scenario("GET /welders/{ident}/profile", lambda client, _: client.get(f"/welders/{welder_kleymo()}/profile")),
+        Scenario("POST /welders/qualified", lambda client, _: client.post("/welders/qualified", json=joint())),
+        Scenario("POST /welders/batch", lambda client, _: client.post("/welders/batch", json={"idents": [welder_ident() for _ in range(50)]})),
+        Scenario("POST /welders/select", lambda client, i: client.post("/welders/select", json={"limit": 100, "offset": i % 50 * 100})),
+        Scenario("POST /welders/select keyset", lambda client, _: client.post("/welders/select", json={"limit": 100, "cursor": None, "count_mode": "none"})),
+        Scenario("POST /welders/export", lambda client, _: client.post("/welders/export", json={"kleymos": [welder_kleymo() for _ in range(20)]})),
+        Scenario("PATCH /welders/{ident}", lambda client, _: client.patch(f"/welders/{welder_ident()}", json={"nation": random.choice(["RUS", "TUR"])})),
+        Scenario("GET /welder-certifications/{ident}", lambda client, _: client.get(f"/welder-certifications/{certification_ident()}")),
+        Scenario("POST /welder-certifications/batch", lambda client, _: client.post("/welder-certifications/batch", json={"idents": [certification_ident() for _ in range(50)]})),
+        Scenario("POST /welder-certifications/select", lambda client, i: client.post("/welder-certifications/select", json={"limit": 1000, "offset": i % 20 * 1000})),
+        Scenario("POST /welder-certifications/select filtered", lambda client, _: client.post("/welder-certifications/select", json={"kleymos": [welder_kleymo() for _ in range(10)], "limit": 100})),
+        Scenario("POST /welder-certifications/export", lambda client, _: client.post("/welder-certifications/export?format=csv", json={"kleymos": [welder_kleymo() for _ in range(20)]})),
+        Scenario("PATCH /welder-certifications/{ident}", lambda client, _: client.patch(f"/welder-certifications/{certification_ident()}", json={"company": random.choice(["Ренессанс", "Велесстрой"])})),
+        Scenario("GET /ndts/{ident}", lambda client, _: client.get(f"/ndts/{ndt_ident()}")),
+        Scenario("POST /ndts/batch", lambda client, _: client.post("/ndts/batch", json={"idents": [ndt_ident() for _ in range(50)]})),
+        Scenario("POST /ndts/select", lambda client, i: client.post("/ndts/select", json={"limit": 1000, "offset": i % 20 * 1000})),
+        Scenario("POST /ndts/export", lambda client, _: client.post("/ndts/export", json={"kleymos": [welder_kleymo() for _ in range(20)]})),
+        Scenario("PATCH /ndts/{ident}", lambda client, _: client.patch(f"/ndts/{ndt_ident()}", json={"ndt_type": random.choice(["РК", "УЗК"])})),
+        Scenario("GET /stats/pool", lambda client, _: client.get("/stats/pool")),
+        Scenario("GET /stats/cache", lambda client, _: client.get("/stats/cache")),
+        Scenario("GET /stats/certification-index", lambda client, _: client.get("/stats/certification-index")),
+    ]
+
+    for name, path in (("welders", "/welders"), ("welder_certifications", "/welder-certifications"), ("ndts", "/ndts")):
+        rows = fresh_rows[name]
+        half = len(rows) // 2
+
+        scenarios.extend([
+            Scenario(f"POST {path}", lambda client, _, name=name, path=path: client.post(path, json=next(created[name])), requests=half),
+            Scenario(
+                f"POST {path}/bulk",
+                lambda client, i, rows=rows, half=half, path=path: client.post(f"{path}/bulk", json=rows[half + i * 10:half + i * 10 + 10]),
+                requests=(len(rows) - half) // 10
+            ),
+        ])
+
+    scenarios.append(
+        Scenario(
+            "PUT /welder-certifications/bulk",
+            lambda client, i: client.put("/welder-certifications/bulk", json=fresh_rows["welder_certifications"][i * 10:i * 10 + 10]),
+            requests=len(fresh_rows["welder_certifications"]) // 10
+        )
+    )
+
+    for name, path in (("ndts", "/ndts"), ("welder_certifications", "/welder-certifications"), ("welders", "/welders")):
+        scenarios.append(
+            Scenario(
+                f"DELETE {path}/{{ident}}",
+                lambda client, _, name=name, path=path: client.delete(f"{path}/{next(deleted[name])['ident']}"),
+                requests=len(fresh_rows[name])
+            )
+        )
+
+    return scenarios
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, requests: int, concurrency: int) -> ScenarioResult:
+    result = ScenarioResult(scenario.name)
+    counter = count()
+    total = scenario.requests if scenario.requests is not None else requests
+
+    async def worker() -> None:
+        while (index := next(counter)) < total:
+            start = perf_counter()
+
+            try:
+                response = await scenario.request(client, index)
+                await response.aread()
+            except (httpx.HTTPError, StopIteration):
+                result.errors += 1
+                continue
+
+            result.latencies.append(perf_counter() - start)
+            result.statuses[response.status_code] = result.statuses.get(response.status_code, 0) + 1
+
+            if response.status_code >= 400:
+                result.errors += 1
+
+    start = perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    result.elapsed = perf_counter() - start
+
+    return result
+
+
+def get_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict[str, t.Any], baseline: dict[str, t.Any]) -> None:
+    for name, result in current["results"].items():
+        previous = baseline["results"].get(name)
+
+        if not previous or not previous["p95"] or not result["p95"]:
+            continue
+
+        print(f"{name:<50} p95 {previous['p95'] * 1000:8.2f}ms -> {result['p95'] * 1000:8.2f}ms ({result['p95'] / previous['p95'] - 1:+.1%})")
+
+
+async def run(args: argparse.Namespace) -> dict[str, t.Any]:
+    scenarios = build_scenarios(args.data, args.sample_size, args.seed)
+
+    if args.only:
+        scenarios = [scenario for scenario in scenarios if any(el in scenario.name for el in args.only)]
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    results = {}
+
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        for scenario in scenarios:
+            result = await run_scenario(client, scenario, args.requests, args.concurrency)
+            results[scenario.name] = result.dump()
+
+            print(
+                f"{scenario.name:<50} {results[scenario.name]['throughput']:9.1f} req/s "
+                f"p50 {(results[scenario.name]['p50'] or 0) * 1000:8.2f}ms "
+                f"p95 {(results[scenario.name]['p95'] or 0) * 1000:8.2f}ms "
+                f"p99 {(results[scenario.name]['p99'] or 0) * 1000:8.2f}ms "
+                f"errors {result.errors}"
+            )
+
+    return {
+        "commit": get_commit(),
+        "started_at": datetime.now().isoformat(),
+        "config": {
+            "base_url": args.base_url,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "sample_size": args.sample_size,
+            "seed": args.seed
+        },
+        "results": results
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Drive every v1 endpoint concurrently and record latency percentiles")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000/api/v1")
+    parser.add_argument("--data", type=Path, default=Path("benchmarks/data"), help="directory written by benchmarks.generate")
+    parser.add_argument("--requests", type=int, default=500, help="requests per read scenario")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--sample-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--only", nargs="*", help="run scenarios whose name contains any of these")
+    parser.add_argument("--output", type=Path, default=Path("benchmarks/results"))
+    parser.add_argument("--compare", type=Path, help="previous result file to compare p95 against")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    path = args.output / f"{datetime.now():%Y%m%d-%H%M%S}-{(result['commit'] or 'unknown')[:8]}.json"
+    path.write_text(json.dumps(result, indent=2))
+
+    print(f"saved {path}")
+
+    if args.compare:
+        compare(result, json.loads(args.compare.read_text()))
+
+
+if __name__ == "__main__":
+    main()
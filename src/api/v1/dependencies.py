@@ -1,64 +1,190 @@
-from uuid import UUID
-from re import fullmatch
-import typing as t
-
-from pydantic import ValidationError, BaseModel
-from fastapi import HTTPException, Request
-
-from src.shemas import *
-
-
-__all__ = [
-    "validate_ident_dependency",
-    "validate_welder_ident_dependency",
-    "InputValidationDependency"
-]
-
-
-def validate_ident_dependency(ident: str) -> str:
-    try:
-        UUID(ident)
-    
-    except:
-        raise HTTPException(
-            400,
-            "Invalid ident"
-        )
-
-    return ident
-
-
-def validate_welder_ident_dependency(ident: str) -> str:
-    if not fullmatch(r"[A-Z0-9]{4}", ident):
-        try:
-            UUID(ident)
-        
-        except:
-            raise HTTPException(
-                400,
-                "Invalid ident"
-            )
-    
-    return ident
-
-
-def base_error_handler(err: ValidationError) -> t.NoReturn:
-    
-    raise HTTPException(
-        400,
-        err.args
-    )
-
-
-class InputValidationDependency[T: BaseModel]:
-    def __init__(self, validation_shema: type[T]) -> None:
-        self.shema = validation_shema
-        
-
-    async def execute(self, request: Request, err_handler: t.Callable[[ValidationError], t.NoReturn] = base_error_handler):
-        try:
-            return self.shema.model_validate(
-                await request.json()
-            )
-        except ValidationError as e:
-            err_handler(e)
+from collections.abc import AsyncIterator
+from uuid import UUID
+from re import fullmatch
+import typing as t
+
+from pydantic import ValidationError, BaseModel
+from fastapi import HTTPException, Request, Query
+import orjson
+
+from src.shemas import *
+from src.models import Base
+from src.settings import Settings
+from src.utils.slow_queries import set_query_filters
+
+
+__all__ = [
+    "validate_ident_dependency",
+    "validate_welder_ident_dependency",
+    "InputValidationDependency",
+    "FieldsDependency",
+    "bulk_rows_dependency"
+]
+
+
+def validate_ident_dependency(ident: str) -> str:
+    try:
+        UUID(ident)
+    
+    except:
+        raise HTTPException(
+            400,
+            "Invalid ident"
+        )
+
+    return ident
+
+
+def validate_welder_ident_dependency(ident: str) -> str:
+    if not fullmatch(r"[A-Z0-9]{4}", ident):
+        try:
+            UUID(ident)
+        
+        except:
+            raise HTTPException(
+                400,
+                "Invalid ident"
+            )
+    
+    return ident
+
+
+def base_error_handler(err: ValidationError) -> t.NoReturn:
+    
+    raise HTTPException(
+        400,
+        err.args
+    )
+
+
+def _raise_too_large(max_size: int) -> t.NoReturn:
+    raise HTTPException(
+        413,
+        f"Request body exceeds {max_size} bytes"
+    )
+
+
+def _check_content_length(request: Request, max_size: int) -> None:
+    content_length = request.headers.get("content-length")
+
+    if content_length and content_length.isdigit() and int(content_length) > max_size:
+        _raise_too_large(max_size)
+
+
+async def read_body(request: Request, max_size: int) -> bytes:
+    _check_content_length(request, max_size)
+
+    chunks: list[bytes] = []
+    size = 0
+
+    async for chunk in request.stream():
+        size += len(chunk)
+
+        if size > max_size:
+            _raise_too_large(max_size)
+
+        chunks.append(chunk)
+
+    return b"".join(chunks)
+
+
+class InputValidationDependency[T: BaseModel]:
+    def __init__(self, validation_shema: type[T]) -> None:
+        self.shema = validation_shema
+        
+
+    async def execute(self, request: Request, err_handler: t.Callable[[ValidationError], t.NoReturn] = base_error_handler):
+        body = await read_body(request, Settings.MAX_BODY_SIZE())
+
+        try:
+            result = self.shema.model_validate_json(body)
+        except ValidationError as e:
+            err_handler(e)
+
+        set_query_filters(result)
+
+        return result
+
+
+class FieldsDependency[T: BaseModel]:
+    def __init__(self, shema: type[T], model: type[Base]) -> None:
+        columns = set(model.__table__.columns.keys())
+
+        self.fields = [field for field in shema.model_fields if field in columns]
+
+
+    def execute(self, fields: str | None = Query(default=None, description="comma separated list of columns to return")) -> list[str] | None:
+        if fields == None:
+            return None
+
+        requested = {field.strip() for field in fields.split(",") if field.strip()}
+
+        if not requested:
+            return None
+
+        unknown = requested.difference(self.fields)
+
+        if unknown:
+            raise HTTPException(
+                400,
+                f"Unknown fields: {', '.join(sorted(unknown))}"
+            )
+
+        return [field for field in self.fields if field in requested]
+
+
+async def _iter_items(items: list[t.Any]) -> AsyncIterator[t.Any]:
+    for item in items:
+        yield item
+
+
+class NDJSONRows:
+    def __init__(self, request: Request, max_size: int) -> None:
+        self.request = request
+        self.max_size = max_size
+        self.truncated = False
+
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        buffer = b""
+        size = 0
+
+        async for chunk in self.request.stream():
+            size += len(chunk)
+
+            if size > self.max_size:
+                self.truncated = True
+                return
+
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+
+            for line in lines:
+                if line.strip():
+                    yield line
+
+        if buffer.strip():
+            yield buffer
+
+
+async def bulk_rows_dependency(request: Request) -> AsyncIterator[t.Any]:
+    if request.headers.get("content-type", "").startswith(("application/x-ndjson", "application/jsonl")):
+        _check_content_length(request, Settings.MAX_BULK_BODY_SIZE())
+
+        return NDJSONRows(request, Settings.MAX_BULK_BODY_SIZE())
+
+    try:
+        items = orjson.loads(await read_body(request, Settings.MAX_BULK_BODY_SIZE()))
+    except orjson.JSONDecodeError as e:
+        raise HTTPException(
+            400,
+            f"Invalid json: {e}"
+        )
+
+    if not isinstance(items, list):
+        raise HTTPException(
+            400,
+            "Bulk payload must be a json array or ndjson"
+        )
+
+    return _iter_items(items)
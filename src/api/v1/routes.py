@@ -1,289 +1,867 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
-from naks_library.exc import *
-
-from src.services.db_services import *
-from src.api.v1.dependencies import *
-from src.database import get_session
-from src.shemas import *
-
-
-v1_router = APIRouter()
-
-
-"""
-=========================================================================================
-welder routes
-=========================================================================================
-"""
-
-
-@v1_router.post("/welders")
-async def add_welder(
-    data: CreateWelderShema = Depends(InputValidationDependency(CreateWelderShema).execute), 
-    session: AsyncSession = Depends(get_session)
-    ) -> dict[str, str]:
-    service = WelderDBService(session)
-
-    try:
-        await service.add(data)
-    except CreateDBException as e:
-        raise HTTPException(400, e.message)
-
-    return {
-        "detail": "welder added"
-    }
-
-
-@v1_router.get("/welders/{ident}")
-async def get_welder(ident: str = Depends(validate_welder_ident_dependency), session: AsyncSession = Depends(get_session)) -> WelderShema:
-    service = WelderDBService(session)
-
-    try:
-        result = await service.get(ident)
-    except GetDBException as e:
-        raise HTTPException(400, e.args)
-
-    if not result:
-        raise HTTPException(
-            detail=f"welder ({ident}) not found",
-            status_code=400
-        )
-
-    return result
-
-
-@v1_router.post("/welders/select")
-async def select_welders(
-    filters: WelderRequestShema = Depends(InputValidationDependency(WelderRequestShema).execute),
-    session: AsyncSession = Depends(get_session)
-    ) -> dict[str, list[WelderShema] | int]:
-    service = WelderDBService(session)
-
-    try:
-        result = await service.get_many(filters)
-    except GetDBException as e:
-        raise HTTPException(400, e.args)
-
-    return {
-        "result": result[0],
-        "count": result[1]
-    }
-
-
-@v1_router.patch("/welders/{ident}")
-async def update_welder(
-    ident: str = Depends(validate_welder_ident_dependency), 
-    data: UpdateWelderShema = Depends(InputValidationDependency(UpdateWelderShema).execute), 
-    session: AsyncSession = Depends(get_session)
-    ) -> dict[str, str]:
-    service = WelderDBService(session)
-
-    try:
-        await service.update(ident, data)
-    except UpdateDBException as e:
-        raise HTTPException(400, e.args)
-
-    return {
-        "detail": f"welder ({ident}) updated"
-    }
-
-
-@v1_router.delete("/welders/{ident}")
-async def delete_welder(ident: str = Depends(validate_welder_ident_dependency), session: AsyncSession = Depends(get_session)):
-    service = WelderDBService(session)
-
-    try:
-        await service.delete(ident)
-    except DeleteDBException as e:
-        raise HTTPException(400, e.args)
-
-    return {
-        "detail": f"welder ({ident}) removed"
-    }
-
-
-"""
-=========================================================================================
-welder certification routes
-=========================================================================================
-"""
-
-
-@v1_router.post("/welder-certifications")
-async def add_welder_certification(
-    data: CreateWelderCertificationShema = Depends(InputValidationDependency(CreateWelderCertificationShema).execute), 
-    session: AsyncSession = Depends(get_session)
-    ) -> dict[str, str]:
-
-    service = WelderCertificationDBService(session)
-
-    try:
-        await service.add(data)
-    except CreateDBException as e:
-        raise HTTPException(400, e.message)
-    
-    return {
-        "detail": "welder certification added"
-    }
-
-
-@v1_router.get("/welder-certifications/{ident}")
-async def get_welder_certification(ident: str = Depends(validate_ident_dependency), session: AsyncSession = Depends(get_session)) -> WelderCertificationShema:
-    service = WelderCertificationDBService(session)
-
-    try:
-        result = await service.get(ident)
-    except GetDBException as e:
-        raise HTTPException(400, e.args)
-
-    if not result:
-        raise HTTPException(
-            detail=f"welder certification ({ident}) not found",
-            status_code=400
-        )
-
-    return result
-
-
-@v1_router.post("/welder-certifications/select")
-async def select_welder_certifications(
-    filters: WelderCertificationRequestShema = Depends(InputValidationDependency(WelderCertificationRequestShema).execute),
-    session: AsyncSession = Depends(get_session)
-    ) -> dict[str, list[WelderCertificationShema] | int]:
-    service = WelderCertificationDBService(session)
-
-    try:
-        result = await service.get_many(filters)
-    except GetDBException as e:
-        raise HTTPException(400, e.args)
-
-    return {
-        "result": result[0],
-        "count": result[1]
-    }
-
-
-@v1_router.patch("/welder-certifications/{ident}")
-async def update_welder_certification( 
-    ident: str = Depends(validate_ident_dependency), 
-    data: UpdateWelderCertificationShema = Depends(InputValidationDependency(UpdateWelderCertificationShema).execute),
-    session: AsyncSession = Depends(get_session)
-    ):
-    service = WelderCertificationDBService(session)
-
-    try:
-        await service.update(ident, data)
-    except UpdateDBException as e:
-        raise HTTPException(400, e.args)
-    
-    return {
-        "detail": f"welder certification ({ident}) updated"
-    }
-
-
-@v1_router.delete("/welder-certifications/{ident}")
-async def delete_welder_certification(ident: str = Depends(validate_ident_dependency), session: AsyncSession = Depends(get_session)):
-    
-    service = WelderCertificationDBService(session)
-
-    try:
-        await service.delete(ident)
-    except DeleteDBException as e:
-        raise HTTPException(400, e.args)
-    
-    return {
-        "detail": f"welder certification ({ident}) removed"
-    }
-
-
-"""
-=========================================================================================
-ndt routes
-=========================================================================================
-"""
-
-
-@v1_router.post("/ndts")
-async def add_ndt(
-    data: CreateNDTShema = Depends(InputValidationDependency(CreateNDTShema).execute), 
-    session: AsyncSession = Depends(get_session)
-    ) -> dict[str, str]:
-    service = NDTDBService(session)
-
-    try:
-        await service.add(data)
-    except CreateDBException as e:
-        raise HTTPException(400, e.message)
-
-    return {
-        "detail": f"ndt added"
-    }
-
-
-@v1_router.get("/ndts/{ident}")
-async def get_ndt(ident: str = Depends(validate_ident_dependency), session: AsyncSession = Depends(get_session)) -> NDTShema:
-    service = NDTDBService(session)
-
-    try:
-        result = await service.get(ident)
-    except GetDBException as e:
-        raise HTTPException(400, e.args)
-    
-    if not result:
-        raise HTTPException(
-            detail="ndt not found",
-            status_code=400
-        )
-
-    return result
-
-
-@v1_router.post("/ndts/select")
-async def select_ndts(
-    filters: NDTRequestShema = Depends(InputValidationDependency(NDTRequestShema).execute),
-    session: AsyncSession = Depends(get_session)
-    ) -> dict[str, list[NDTShema] | int]:
-    service = NDTDBService(session)
-
-    try:
-        result = await service.get_many(filters)
-    except GetDBException as e:
-        raise HTTPException(400, e.args)
-
-    return {
-        "result": result[0],
-        "count": result[1]
-    }
-
-
-@v1_router.patch("/ndts/{ident}")
-async def update_ndt(
-    ident: str = Depends(validate_ident_dependency), 
-    data: UpdateNDTShema = Depends(InputValidationDependency(UpdateNDTShema).execute), 
-    session: AsyncSession = Depends(get_session)
-    ):    
-    service = NDTDBService(session)
-
-    try:
-        await service.update(ident, data)
-    except UpdateDBException as e:
-        raise HTTPException(400, e.args)
-
-    return {
-        "detail": f"ndt ({ident}) updated"
-    }
-
-
-@v1_router.delete("/ndts/{ident}")
-async def delete_ndt(ident: str = Depends(validate_ident_dependency), session: AsyncSession = Depends(get_session)):    
-    service = NDTDBService(session)
-
-    try:
-        await service.delete(ident)
-    except DeleteDBException as e:
-        raise HTTPException(400, e.args)
-
-    return {
-        "detail": f"ndt ({ident}) removed"
-    }
+from datetime import date
+from re import fullmatch
+from uuid import UUID
+import typing as t
+
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse, FileResponse
+from starlette.background import BackgroundTask
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from naks_library.exc import *
+
+from src.services.db_services import *
+from src.services.certification_index import certification_index
+from src.services.registry_import import RegistryImport, get_rejected_path
+from src.services.jobs import job_runner
+from src.api.v1.dependencies import *
+from src.database import get_session, get_read_session, get_read_session_maker, get_pool_stats, engine, replica_engine, replica_health
+from src.utils.export import export_response
+from src.utils.registry import get_registry_format
+from src.utils.responses import select_response, fields_response, changes_response
+from src.utils.etags import make_etag, etag_matches, not_modified_response, dump_fields_version
+from src.shemas import *
+from src.models import WelderModel, WelderCertificationModel, NDTModel
+
+
+v1_router = APIRouter()
+
+
+"""
+=========================================================================================
+welder routes
+=========================================================================================
+"""
+
+
+@v1_router.post("/welders")
+async def add_welder(
+    data: CreateWelderShema = Depends(InputValidationDependency(CreateWelderShema).execute), 
+    session: AsyncSession = Depends(get_session)
+    ) -> dict[str, str]:
+    service = WelderDBService(session)
+
+    try:
+        await service.add(data)
+    except CreateDBException as e:
+        raise HTTPException(400, e.message)
+
+    return {
+        "detail": "welder added"
+    }
+
+
+@v1_router.post("/welders/bulk")
+async def add_welders_bulk(
+    rows: t.AsyncIterator[t.Any] = Depends(bulk_rows_dependency),
+    chunk_size: int | None = Query(default=None, gt=0),
+    session: AsyncSession = Depends(get_session)
+    ) -> dict[str, int | list[dict[str, t.Any]]]:
+    service = WelderDBService(session)
+
+    return await service.bulk_add(rows, chunk_size)
+
+
+@v1_router.get("/welders/changes")
+async def get_welders_changes(
+    cursor: str | None = Query(default=None),
+    limit: int = Query(default=1000, ge=1, le=10000),
+    session: AsyncSession = Depends(get_read_session)
+    ) -> Response:
+    service = WelderDBService(session)
+
+    try:
+        result = await service.changes(cursor, limit)
+    except (GetDBException, ValueError) as e:
+        raise HTTPException(400, e.args)
+
+    return changes_response(WelderShema, *result)
+
+
+@v1_router.get("/welders/{ident}")
+async def get_welder(
+    request: Request,
+    response: Response,
+    ident: str = Depends(validate_welder_ident_dependency), 
+    session: AsyncSession = Depends(get_read_session),
+    fields: list[str] | None = Depends(FieldsDependency(WelderShema, WelderModel).execute)
+    ) -> WelderShema:
+    service = WelderDBService(session)
+
+    try:
+        if fields:
+            result = await service.get_fields_with_version(ident, fields)
+        else:
+            result = await service.get_with_version(ident)
+    except GetDBException as e:
+        raise HTTPException(400, e.args)
+
+    if not result:
+        raise HTTPException(
+            detail=f"welder ({ident}) not found",
+            status_code=400
+        )
+
+    etag = make_etag(dump_fields_version(result[1], fields))
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified_response(etag)
+
+    if fields:
+        return fields_response(result[0], headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+
+    return result[0]
+
+
+@v1_router.get("/welders/{ident}/profile")
+async def get_welder_profile(
+    ident: str = Depends(validate_welder_ident_dependency), 
+    ndt_from: date | None = None,
+    ndt_before: date | None = None,
+    session: AsyncSession = Depends(get_read_session)
+    ) -> WelderProfileShema:
+    service = WelderDBService(session)
+
+    try:
+        result = await service.get_profile(ident, ndt_from, ndt_before)
+    except GetDBException as e:
+        raise HTTPException(400, e.args)
+
+    if not result:
+        raise HTTPException(
+            detail=f"welder ({ident}) not found",
+            status_code=400
+        )
+
+    return result
+
+
+@v1_router.post("/welders/qualified")
+async def get_qualified_welders(
+    joint: JointRequestShema = Depends(InputValidationDependency(JointRequestShema).execute),
+    session: AsyncSession = Depends(get_read_session)
+    ) -> list[QualifiedWelderShema]:
+    service = WelderDBService(session)
+
+    try:
+        result = await service.get_qualified(joint)
+    except GetDBException as e:
+        raise HTTPException(400, e.args)
+
+    return result
+
+
+@v1_router.post("/welders/batch")
+async def get_welders_batch(
+    data: IdentsRequestShema = Depends(InputValidationDependency(IdentsRequestShema).execute),
+    session: AsyncSession = Depends(get_read_session)
+    ) -> dict[str, list[WelderShema | None] | list[str]]:
+    service = WelderDBService(session)
+
+    try:
+        result = await service.get_by_idents(data.idents)
+    except GetDBException as e:
+        raise HTTPException(400, e.args)
+
+    return {
+        "result": result,
+        "missing": [ident for ident, el in zip(data.idents, result) if el is None]
+    }
+
+
+@v1_router.post("/welders/select")
+async def select_welders(
+    request: Request,
+    filters: WelderRequestShema = Depends(InputValidationDependency(WelderRequestShema).execute),
+    session: AsyncSession = Depends(get_read_session),
+    fields: list[str] | None = Depends(FieldsDependency(WelderShema, WelderModel).execute)
+    ) -> dict[str, list[WelderShema] | int | str | None]:
+    service = WelderDBService(session)
+
+    try:
+        if "if-none-match" in request.headers:
+            etag = make_etag(dump_fields_version(await service.select_version(filters), fields))
+
+            if etag_matches(request.headers["if-none-match"], etag):
+                return not_modified_response(etag)
+
+        if fields:
+            result = await service.select_fields(filters, fields)
+        else:
+            result = await service.select(filters)
+    except (GetDBException, ValueError) as e:
+        raise HTTPException(400, e.args)
+
+    return select_response(
+        WelderShema,
+        result[0],
+        result[1],
+        result[2],
+        keyset=filters.is_keyset,
+        headers={"ETag": make_etag(dump_fields_version(result[3], fields))},
+        fields=fields
+    )
+
+
+@v1_router.post("/welders/export")
+async def export_welders(
+    filters: WelderRequestShema = Depends(InputValidationDependency(WelderRequestShema).execute),
+    format: t.Literal["ndjson", "csv"] = "ndjson",
+    session_maker: async_sessionmaker[AsyncSession] = Depends(get_read_session_maker)
+    ) -> StreamingResponse:
+    session = session_maker()
+    service = WelderDBService(session)
+
+    return export_response(
+        service.export(filters),
+        format,
+        list(WelderShema.model_fields),
+        "welders",
+        BackgroundTask(session.close)
+    )
+
+
+@v1_router.post("/welders/export/jobs", status_code=202)
+async def export_welders_job(
+    filters: WelderRequestShema = Depends(InputValidationDependency(WelderRequestShema).execute),
+    format: t.Literal["ndjson", "csv"] = "ndjson"
+    ) -> dict[str, UUID]:
+    ident = await job_runner.submit(
+        "export",
+        {"entity": "welders", "format": format, "filters": filters.model_dump(mode="json", exclude_unset=True)}
+    )
+
+    return {
+        "ident": ident
+    }
+
+
+@v1_router.patch("/welders/{ident}")
+async def update_welder(
+    ident: str = Depends(validate_welder_ident_dependency), 
+    data: UpdateWelderShema = Depends(InputValidationDependency(UpdateWelderShema).execute), 
+    session: AsyncSession = Depends(get_session)
+    ) -> dict[str, str]:
+    service = WelderDBService(session)
+
+    try:
+        await service.update(ident, data)
+    except UpdateDBException as e:
+        raise HTTPException(400, e.args)
+
+    return {
+        "detail": f"welder ({ident}) updated"
+    }
+
+
+@v1_router.delete("/welders/{ident}")
+async def delete_welder(ident: str = Depends(validate_welder_ident_dependency), session: AsyncSession = Depends(get_session)):
+    service = WelderDBService(session)
+
+    try:
+        await service.delete(ident)
+    except DeleteDBException as e:
+        raise HTTPException(400, e.args)
+
+    return {
+        "detail": f"welder ({ident}) removed"
+    }
+
+
+"""
+=========================================================================================
+welder certification routes
+=========================================================================================
+"""
+
+
+@v1_router.post("/welder-certifications")
+async def add_welder_certification(
+    data: CreateWelderCertificationShema = Depends(InputValidationDependency(CreateWelderCertificationShema).execute), 
+    session: AsyncSession = Depends(get_session)
+    ) -> dict[str, str]:
+
+    service = WelderCertificationDBService(session)
+
+    try:
+        await service.add(data)
+    except CreateDBException as e:
+        raise HTTPException(400, e.message)
+    
+    return {
+        "detail": "welder certification added"
+    }
+
+
+@v1_router.post("/welder-certifications/bulk")
+async def add_welder_certifications_bulk(
+    rows: t.AsyncIterator[t.Any] = Depends(bulk_rows_dependency),
+    chunk_size: int | None = Query(default=None, gt=0),
+    session: AsyncSession = Depends(get_session)
+    ) -> dict[str, int | list[dict[str, t.Any]]]:
+    service = WelderCertificationDBService(session)
+
+    return await service.bulk_add(rows, chunk_size)
+
+
+@v1_router.put("/welder-certifications/bulk")
+async def upsert_welder_certifications_bulk(
+    rows: t.AsyncIterator[t.Any] = Depends(bulk_rows_dependency),
+    chunk_size: int | None = Query(default=None, gt=0),
+    session: AsyncSession = Depends(get_session)
+    ) -> dict[str, int | list[dict[str, t.Any]]]:
+    service = WelderCertificationDBService(session)
+
+    return await service.bulk_upsert(rows, chunk_size)
+
+
+@v1_router.post("/welder-certifications/export/jobs", status_code=202)
+async def export_welder_certifications_job(
+    filters: WelderCertificationRequestShema = Depends(InputValidationDependency(WelderCertificationRequestShema).execute),
+    format: t.Literal["ndjson", "csv"] = "ndjson"
+    ) -> dict[str, UUID]:
+    ident = await job_runner.submit(
+        "export",
+        {"entity": "welder_certifications", "format": format, "filters": filters.model_dump(mode="json", exclude_unset=True)}
+    )
+
+    return {
+        "ident": ident
+    }
+
+
+@v1_router.post("/welder-certifications/import")
+async def import_welder_certifications(
+    file: UploadFile,
+    format: t.Literal["csv", "xlsx"] | None = Query(default=None),
+    chunk_size: int | None = Query(default=None, gt=0),
+    session: AsyncSession = Depends(get_session)
+    ) -> dict[str, t.Any]:
+    try:
+        registry_import = RegistryImport(session, "welder_certifications", chunk_size)
+
+        return await registry_import.run(file.file, format or get_registry_format(file.filename))
+    except ValueError as e:
+        raise HTTPException(400, e.args)
+
+
+@v1_router.get("/welder-certifications/changes")
+async def get_welder_certifications_changes(
+    cursor: str | None = Query(default=None),
+    limit: int = Query(default=1000, ge=1, le=10000),
+    session: AsyncSession = Depends(get_read_session)
+    ) -> Response:
+    service = WelderCertificationDBService(session)
+
+    try:
+        result = await service.changes(cursor, limit)
+    except (GetDBException, ValueError) as e:
+        raise HTTPException(400, e.args)
+
+    return changes_response(WelderCertificationShema, *result)
+
+
+@v1_router.get("/welder-certifications/{ident}")
+async def get_welder_certification(
+    request: Request,
+    response: Response,
+    ident: str = Depends(validate_ident_dependency), 
+    session: AsyncSession = Depends(get_read_session),
+    fields: list[str] | None = Depends(FieldsDependency(WelderCertificationShema, WelderCertificationModel).execute)
+    ) -> WelderCertificationShema:
+    service = WelderCertificationDBService(session)
+
+    try:
+        if fields:
+            result = await service.get_fields_with_version(ident, fields)
+        else:
+            result = await service.get_with_version(ident)
+    except GetDBException as e:
+        raise HTTPException(400, e.args)
+
+    if not result:
+        raise HTTPException(
+            detail=f"welder certification ({ident}) not found",
+            status_code=400
+        )
+
+    etag = make_etag(dump_fields_version(result[1], fields))
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified_response(etag)
+
+    if fields:
+        return fields_response(result[0], headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+
+    return result[0]
+
+
+@v1_router.post("/welder-certifications/batch")
+async def get_welder_certifications_batch(
+    data: IdentsRequestShema = Depends(InputValidationDependency(IdentsRequestShema).execute),
+    session: AsyncSession = Depends(get_read_session)
+    ) -> dict[str, list[WelderCertificationShema | None] | list[str]]:
+    service = WelderCertificationDBService(session)
+
+    try:
+        result = await service.get_by_idents(data.idents)
+    except GetDBException as e:
+        raise HTTPException(400, e.args)
+
+    return {
+        "result": result,
+        "missing": [ident for ident, el in zip(data.idents, result) if el is None]
+    }
+
+
+@v1_router.post("/welder-certifications/select")
+async def select_welder_certifications(
+    request: Request,
+    filters: WelderCertificationRequestShema = Depends(InputValidationDependency(WelderCertificationRequestShema).execute),
+    session: AsyncSession = Depends(get_read_session),
+    fields: list[str] | None = Depends(FieldsDependency(WelderCertificationShema, WelderCertificationModel).execute)
+    ) -> dict[str, list[WelderCertificationShema] | int | str | None]:
+    service = WelderCertificationDBService(session)
+
+    try:
+        if "if-none-match" in request.headers:
+            etag = make_etag(dump_fields_version(await service.select_version(filters), fields))
+
+            if etag_matches(request.headers["if-none-match"], etag):
+                return not_modified_response(etag)
+
+        if fields:
+            result = await service.select_fields(filters, fields)
+        else:
+            result = await service.select(filters)
+    except (GetDBException, ValueError) as e:
+        raise HTTPException(400, e.args)
+
+    return select_response(
+        WelderCertificationShema,
+        result[0],
+        result[1],
+        result[2],
+        keyset=filters.is_keyset,
+        headers={"ETag": make_etag(dump_fields_version(result[3], fields))},
+        fields=fields
+    )
+
+
+@v1_router.post("/welder-certifications/export")
+async def export_welder_certifications(
+    filters: WelderCertificationRequestShema = Depends(InputValidationDependency(WelderCertificationRequestShema).execute),
+    format: t.Literal["ndjson", "csv"] = "ndjson",
+    session_maker: async_sessionmaker[AsyncSession] = Depends(get_read_session_maker)
+    ) -> StreamingResponse:
+    session = session_maker()
+    service = WelderCertificationDBService(session)
+
+    return export_response(
+        service.export(filters),
+        format,
+        list(WelderCertificationShema.model_fields),
+        "welder_certifications",
+        BackgroundTask(session.close)
+    )
+
+
+@v1_router.post("/welder-certifications/import/jobs", status_code=202)
+async def import_welder_certifications_job(
+    file: UploadFile,
+    format: t.Literal["csv", "xlsx"] | None = Query(default=None),
+    chunk_size: int | None = Query(default=None, gt=0)
+    ) -> dict[str, UUID]:
+    try:
+        format = format or get_registry_format(file.filename)
+    except ValueError as e:
+        raise HTTPException(400, e.args)
+
+    ident = await job_runner.submit(
+        "import",
+        {"entity": "welder_certifications", "format": format, "chunk_size": chunk_size},
+        {"upload": file.file}
+    )
+
+    return {
+        "ident": ident
+    }
+
+
+@v1_router.patch("/welder-certifications/{ident}")
+async def update_welder_certification( 
+    ident: str = Depends(validate_ident_dependency), 
+    data: UpdateWelderCertificationShema = Depends(InputValidationDependency(UpdateWelderCertificationShema).execute),
+    session: AsyncSession = Depends(get_session)
+    ):
+    service = WelderCertificationDBService(session)
+
+    try:
+        await service.update(ident, data)
+    except UpdateDBException as e:
+        raise HTTPException(400, e.args)
+    
+    return {
+        "detail": f"welder certification ({ident}) updated"
+    }
+
+
+@v1_router.delete("/welder-certifications/{ident}")
+async def delete_welder_certification(ident: str = Depends(validate_ident_dependency), session: AsyncSession = Depends(get_session)):
+    
+    service = WelderCertificationDBService(session)
+
+    try:
+        await service.delete(ident)
+    except DeleteDBException as e:
+        raise HTTPException(400, e.args)
+    
+    return {
+        "detail": f"welder certification ({ident}) removed"
+    }
+
+
+"""
+=========================================================================================
+ndt routes
+=========================================================================================
+"""
+
+
+@v1_router.post("/ndts")
+async def add_ndt(
+    data: CreateNDTShema = Depends(InputValidationDependency(CreateNDTShema).execute), 
+    session: AsyncSession = Depends(get_session)
+    ) -> dict[str, str]:
+    service = NDTDBService(session)
+
+    try:
+        await service.add(data)
+    except CreateDBException as e:
+        raise HTTPException(400, e.message)
+
+    return {
+        "detail": f"ndt added"
+    }
+
+
+@v1_router.post("/ndts/bulk")
+async def add_ndts_bulk(
+    rows: t.AsyncIterator[t.Any] = Depends(bulk_rows_dependency),
+    chunk_size: int | None = Query(default=None, gt=0),
+    session: AsyncSession = Depends(get_session)
+    ) -> dict[str, int | list[dict[str, t.Any]]]:
+    service = NDTDBService(session)
+
+    return await service.bulk_add(rows, chunk_size)
+
+
+@v1_router.post("/ndts/export/jobs", status_code=202)
+async def export_ndts_job(
+    filters: NDTRequestShema = Depends(InputValidationDependency(NDTRequestShema).execute),
+    format: t.Literal["ndjson", "csv"] = "ndjson"
+    ) -> dict[str, UUID]:
+    ident = await job_runner.submit(
+        "export",
+        {"entity": "ndts", "format": format, "filters": filters.model_dump(mode="json", exclude_unset=True)}
+    )
+
+    return {
+        "ident": ident
+    }
+
+
+@v1_router.post("/ndts/import")
+async def import_ndts(
+    file: UploadFile,
+    format: t.Literal["csv", "xlsx"] | None = Query(default=None),
+    chunk_size: int | None = Query(default=None, gt=0),
+    session: AsyncSession = Depends(get_session)
+    ) -> dict[str, t.Any]:
+    try:
+        registry_import = RegistryImport(session, "ndts", chunk_size)
+
+        return await registry_import.run(file.file, format or get_registry_format(file.filename))
+    except ValueError as e:
+        raise HTTPException(400, e.args)
+
+
+@v1_router.get("/ndts/changes")
+async def get_ndts_changes(
+    cursor: str | None = Query(default=None),
+    limit: int = Query(default=1000, ge=1, le=10000),
+    session: AsyncSession = Depends(get_read_session)
+    ) -> Response:
+    service = NDTDBService(session)
+
+    try:
+        result = await service.changes(cursor, limit)
+    except (GetDBException, ValueError) as e:
+        raise HTTPException(400, e.args)
+
+    return changes_response(NDTShema, *result)
+
+
+@v1_router.get("/ndts/{ident}")
+async def get_ndt(
+    request: Request,
+    response: Response,
+    ident: str = Depends(validate_ident_dependency), 
+    session: AsyncSession = Depends(get_read_session),
+    fields: list[str] | None = Depends(FieldsDependency(NDTShema, NDTModel).execute)
+    ) -> NDTShema:
+    service = NDTDBService(session)
+
+    try:
+        if fields:
+            result = await service.get_fields_with_version(ident, fields)
+        else:
+            result = await service.get_with_version(ident)
+    except GetDBException as e:
+        raise HTTPException(400, e.args)
+
+    if not result:
+        raise HTTPException(
+            detail="ndt not found",
+            status_code=400
+        )
+
+    etag = make_etag(dump_fields_version(result[1], fields))
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified_response(etag)
+
+    if fields:
+        return fields_response(result[0], headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+
+    return result[0]
+
+
+@v1_router.post("/ndts/batch")
+async def get_ndts_batch(
+    data: IdentsRequestShema = Depends(InputValidationDependency(IdentsRequestShema).execute),
+    session: AsyncSession = Depends(get_read_session)
+    ) -> dict[str, list[NDTShema | None] | list[str]]:
+    service = NDTDBService(session)
+
+    try:
+        result = await service.get_by_idents(data.idents)
+    except GetDBException as e:
+        raise HTTPException(400, e.args)
+
+    return {
+        "result": result,
+        "missing": [ident for ident, el in zip(data.idents, result) if el is None]
+    }
+
+
+@v1_router.post("/ndts/select")
+async def select_ndts(
+    request: Request,
+    filters: NDTRequestShema = Depends(InputValidationDependency(NDTRequestShema).execute),
+    session: AsyncSession = Depends(get_read_session),
+    fields: list[str] | None = Depends(FieldsDependency(NDTShema, NDTModel).execute)
+    ) -> dict[str, list[NDTShema] | int | str | None]:
+    service = NDTDBService(session)
+
+    try:
+        if "if-none-match" in request.headers:
+            etag = make_etag(dump_fields_version(await service.select_version(filters), fields))
+
+            if etag_matches(request.headers["if-none-match"], etag):
+                return not_modified_response(etag)
+
+        if fields:
+            result = await service.select_fields(filters, fields)
+        else:
+            result = await service.select(filters)
+    except (GetDBException, ValueError) as e:
+        raise HTTPException(400, e.args)
+
+    return select_response(
+        NDTShema,
+        result[0],
+        result[1],
+        result[2],
+        keyset=filters.is_keyset,
+        headers={"ETag": make_etag(dump_fields_version(result[3], fields))},
+        fields=fields
+    )
+
+
+@v1_router.post("/ndts/export")
+async def export_ndts(
+    filters: NDTRequestShema = Depends(InputValidationDependency(NDTRequestShema).execute),
+    format: t.Literal["ndjson", "csv"] = "ndjson",
+    session_maker: async_sessionmaker[AsyncSession] = Depends(get_read_session_maker)
+    ) -> StreamingResponse:
+    session = session_maker()
+    service = NDTDBService(session)
+
+    return export_response(
+        service.export(filters),
+        format,
+        list(NDTShema.model_fields),
+        "ndts",
+        BackgroundTask(session.close)
+    )
+
+
+@v1_router.post("/ndts/import/jobs", status_code=202)
+async def import_ndts_job(
+    file: UploadFile,
+    format: t.Literal["csv", "xlsx"] | None = Query(default=None),
+    chunk_size: int | None = Query(default=None, gt=0)
+    ) -> dict[str, UUID]:
+    try:
+        format = format or get_registry_format(file.filename)
+    except ValueError as e:
+        raise HTTPException(400, e.args)
+
+    ident = await job_runner.submit(
+        "import",
+        {"entity": "ndts", "format": format, "chunk_size": chunk_size},
+        {"upload": file.file}
+    )
+
+    return {
+        "ident": ident
+    }
+
+
+@v1_router.patch("/ndts/{ident}")
+async def update_ndt(
+    ident: str = Depends(validate_ident_dependency), 
+    data: UpdateNDTShema = Depends(InputValidationDependency(UpdateNDTShema).execute), 
+    session: AsyncSession = Depends(get_session)
+    ):    
+    service = NDTDBService(session)
+
+    try:
+        await service.update(ident, data)
+    except UpdateDBException as e:
+        raise HTTPException(400, e.args)
+
+    return {
+        "detail": f"ndt ({ident}) updated"
+    }
+
+
+@v1_router.delete("/ndts/{ident}")
+async def delete_ndt(ident: str = Depends(validate_ident_dependency), session: AsyncSession = Depends(get_session)):    
+    service = NDTDBService(session)
+
+    try:
+        await service.delete(ident)
+    except DeleteDBException as e:
+        raise HTTPException(400, e.args)
+
+    return {
+        "detail": f"ndt ({ident}) removed"
+    }
+
+
+"""
+=========================================================================================
+job routes
+=========================================================================================
+"""
+
+
+@v1_router.get("/jobs/{ident}")
+async def get_job(ident: str = Depends(validate_ident_dependency)) -> JobShema:
+    result = await job_runner.get(ident)
+
+    if not result:
+        raise HTTPException(
+            detail=f"job ({ident}) not found",
+            status_code=400
+        )
+
+    return JobShema.model_validate(result, from_attributes=True)
+
+
+@v1_router.post("/jobs/{ident}/cancel")
+async def cancel_job(ident: str = Depends(validate_ident_dependency)):
+    status = await job_runner.cancel(UUID(ident))
+
+    if not status:
+        raise HTTPException(
+            detail=f"job ({ident}) not found or already finished",
+            status_code=400
+        )
+
+    return {
+        "detail": f"job ({ident}) cancellation requested"
+    }
+
+
+@v1_router.get("/jobs/{ident}/result")
+async def get_job_result(ident: str = Depends(validate_ident_dependency)):
+    result = await job_runner.get(ident)
+
+    if not result:
+        raise HTTPException(
+            detail=f"job ({ident}) not found",
+            status_code=400
+        )
+
+    if result["status"] != "succeeded":
+        raise HTTPException(
+            detail=f"job ({ident}) is {result['status']}",
+            status_code=400
+        )
+
+    if "file" in result["result"]:
+        return StreamingResponse(
+            job_runner.read_file(result["ident"], "result"),
+            media_type=result["result"]["media_type"],
+            headers={
+                "Content-Disposition": f'attachment; filename="{result["result"]["file"]}"'
+            }
+        )
+
+    return result["result"]
+
+
+"""
+=========================================================================================
+service routes
+=========================================================================================
+"""
+
+
+@v1_router.get("/imports/rejected/{name}")
+async def get_import_rejected_rows(name: str) -> FileResponse:
+    if not fullmatch(r"[a-z_]+-[0-9a-f]{32}\.csv", name) or not get_rejected_path(name).is_file():
+        raise HTTPException(
+            detail=f"rejected rows file ({name}) not found",
+            status_code=400
+        )
+
+    return FileResponse(get_rejected_path(name), media_type="text/csv; charset=utf-8", filename=name)
+
+
+@v1_router.get("/stats/pool")
+async def get_db_pool_stats() -> dict[str, t.Any]:
+    stats = get_pool_stats(engine)
+
+    if replica_engine:
+        stats["replica"] = get_pool_stats(replica_engine) | replica_health.stats()
+
+    return stats
+
+
+@v1_router.get("/stats/cache")
+async def get_services_cache_stats() -> dict[str, dict[str, int | float]]:
+    return get_cache_stats()
+
+
+@v1_router.get("/stats/certification-index")
+async def get_certification_index_stats() -> dict[str, t.Any]:
+    return certification_index.stats()
@@ -1,9 +1,85 @@
-from fastapi import FastAPI
-
-from src.api.v1.routes import v1_router
-
-
-app = FastAPI()
-
-app.include_router(v1_router, prefix="/api/v1")
-
+from contextlib import asynccontextmanager
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+
+from src.api.v1.routes import v1_router
+from src.services.certification_index import certification_index
+from src.services.jobs import job_runner
+from src.services.registry_import import import_pool
+from src.database import engine, replica_engine
+from src.utils.metrics import MetricsMiddleware, metrics, instrument_engine
+from src.utils.slow_queries import SlowQueryLog, QueryContextMiddleware
+from src.utils.compression import CompressionMiddleware
+from src.settings import Settings
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    tasks = []
+
+    if certification_index.enabled:
+        async with engine.connect() as conn:
+            await certification_index.build(conn)
+
+        tasks.append(asyncio.create_task(
+            certification_index.keep_fresh(engine, Settings.CERTIFICATION_INDEX_REFRESH())
+        ))
+
+    if Settings.JOBS_ENABLED():
+        await job_runner.start()
+
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+
+        await job_runner.stop()
+        import_pool.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
+
+app.include_router(v1_router, prefix="/api/v1")
+
+
+if Settings.COMPRESSION_ENABLED():
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=Settings.COMPRESSION_MIN_SIZE(),
+        levels=Settings.COMPRESSION_LEVELS(),
+        offload_size=Settings.COMPRESSION_OFFLOAD_SIZE(),
+        prefix="/api/v1"
+    )
+
+
+if Settings.METRICS_ENABLED():
+    app.add_middleware(MetricsMiddleware)
+
+    for metrics_engine in (engine, replica_engine):
+        if metrics_engine:
+            instrument_engine(metrics_engine)
+
+
+    @app.get("/metrics", include_in_schema=False)
+    async def get_metrics() -> PlainTextResponse:
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+if Settings.SLOW_QUERY_THRESHOLD() > 0:
+    slow_query_log = SlowQueryLog(
+        Settings.SLOW_QUERY_LOG_PATH(),
+        Settings.SLOW_QUERY_THRESHOLD(),
+        Settings.SLOW_QUERY_LOG_MAX_BYTES(),
+        Settings.SLOW_QUERY_LOG_BACKUPS(),
+        Settings.SLOW_QUERY_EXPLAIN_LIMIT(),
+        Settings.SLOW_QUERY_REDACT()
+    )
+
+    app.add_middleware(QueryContextMiddleware)
+
+    for slow_query_engine in (engine, replica_engine):
+        if slow_query_engine:
+            slow_query_log.instrument(slow_query_engine)
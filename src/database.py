@@ -1,28 +1,240 @@
-from collections.abc import AsyncGenerator
-
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy import NullPool
-
-from src.settings import Settings
-
-
-DB_URL = "postgresql+asyncpg://{0}:{1}@{2}:{3}/{4}".format(
-    Settings.USER(), 
-    Settings.DB_PASSWORD(), 
-    Settings.HOST(), 
-    Settings.PORT(), 
-    Settings.DB_NAME()
-)
-
-
-engine = create_async_engine(
-    DB_URL,
-    poolclass=NullPool
-)
-
-session_maker = async_sessionmaker(engine, autocommit=False, autoflush=False, expire_on_commit=False)
-
-
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    async with session_maker() as session:
-        yield session
+from collections.abc import AsyncGenerator
+from time import perf_counter, monotonic
+import asyncio
+import typing as t
+
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncEngine, create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool, AsyncAdaptedQueuePool
+from sqlalchemy.util.queue import AsyncAdaptedQueue, Empty
+from sqlalchemy import exc, text
+from fastapi import Request
+
+from src.settings import Settings
+from src.utils.metrics import record_pool_wait
+
+
+DB_URL = "postgresql+asyncpg://{0}:{1}@{2}:{3}/{4}".format(
+    Settings.USER(),
+    Settings.DB_PASSWORD(),
+    Settings.HOST(),
+    Settings.PORT(),
+    Settings.DB_NAME()
+)
+
+REPLICA_DB_URL = "postgresql+asyncpg://{0}:{1}@{2}:{3}/{4}".format(
+    Settings.USER(),
+    Settings.DB_PASSWORD(),
+    Settings.REPLICA_HOST(),
+    Settings.REPLICA_PORT(),
+    Settings.DB_NAME()
+) if Settings.REPLICA_HOST() else None
+
+READ_PRIMARY_HEADER = "X-Read-Primary"
+
+
+class PoolWaitStats:
+    def __init__(self) -> None:
+        self.acquired = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+
+    def add(self, wait: float) -> None:
+        self.acquired += 1
+        self.wait_total += wait
+
+        if wait > self.wait_max:
+            self.wait_max = wait
+
+
+class TimedQueue(AsyncAdaptedQueue):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+
+    def get(self, block: bool = True, timeout: float | None = None):
+        start = perf_counter()
+
+        try:
+            connection = super().get(block, timeout)
+        except Empty:
+            if block:
+                self.wait_stats.timeouts += 1
+
+            raise
+
+        wait = perf_counter() - start
+
+        self.wait_stats.add(wait)
+        record_pool_wait(wait)
+
+        return connection
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    _queue_class = TimedQueue
+
+
+    @property
+    def wait_stats(self) -> PoolWaitStats:
+        return self._pool.wait_stats
+
+
+    def _create_connection(self):
+        connection = super()._create_connection()
+
+        self.wait_stats.add(0.0)
+        record_pool_wait(0.0)
+
+        return connection
+
+
+def create_engine(url: str) -> AsyncEngine:
+    if Settings.DB_POOL_CLASS() == "null":
+        return create_async_engine(
+            url,
+            poolclass=NullPool
+        )
+
+    return create_async_engine(
+        url,
+        poolclass=TimedQueuePool,
+        pool_size=Settings.DB_POOL_SIZE(),
+        max_overflow=Settings.DB_MAX_OVERFLOW(),
+        pool_recycle=Settings.DB_POOL_RECYCLE(),
+        pool_pre_ping=Settings.DB_POOL_PRE_PING(),
+        pool_timeout=Settings.DB_POOL_TIMEOUT()
+    )
+
+
+def get_pool_stats(engine: AsyncEngine) -> dict[str, t.Any]:
+    pool = engine.pool
+
+    if not isinstance(pool, TimedQueuePool):
+        return {
+            "pool_class": type(pool).__name__
+        }
+
+    wait_stats = pool.wait_stats
+
+    return {
+        "pool_class": type(pool).__name__,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+        "acquired": wait_stats.acquired,
+        "timeouts": wait_stats.timeouts,
+        "wait_total": wait_stats.wait_total,
+        "wait_avg": wait_stats.wait_total / wait_stats.acquired if wait_stats.acquired else 0.0,
+        "wait_max": wait_stats.wait_max
+    }
+
+
+class ReplicaHealth:
+    def __init__(self, engine: AsyncEngine, max_lag: float, check_interval: float) -> None:
+        self.engine = engine
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.healthy = False
+        self.lag: float | None = None
+        self.error: str | None = None
+        self.checked_at: float | None = None
+        self._lock = asyncio.Lock()
+
+
+    @property
+    def usable(self) -> bool:
+        return self.healthy and self.lag is not None and self.lag <= self.max_lag
+
+
+    async def ensure_checked(self) -> bool:
+        if self.checked_at is not None and monotonic() - self.checked_at < self.check_interval:
+            return self.usable
+
+        if self._lock.locked():
+            return self.usable
+
+        async with self._lock:
+            await self.check()
+
+        return self.usable
+
+
+    async def check(self) -> None:
+        try:
+            async with asyncio.timeout(self.check_interval), self.engine.connect() as conn:
+                self.lag = float(await conn.scalar(text(
+                    "SELECT CASE "
+                    "WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+                    "END"
+                )))
+
+            self.healthy = True
+            self.error = None
+
+        except (exc.DBAPIError, exc.TimeoutError, TimeoutError, OSError) as e:
+            self.healthy = False
+            self.error = str(e)
+
+        finally:
+            self.checked_at = monotonic()
+
+
+    def stats(self) -> dict[str, t.Any]:
+        return {
+            "healthy": self.healthy,
+            "usable": self.usable,
+            "lag": self.lag,
+            "max_lag": self.max_lag,
+            "error": self.error
+        }
+
+
+engine = create_engine(DB_URL)
+
+session_maker = async_sessionmaker(engine, autocommit=False, autoflush=False, expire_on_commit=False)
+
+replica_engine = create_engine(REPLICA_DB_URL) if REPLICA_DB_URL else None
+
+replica_session_maker = async_sessionmaker(
+    replica_engine,
+    autocommit=False,
+    autoflush=False, 
+    expire_on_commit=False
+) if replica_engine else None
+
+replica_health = ReplicaHealth(
+    replica_engine,
+    Settings.REPLICA_MAX_LAG(),
+    Settings.REPLICA_CHECK_INTERVAL()
+) if replica_engine else None
+
+
+async def get_read_session_maker(request: Request) -> async_sessionmaker[AsyncSession]:
+    if replica_session_maker is None:
+        return session_maker
+
+    if request.headers.get(READ_PRIMARY_HEADER, "").lower() in ("1", "true", "yes"):
+        return session_maker
+
+    if await replica_health.ensure_checked():
+        return replica_session_maker
+
+    return session_maker
+
+
+async def get_session() -> AsyncGenerator[AsyncSession, None]:
+    async with session_maker() as session:
+        yield session
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    maker = await get_read_session_maker(request)
+
+    async with maker() as session:
+        yield session
@@ -0,0 +1,37 @@
+"""job files
+
+Revision ID: 0b6e3f9d2a71
+Revises: f2b8d4a6c913
+Create Date: 2024-09-12 10:17:05.482913
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0b6e3f9d2a71"
+down_revision: Union[str, None] = "f2b8d4a6c913"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_file_table",
+        sa.Column("job_ident", sa.UUID(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("seq", sa.Integer(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["job_ident"], ["job_table.ident"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("job_ident", "name", "seq"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("job_file_table")
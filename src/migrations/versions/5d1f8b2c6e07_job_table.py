@@ -0,0 +1,69 @@
+"""job table
+
+Revision ID: 5d1f8b2c6e07
+Revises: e8a3c7f21b90
+Create Date: 2024-08-12 15:03:27.640118
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5d1f8b2c6e07"
+down_revision: Union[str, None] = "e8a3c7f21b90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_table",
+        sa.Column("ident", sa.UUID(), nullable=False),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column(
+            "params", postgresql.JSONB(astext_type=sa.Text()), nullable=False
+        ),
+        sa.Column("progress", sa.BigInteger(), nullable=False),
+        sa.Column("total", sa.BigInteger(), nullable=True),
+        sa.Column(
+            "result", postgresql.JSONB(astext_type=sa.Text()), nullable=True
+        ),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column("cancel_requested", sa.Boolean(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("ident"),
+    )
+    op.create_index(
+        "job_queue_idx",
+        "job_table",
+        ["created_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'queued'"),
+    )
+    op.create_index(
+        "job_running_idx",
+        "job_table",
+        ["heartbeat_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'running'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("job_running_idx", table_name="job_table")
+    op.drop_index("job_queue_idx", table_name="job_table")
+    op.drop_table("job_table")
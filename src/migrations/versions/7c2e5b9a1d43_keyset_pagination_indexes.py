@@ -0,0 +1,50 @@
+"""keyset pagination indexes
+
+Revision ID: 7c2e5b9a1d43
+Revises: 1002600231f1
+Create Date: 2024-07-15 10:12:44.218905
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7c2e5b9a1d43"
+down_revision: Union[str, None] = "1002600231f1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "welder_certification_keyset_idx",
+            "welder_certification_table",
+            ["expiration_date_fact", "ident"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ndt_keyset_idx",
+            "ndt_table",
+            ["welding_date", "ident"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ndt_keyset_idx",
+            table_name="ndt_table",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "welder_certification_keyset_idx",
+            table_name="welder_certification_table",
+            postgresql_concurrently=True,
+        )
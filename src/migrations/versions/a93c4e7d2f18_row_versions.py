@@ -0,0 +1,175 @@
+"""row versions
+
+Revision ID: a93c4e7d2f18
+Revises: 5d1f8b2c6e07
+Create Date: 2024-08-26 09:48:13.502671
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a93c4e7d2f18"
+down_revision: Union[str, None] = "5d1f8b2c6e07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+CURRENT_VERSION = "pg_current_xact_id()::text::bigint"
+
+BACKFILL_BATCH_SIZE = 10000
+
+TABLES = {
+    "welder_table": "welder_version_idx",
+    "welder_certification_table": "welder_certification_version_idx",
+    "ndt_table": "ndt_version_idx",
+}
+
+
+def backfill_versions(table: str) -> None:
+    conn = op.get_bind()
+    last = None
+
+    while True:
+        idents = conn.execute(
+            sa.text(
+                f"SELECT ident FROM {table} "
+                + ("WHERE ident > :last " if last else "")
+                + "ORDER BY ident LIMIT :limit"
+            ),
+            {"last": last, "limit": BACKFILL_BATCH_SIZE},
+        ).scalars().all()
+
+        if not idents:
+            break
+
+        conn.execute(
+            sa.text(
+                f"UPDATE {table} SET version = {CURRENT_VERSION} "
+                "WHERE ident BETWEEN :first AND :last AND version IS NULL"
+            ),
+            {"first": idents[0], "last": idents[-1]},
+        )
+
+        last = idents[-1]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tombstone_table",
+        sa.Column("entity", sa.String(), nullable=False),
+        sa.Column(
+            "version",
+            sa.BigInteger(),
+            server_default=sa.text(CURRENT_VERSION),
+            nullable=False,
+        ),
+        sa.Column("ident", sa.UUID(), nullable=False),
+        sa.Column(
+            "deleted_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("entity", "version", "ident"),
+    )
+
+    op.execute(
+        "CREATE OR REPLACE FUNCTION track_row_version() RETURNS trigger AS $$ "
+        "BEGIN "
+        "IF TG_OP = 'UPDATE' AND NEW IS NOT DISTINCT FROM OLD THEN "
+        "RETURN NEW; "
+        "END IF; "
+        f"NEW.version := {CURRENT_VERSION}; "
+        "NEW.updated_at := now(); "
+        "RETURN NEW; "
+        "END; "
+        "$$ LANGUAGE plpgsql"
+    )
+    op.execute(
+        "CREATE OR REPLACE FUNCTION record_tombstone() RETURNS trigger AS $$ "
+        "BEGIN "
+        "INSERT INTO tombstone_table (entity, ident) "
+        "VALUES (TG_TABLE_NAME, OLD.ident) ON CONFLICT DO NOTHING; "
+        "RETURN OLD; "
+        "END; "
+        "$$ LANGUAGE plpgsql"
+    )
+
+    for table in TABLES:
+        op.add_column(
+            table, sa.Column("version", sa.BigInteger(), nullable=True)
+        )
+        op.add_column(
+            table,
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.text("now()"),
+                nullable=False,
+            ),
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_version_trigger "
+            f"BEFORE INSERT OR UPDATE ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION track_row_version()"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_tombstone_trigger "
+            f"AFTER DELETE ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION record_tombstone()"
+        )
+
+    with op.get_context().autocommit_block():
+        for table, index in TABLES.items():
+            backfill_versions(table)
+
+            op.create_check_constraint(
+                f"{table}_version_not_null",
+                table,
+                "version IS NOT NULL",
+                postgresql_not_valid=True,
+            )
+            op.execute(
+                f"ALTER TABLE {table} "
+                f"VALIDATE CONSTRAINT {table}_version_not_null"
+            )
+            op.alter_column(
+                table,
+                "version",
+                existing_type=sa.BigInteger(),
+                server_default=sa.text(CURRENT_VERSION),
+                nullable=False,
+            )
+            op.drop_constraint(
+                f"{table}_version_not_null", table, type_="check"
+            )
+            op.create_index(
+                index,
+                table,
+                ["version", "ident"],
+                unique=False,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, index in TABLES.items():
+            op.drop_index(
+                index, table_name=table, postgresql_concurrently=True
+            )
+
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER {table}_tombstone_trigger ON {table}")
+        op.execute(f"DROP TRIGGER {table}_version_trigger ON {table}")
+        op.drop_column(table, "updated_at")
+        op.drop_column(table, "version")
+
+    op.execute("DROP FUNCTION record_tombstone()")
+    op.execute("DROP FUNCTION track_row_version()")
+    op.drop_table("tombstone_table")
@@ -0,0 +1,183 @@
+"""index overhaul
+
+Revision ID: b41d9e6f0a25
+Revises: 7c2e5b9a1d43
+Create Date: 2024-07-22 16:03:12.540198
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b41d9e6f0a25"
+down_revision: Union[str, None] = "7c2e5b9a1d43"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+REDUNDANT_INDEXES = [
+    ("welder_ident_idx", "welder_table", ["ident"]),
+    ("welder_kleymo_idx", "welder_table", ["kleymo"]),
+    ("name_idx", "welder_table", ["name"]),
+    (
+        "welder_certification_ident_idx",
+        "welder_certification_table",
+        ["ident"],
+    ),
+    (
+        "welder_certification_kleymo_idx",
+        "welder_certification_table",
+        ["kleymo"],
+    ),
+    ("method_idx", "welder_certification_table", ["method"]),
+    ("gtd_idx", "welder_certification_table", ["gtd"]),
+    ("ndt_ident_idx", "ndt_table", ["ident"]),
+    (
+        "ndt_idx",
+        "ndt_table",
+        ["kleymo", "company", "subcompany", "project"],
+    ),
+    ("total_welded_idx", "ndt_table", ["total_welded"]),
+    ("total_ndt_idx", "ndt_table", ["total_ndt"]),
+    ("accepted_idx", "ndt_table", ["accepted"]),
+    ("rejected_idx", "ndt_table", ["rejected"]),
+]
+
+
+def create_indexes() -> None:
+    op.create_index(
+        "welder_name_trgm_idx",
+        "welder_table",
+        ["name"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+        postgresql_concurrently=True,
+    )
+    op.create_index(
+        "welder_certification_kleymo_date_idx",
+        "welder_certification_table",
+        ["kleymo", "expiration_date_fact"],
+        unique=False,
+        postgresql_concurrently=True,
+    )
+    op.create_index(
+        "welder_certification_method_date_idx",
+        "welder_certification_table",
+        ["method", "expiration_date_fact"],
+        unique=False,
+        postgresql_concurrently=True,
+    )
+    op.create_index(
+        "welder_certification_insert_date_idx",
+        "welder_certification_table",
+        ["insert", "expiration_date_fact"],
+        unique=False,
+        postgresql_where=sa.text("insert IS NOT NULL"),
+        postgresql_concurrently=True,
+    )
+    op.create_index(
+        "welder_certification_date_idx",
+        "welder_certification_table",
+        ["certification_date"],
+        unique=False,
+        postgresql_concurrently=True,
+    )
+    op.create_index(
+        "welder_certification_gtd_idx",
+        "welder_certification_table",
+        ["gtd"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_concurrently=True,
+    )
+    op.create_index(
+        "welder_certification_materials_groups_idx",
+        "welder_certification_table",
+        ["welding_materials_groups"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_concurrently=True,
+    )
+    op.create_index(
+        "ndt_kleymo_date_idx",
+        "ndt_table",
+        ["kleymo", "welding_date"],
+        unique=False,
+        postgresql_concurrently=True,
+    )
+
+
+def drop_indexes() -> None:
+    op.drop_index(
+        "ndt_kleymo_date_idx",
+        table_name="ndt_table",
+        postgresql_concurrently=True,
+    )
+    op.drop_index(
+        "welder_certification_materials_groups_idx",
+        table_name="welder_certification_table",
+        postgresql_concurrently=True,
+    )
+    op.drop_index(
+        "welder_certification_gtd_idx",
+        table_name="welder_certification_table",
+        postgresql_concurrently=True,
+    )
+    op.drop_index(
+        "welder_certification_date_idx",
+        table_name="welder_certification_table",
+        postgresql_concurrently=True,
+    )
+    op.drop_index(
+        "welder_certification_insert_date_idx",
+        table_name="welder_certification_table",
+        postgresql_concurrently=True,
+    )
+    op.drop_index(
+        "welder_certification_method_date_idx",
+        table_name="welder_certification_table",
+        postgresql_concurrently=True,
+    )
+    op.drop_index(
+        "welder_certification_kleymo_date_idx",
+        table_name="welder_certification_table",
+        postgresql_concurrently=True,
+    )
+    op.drop_index(
+        "welder_name_trgm_idx",
+        table_name="welder_table",
+        postgresql_concurrently=True,
+    )
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    with op.get_context().autocommit_block():
+        create_indexes()
+
+        for name, table_name, _ in REDUNDANT_INDEXES:
+            op.drop_index(
+                name,
+                table_name=table_name,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table_name, columns in REDUNDANT_INDEXES:
+            op.create_index(
+                name,
+                table_name,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+            )
+
+        drop_indexes()
@@ -0,0 +1,48 @@
+"""welder kleymo not null
+
+Revision ID: c4f7a1e9b352
+Revises: a93c4e7d2f18
+Create Date: 2024-09-02 14:21:37.904512
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c4f7a1e9b352"
+down_revision: Union[str, None] = "a93c4e7d2f18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_check_constraint(
+            "welder_kleymo_not_null",
+            "welder_table",
+            "kleymo IS NOT NULL",
+            postgresql_not_valid=True,
+        )
+        op.execute(
+            "ALTER TABLE welder_table "
+            "VALIDATE CONSTRAINT welder_kleymo_not_null"
+        )
+        op.alter_column(
+            "welder_table",
+            "kleymo",
+            existing_type=sa.String(4),
+            nullable=False,
+        )
+        op.drop_constraint(
+            "welder_kleymo_not_null", "welder_table", type_="check"
+        )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        "welder_table", "kleymo", existing_type=sa.String(4), nullable=True
+    )
@@ -0,0 +1,74 @@
+"""qualification index
+
+Revision ID: e8a3c7f21b90
+Revises: b41d9e6f0a25
+Create Date: 2024-07-29 11:42:05.318274
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e8a3c7f21b90"
+down_revision: Union[str, None] = "b41d9e6f0a25"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+RANGE_COLUMNS = ["details_thikness", "outer_diameter", "rod_diameter"]
+
+
+def numrange(name: str) -> str:
+    lower, upper = f"{name}_from", f"{name}_before"
+
+    return (
+        f"numrange("
+        f"CAST(CASE WHEN {lower} > {upper} THEN {upper} ELSE {lower} END "
+        f"AS NUMERIC), "
+        f"CAST(CASE WHEN {lower} > {upper} THEN {lower} ELSE {upper} END "
+        f"AS NUMERIC), "
+        f"'[]')"
+    )
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY welder_certification_qualification_idx "
+            "ON welder_certification_table USING gist "
+            "(method, expiration_date_fact, "
+            + ", ".join(numrange(name) for name in RANGE_COLUMNS)
+            + ")"
+        )
+
+        for name in RANGE_COLUMNS:
+            for suffix in ("from", "before"):
+                op.drop_index(
+                    f"{name}_{suffix}_idx",
+                    table_name="welder_certification_table",
+                    postgresql_concurrently=True,
+                )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in RANGE_COLUMNS:
+            for suffix in ("from", "before"):
+                op.create_index(
+                    f"{name}_{suffix}_idx",
+                    "welder_certification_table",
+                    [f"{name}_{suffix}"],
+                    unique=False,
+                    postgresql_concurrently=True,
+                )
+
+        op.drop_index(
+            "welder_certification_qualification_idx",
+            table_name="welder_certification_table",
+            postgresql_concurrently=True,
+        )
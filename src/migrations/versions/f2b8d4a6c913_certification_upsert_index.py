@@ -0,0 +1,75 @@
+"""certification upsert index
+
+Revision ID: f2b8d4a6c913
+Revises: c4f7a1e9b352
+Create Date: 2024-09-09 11:05:42.318720
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f2b8d4a6c913"
+down_revision: Union[str, None] = "c4f7a1e9b352"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLE = "welder_certification_table"
+
+INDEX = "welder_certification_upsert_idx"
+
+KEYS = [
+    "kleymo",
+    "certification_number",
+    "certification_date",
+    "expiration_date_fact",
+]
+
+
+def get_unique_constraint() -> str | None:
+    return op.get_bind().execute(
+        sa.text(
+            "SELECT conname FROM pg_constraint "
+            "WHERE conrelid = CAST(:table AS regclass) AND contype = 'u'"
+        ),
+        {"table": TABLE},
+    ).scalar_one_or_none()
+
+
+def upgrade() -> None:
+    op.execute(
+        f"DELETE FROM {TABLE} a USING {TABLE} b "
+        "WHERE a.insert IS NULL AND b.insert IS NULL "
+        + "".join(f"AND a.{key} = b.{key} " for key in KEYS)
+        + "AND (a.version, a.ident) < (b.version, b.ident)"
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            INDEX,
+            TABLE,
+            [*KEYS, sa.text("coalesce(insert, '')")],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+
+        constraint = get_unique_constraint()
+
+        if constraint:
+            op.drop_constraint(constraint, TABLE, type_="unique")
+
+
+def downgrade() -> None:
+    op.execute(
+        f"ALTER TABLE {TABLE} ADD UNIQUE ({', '.join([*KEYS, 'insert'])})"
+    )
+
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            INDEX, table_name=TABLE, postgresql_concurrently=True
+        )
@@ -1,243 +1,945 @@
-from datetime import datetime, date
-import typing as t
-import uuid
-
-from sqlalchemy.orm import Mapped, DeclarativeBase, attributes, relationship
-from sqlalchemy.ext.asyncio import AsyncConnection
-from sqlalchemy.schema import UniqueConstraint, Index
-import sqlalchemy as sa
-from naks_library import is_uuid
-
-
-__all__ = [
-    "Base",
-    "WelderModel",
-    "WelderCertificationModel",
-    "NDTModel"
-]
-
-class Base(DeclarativeBase): 
-
-    @classmethod
-    async def get(cls, conn: AsyncConnection, ident: uuid.UUID | str):
-        stmt = cls._dump_get_stmt(ident)
-        response = await conn.execute(stmt)
-        result = response.mappings().one_or_none()
-
-        return result
-        
-
-    @classmethod
-    async def get_many(cls, conn: AsyncConnection, expression: sa.ColumnElement, limit: int, offset: int):
-        stmt = cls._dump_get_many_stmt(expression)
-
-        amount = await cls.count(conn, stmt)
-
-        if limit:
-            stmt = stmt.limit(limit)
-
-        if offset:
-            stmt = stmt.offset(offset)
-        
-        response = await conn.execute(stmt)
-
-        result = response.mappings().all()
-        
-        return (result, amount)
-        
-
-    @classmethod
-    async def create(cls, data: list[dict], conn: AsyncConnection):
-        stmt = cls._dump_create_stmt(
-            data
-        )
-
-        await conn.execute(stmt)
-
-
-    @classmethod
-    async def update(cls, conn: AsyncConnection, ident: uuid.UUID | str, data: dict[str, t.Any]):
-        stmt = cls._dump_update_stmt(ident, data)
-        await conn.execute(stmt)
-
-
-    @classmethod
-    async def delete(cls, conn: AsyncConnection, ident: uuid.UUID | str):
-        stmt = cls._dump_delete_stmt(ident)
-        await conn.execute(stmt)
-
-
-    @classmethod
-    async def count(cls, conn: AsyncConnection, stmt: sa.Select | None = None):
-        if isinstance(stmt, sa.ColumnElement):
-            stmt.select(sa.func.count())
-
-            return (await conn.execute(stmt)).scalar_one()
-
-        else:
-            return (await conn.execute(sa.select(sa.func.count()).select_from(cls).distinct())).scalar_one()
-
-
-    @classmethod
-    def _get_column(cls, ident: str | uuid.UUID):
-        return sa.inspect(cls).primary_key[0]
-
-
-    @classmethod
-    def _dump_create_stmt(cls, data: list[dict[str, t.Any]]):
-        return sa.insert(cls).values(
-            data
-        )
-
-
-    @classmethod
-    def _dump_get_stmt(cls, ident: str | uuid.UUID):
-        return sa.select(cls).where(
-            cls._get_column(ident) == ident
-        )
-
-
-    @classmethod
-    def _dump_get_many_stmt(cls, expression: sa.ColumnExpressionArgument):
-        return sa.select(cls).filter(expression)
-    
-
-    @classmethod
-    def _dump_update_stmt(cls, ident: str | uuid.UUID, data: dict[str, t.Any]):
-        return sa.update(cls).where(
-            cls._get_column(ident) == ident
-        ).values(
-            **data
-        )
-
-
-    @classmethod
-    def _dump_delete_stmt(cls, ident: str | uuid.UUID):
-        return sa.delete(cls).where(
-            cls._get_column(ident) == ident
-        )
-
-
-class WelderModel(Base):
-    __tablename__ = "welder_table"
-
-    ident: Mapped[uuid.UUID] = sa.Column(sa.UUID(as_uuid=True), primary_key=True, nullable=False, default=uuid.uuid4)
-    kleymo: Mapped[str] = sa.Column(sa.String(4), unique=True)
-    name: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
-    birthday: Mapped[str | None] = sa.Column(sa.Date(), nullable=True)
-    sicil: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
-    passport_number: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
-    nation: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
-    status: Mapped[str] = sa.Column(sa.SMALLINT, default=0)
-    certifications: Mapped[list["WelderCertificationModel"]] = relationship("WelderCertificationModel", back_populates="welder")
-    ndts: Mapped[list["NDTModel"]] = relationship("NDTModel", back_populates="welder")
-
-    __table_args__ = (
-        Index("welder_ident_idx", ident),
-        Index("welder_kleymo_idx", kleymo),
-        Index("name_idx", name),
-    )
-
-
-    @classmethod
-    def _dump_get_many_stmt(cls, expression: sa.ColumnExpressionArgument):
-        return sa.select(cls).join(
-            WelderCertificationModel
-        ).filter(expression).distinct()
-
-
-    @classmethod
-    def _get_column(cls, ident: str | uuid.UUID) -> attributes.InstrumentedAttribute:
-        if is_uuid(ident):
-            return WelderModel.ident
-        
-        return WelderModel.kleymo
-
-
-class WelderCertificationModel(Base):
-    __tablename__ = "welder_certification_table"
-
-    ident: Mapped[uuid.UUID] = sa.Column(sa.UUID(as_uuid=True), primary_key=True, nullable=False, default=uuid.uuid4)
-    kleymo: Mapped[str] = sa.Column(sa.String(4), sa.ForeignKey("welder_table.kleymo", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
-    job_title: Mapped[str] = sa.Column(sa.String(), nullable=True)
-    certification_number: Mapped[str] = sa.Column(sa.String(), nullable=False)
-    certification_date: Mapped[date] = sa.Column(sa.Date(), nullable=False)
-    expiration_date: Mapped[date] = sa.Column(sa.Date(), nullable=False)
-    expiration_date_fact: Mapped[date] = sa.Column(sa.Date(), nullable=False)
-    insert: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
-    certification_type: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
-    company: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
-    gtd: Mapped[list[str] | None] = sa.Column(sa.ARRAY(sa.String), nullable=True)
-    method: Mapped[str] = sa.Column(sa.String(), nullable=True)
-    details_type: Mapped[list[str] | None] = sa.Column(sa.ARRAY(sa.String), nullable=True)
-    joint_type: Mapped[list[str] | None] = sa.Column(sa.ARRAY(sa.String), nullable=True)
-    welding_materials_groups: Mapped[list[str] | None] = sa.Column(sa.ARRAY(sa.String), nullable=True)
-    welding_materials: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
-    details_thikness_from: Mapped[float | None] = sa.Column(sa.Float(), nullable=True)
-    details_thikness_before: Mapped[float | None] = sa.Column(sa.Float(), nullable=True)
-    outer_diameter_from: Mapped[float | None] = sa.Column(sa.Float(), nullable=True)
-    outer_diameter_before: Mapped[float | None] = sa.Column(sa.Float(), nullable=True)
-    welding_position: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
-    connection_type: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
-    rod_diameter_from: Mapped[float | None] = sa.Column(sa.Float(), nullable=True)
-    rod_diameter_before: Mapped[float | None] = sa.Column(sa.Float(), nullable=True)
-    rod_axis_position: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
-    weld_type: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
-    joint_layer: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
-    sdr: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
-    automation_level: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
-    details_diameter_from: Mapped[float | None] = sa.Column(sa.Float(), nullable=True)
-    details_diameter_before: Mapped[float | None] = sa.Column(sa.Float(), nullable=True)
-    welding_equipment: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
-
-    welder: Mapped[WelderModel] = relationship("WelderModel", back_populates="certifications")
-
-    __table_args__ = (
-        UniqueConstraint(
-            "kleymo", 
-            "certification_number", 
-            "certification_date", 
-            "expiration_date_fact", 
-            "insert"
-        ),
-        Index("welder_certification_ident_idx", ident),
-        Index("welder_certification_kleymo_idx", kleymo),
-        Index("certification_idx", certification_number, certification_date, expiration_date_fact),
-        Index("method_idx", method),
-        Index("gtd_idx", gtd),
-        Index("details_thikness_from_idx", details_thikness_from),
-        Index("details_thikness_before_idx", details_thikness_before),
-        Index("outer_diameter_from_idx", outer_diameter_from),
-        Index("outer_diameter_before_idx", outer_diameter_before),
-        Index("rod_diameter_from_idx", rod_diameter_from),
-        Index("rod_diameter_before_idx", rod_diameter_before),
-    )
-  
-
-class NDTModel(Base):
-    __tablename__ = "ndt_table"
-    
-    ident: Mapped[uuid.UUID] = sa.Column(sa.UUID(as_uuid=True), primary_key=True, nullable=False, default=uuid.uuid4)
-    kleymo: Mapped[str] = sa.Column(sa.String(4), sa.ForeignKey("welder_table.kleymo", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
-    company: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
-    subcompany: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
-    project: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
-    welding_date: Mapped[date] = sa.Column(sa.Date(), nullable=False)
-    ndt_type: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
-    total_welded: Mapped[float | None] = sa.Column(sa.Float(), nullable=False, default=0)
-    total_ndt: Mapped[float | None] = sa.Column(sa.Float(), nullable=False, default=0)
-    accepted: Mapped[float | None] = sa.Column(sa.Float(), nullable=False, default=0)
-    rejected: Mapped[float | None] = sa.Column(sa.Float(), nullable=False, default=0)
-    
-    welder: Mapped[WelderModel] = relationship("WelderModel", back_populates="ndts")
-
-
-    __table_args__ = (
-        UniqueConstraint("kleymo", "company", "subcompany", "project", "welding_date", "ndt_type"),
-        Index("ndt_ident_idx", ident),
-        Index("ndt_idx", kleymo, company, subcompany, project),
-        Index("total_welded_idx", total_welded),
-        Index("total_ndt_idx", total_ndt),
-        Index("accepted_idx", accepted),
-        Index("rejected_idx", rejected)
-    )
+from datetime import datetime, date, timedelta
+import typing as t
+import uuid
+
+from sqlalchemy.orm import Mapped, DeclarativeBase, attributes, relationship
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.dialects.postgresql import insert as pg_insert, aggregate_order_by, ARRAY, JSON, JSONB
+from sqlalchemy.schema import UniqueConstraint, Index
+from sqlalchemy.sql import visitors
+import sqlalchemy as sa
+from naks_library import is_uuid
+import orjson
+
+from src.utils.cursors import encode_cursor, decode_cursor
+
+
+__all__ = [
+    "Base",
+    "WelderModel",
+    "WelderCertificationModel",
+    "NDTModel",
+    "JobModel",
+    "TombstoneModel"
+]
+
+
+type CountMode = t.Literal["exact", "estimated", "none"]
+
+
+MAX_QUERY_PARAMS = 32767
+
+CURRENT_VERSION = "pg_current_xact_id()::text::bigint"
+
+SETTLED_VERSION = "pg_snapshot_xmin(pg_current_snapshot())::text::bigint"
+
+TRACKED_COLUMNS = ("version", "updated_at")
+
+
+def _references_table(expression: sa.ColumnExpressionArgument, table: sa.Table) -> bool:
+    if not isinstance(expression, sa.ClauseElement):
+        return False
+
+    return any(
+        isinstance(element, sa.Column) and element.table is table for element in visitors.iterate(expression)
+    )
+
+
+def _numrange(lower: sa.ColumnElement, upper: sa.ColumnElement) -> sa.ColumnElement:
+    return sa.func.numrange(
+        sa.cast(sa.case((lower > upper, upper), else_=lower), sa.Numeric),
+        sa.cast(sa.case((lower > upper, lower), else_=upper), sa.Numeric),
+        sa.literal_column("'[]'")
+    )
+
+
+def _dump_changes_expression(version: sa.Column, ident: sa.Column, kind: int, position: tuple[int, int, uuid.UUID] | None) -> sa.ColumnElement:
+    if position is None:
+        return sa.true()
+
+    if kind > position[1]:
+        return version >= position[0]
+
+    if kind < position[1]:
+        return version > position[0]
+
+    return sa.tuple_(version, ident) > sa.tuple_(sa.literal(position[0], sa.BigInteger), sa.literal(position[2], sa.UUID))
+
+
+class Base(DeclarativeBase): 
+    __keyset_columns__: t.ClassVar[tuple[str, ...]] = ("ident",)
+    __upsert_keys__: t.ClassVar[tuple[str, ...] | None] = None
+    __tracked__: t.ClassVar[bool] = False
+
+    @classmethod
+    async def get(cls, conn: AsyncConnection, ident: uuid.UUID | str):
+        stmt = cls._dump_get_stmt(ident)
+        response = await conn.execute(stmt)
+        result = response.mappings().one_or_none()
+
+        return result
+
+
+    @classmethod
+    async def get_with_version(cls, conn: AsyncConnection, ident: uuid.UUID | str, columns: t.Sequence[str] | None = None):
+        stmt = cls._dump_columns_stmt(cls._dump_get_stmt(ident), columns)
+        response = await conn.execute(stmt)
+        result = response.mappings().one_or_none()
+
+        return result
+
+
+    @classmethod
+    async def get_by_idents(cls, conn: AsyncConnection, idents: t.Sequence[uuid.UUID | str]) -> list[sa.RowMapping | None]:
+        groups: dict[str, tuple[sa.Column, set[t.Any]]] = {}
+        keys: list[tuple[str, t.Any] | None] = []
+
+        for ident in idents:
+            column = cls._get_column(ident)
+
+            try:
+                value = cls._normalize_ident(column, ident)
+            except ValueError:
+                keys.append(None)
+                continue
+
+            groups.setdefault(column.key, (column, set()))[1].add(value)
+            keys.append((column.key, value))
+
+        found: dict[tuple[str, t.Any], sa.RowMapping] = {}
+
+        for key, (column, values) in groups.items():
+            response = await conn.execute(cls._dump_get_by_idents_stmt(column, list(values)))
+
+            for row in response.mappings().all():
+                found[(key, row[key])] = row
+
+        return [found.get(key) if key else None for key in keys]
+        
+
+    @classmethod
+    async def get_many(cls, conn: AsyncConnection, expression: sa.ColumnElement, limit: int, offset: int, count_mode: CountMode = "exact", columns: t.Sequence[str] | None = None):
+        stmt = cls._dump_get_many_stmt(expression)
+
+        page_stmt = cls._dump_columns_stmt(stmt, columns).order_by(*cls._get_keyset_columns())
+
+        if limit:
+            page_stmt = page_stmt.limit(limit)
+
+        if offset:
+            page_stmt = page_stmt.offset(offset)
+        
+        return await cls._execute_page(conn, stmt, page_stmt, count_mode, first_page=not offset)
+
+
+    @classmethod
+    async def get_page(cls, conn: AsyncConnection, expression: sa.ColumnElement, limit: int | None, cursor: str | None, count_mode: CountMode = "exact", columns: t.Sequence[str] | None = None):
+        stmt = cls._dump_get_many_stmt(expression)
+
+        page_stmt = cls._dump_keyset_stmt(cls._dump_columns_stmt(stmt, columns), cursor)
+
+        if limit:
+            page_stmt = page_stmt.limit(limit + 1)
+
+        result, amount = await cls._execute_page(conn, stmt, page_stmt, count_mode, first_page=not cursor)
+
+        next_cursor = None
+
+        if limit and len(result) > limit:
+            result = result[:limit]
+            next_cursor = encode_cursor([result[-1][column.key] for column in cls._get_keyset_columns()])
+
+        return (result, amount, next_cursor)
+
+
+    @classmethod
+    async def stream(cls, conn: AsyncConnection, expression: sa.ColumnElement, yield_per: int) -> t.AsyncIterator[t.Sequence[sa.RowMapping]]:
+        stmt = cls._dump_get_many_stmt(expression).order_by(
+            *cls._get_keyset_columns()
+        ).execution_options(yield_per=yield_per)
+
+        response = await conn.stream(stmt)
+
+        async for partition in response.mappings().partitions():
+            yield partition
+
+
+    @classmethod
+    async def _execute_page(cls, conn: AsyncConnection, stmt: sa.Select, page_stmt: sa.Select, count_mode: CountMode, first_page: bool):
+        if count_mode == "exact":
+            page_stmt = page_stmt.add_columns(
+                cls._dump_count_stmt(stmt).scalar_subquery().label("total_count")
+            )
+
+        response = await conn.execute(page_stmt)
+
+        result = response.mappings().all()
+
+        match count_mode:
+            case "exact":
+                if result:
+                    amount = result[0]["total_count"]
+                elif first_page:
+                    amount = 0
+                else:
+                    amount = await cls.count(conn, stmt)
+            case "estimated":
+                amount = await cls.estimate_count(conn, stmt)
+            case _:
+                amount = None
+
+        return (result, amount)
+        
+
+    @classmethod
+    async def get_changes(cls, conn: AsyncConnection, cursor: str | None, limit: int) -> tuple[list[sa.RowMapping], list[sa.RowMapping], str | None, bool]:
+        position = cls._load_changes_cursor(cursor)
+        bound = (await conn.execute(sa.select(sa.literal_column(SETTLED_VERSION)))).scalar_one()
+
+        upserts = (await conn.execute(cls._dump_upserts_stmt(position, bound, limit + 1))).mappings().all()
+        tombstones = (await conn.execute(TombstoneModel._dump_tombstones_stmt(cls.__tablename__, position, bound, limit + 1))).mappings().all()
+
+        changes = sorted(
+            [((row["version"], 1, row["ident"]), row) for row in upserts] + [((row["version"], 0, row["ident"]), row) for row in tombstones],
+            key=lambda change: change[0]
+        )
+
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+
+        if changes:
+            cursor = encode_cursor(changes[-1][0])
+
+        return (
+            [row for key, row in changes if key[1] == 1],
+            [row for key, row in changes if key[1] == 0],
+            cursor,
+            has_more
+        )
+
+
+    @classmethod
+    async def create(cls, data: list[dict], conn: AsyncConnection):
+        stmt = cls._dump_create_stmt(
+            data
+        )
+
+        await conn.execute(stmt)
+
+
+    @classmethod
+    async def copy(cls, data: list[dict[str, t.Any]], conn: AsyncConnection):
+        columns = [column.key for column in cls.__table__.columns if column.key not in TRACKED_COLUMNS]
+
+        raw_conn = await conn.get_raw_connection()
+
+        await raw_conn.driver_connection.copy_records_to_table(
+            cls.__tablename__,
+            records=[tuple(el.get(column) for column in columns) for el in data],
+            columns=columns
+        )
+
+
+    @classmethod
+    async def upsert(cls, data: list[dict[str, t.Any]], conn: AsyncConnection) -> tuple[int, int]:
+        if not cls.__upsert_keys__:
+            raise NotImplementedError(f"{cls.__name__} has no upsert keys")
+
+        unique_data = list({tuple(el.get(key) for key in cls.__upsert_keys__): el for el in data}.values())
+        batch_size = MAX_QUERY_PARAMS // len(cls.__table__.columns)
+
+        inserted = 0
+        updated = 0
+
+        for i in range(0, len(unique_data), batch_size):
+            response = await conn.execute(cls._dump_upsert_stmt(unique_data[i:i + batch_size]))
+            result = response.scalars().all()
+
+            inserted += sum(result)
+            updated += len(result) - sum(result)
+
+        return (inserted, updated)
+
+
+    @classmethod
+    async def update(cls, conn: AsyncConnection, ident: uuid.UUID | str, data: dict[str, t.Any]):
+        stmt = cls._dump_update_stmt(ident, data)
+        await conn.execute(stmt)
+
+
+    @classmethod
+    async def delete(cls, conn: AsyncConnection, ident: uuid.UUID | str):
+        stmt = cls._dump_delete_stmt(ident)
+        await conn.execute(stmt)
+
+
+    @classmethod
+    async def count(cls, conn: AsyncConnection, stmt: sa.Select | None = None) -> int:
+        if stmt is None:
+            stmt = sa.select(cls)
+
+        return (await conn.execute(cls._dump_count_stmt(stmt))).scalar_one()
+
+
+    @classmethod
+    async def estimate_count(cls, conn: AsyncConnection, stmt: sa.Select | None = None) -> int:
+        if stmt is None or stmt.whereclause is None:
+            reltuples = (await conn.execute(
+                sa.text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+                {"table": cls.__tablename__}
+            )).scalar_one()
+
+            if reltuples >= 0:
+                return reltuples
+
+            return await cls.count(conn, stmt)
+
+        compiled = stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+
+        plan = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar_one()
+
+        if isinstance(plan, str):
+            plan = orjson.loads(plan)
+
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+
+    @classmethod
+    def _get_column(cls, ident: str | uuid.UUID):
+        return sa.inspect(cls).primary_key[0]
+
+
+    @classmethod
+    def _get_version_column(cls) -> sa.ColumnElement:
+        if cls.__tracked__:
+            return sa.cast(cls.__table__.c.version, sa.String)
+
+        return sa.literal_column(f"{cls.__tablename__}.xmin::text", sa.String)
+
+
+    @classmethod
+    def _get_keyset_columns(cls) -> list[sa.Column]:
+        columns = sa.inspect(cls).columns
+
+        return [columns[key] for key in cls.__keyset_columns__]
+
+
+    @classmethod
+    def _dump_create_stmt(cls, data: list[dict[str, t.Any]]):
+        return sa.insert(cls).values(
+            data
+        )
+
+
+    @classmethod
+    def _dump_count_stmt(cls, stmt: sa.Select):
+        return sa.select(sa.func.count()).select_from(
+            stmt.order_by(None).subquery()
+        )
+
+
+    @classmethod
+    def _get_upsert_elements(cls) -> tuple[str | sa.ColumnElement, ...]:
+        return cls.__upsert_keys__
+
+
+    @classmethod
+    def _dump_upsert_stmt(cls, data: list[dict[str, t.Any]]):
+        stmt = pg_insert(cls).values(data)
+
+        update_columns = [
+            column for column in cls.__table__.columns 
+            if column.key not in cls.__upsert_keys__ and column.key not in TRACKED_COLUMNS and not column.primary_key
+        ]
+
+        return stmt.on_conflict_do_update(
+            index_elements=cls._get_upsert_elements(),
+            set_={column.key: stmt.excluded[column.key] for column in update_columns},
+            where=sa.or_(*[column.is_distinct_from(stmt.excluded[column.key]) for column in update_columns])
+        ).returning(
+            sa.literal_column("xmax = 0").label("inserted")
+        )
+
+
+    @classmethod
+    def _dump_get_stmt(cls, ident: str | uuid.UUID):
+        return sa.select(cls).where(
+            cls._get_column(ident) == ident
+        )
+
+
+    @classmethod
+    def _dump_get_by_idents_stmt(cls, column: sa.Column, values: list[t.Any]):
+        return sa.select(cls).where(
+            column == sa.any_(sa.bindparam("idents", values, type_=sa.ARRAY(column.type)))
+        )
+
+
+    @classmethod
+    def _normalize_ident(cls, column: sa.Column, ident: uuid.UUID | str) -> t.Any:
+        if isinstance(column.type, sa.UUID):
+            return uuid.UUID(str(ident))
+
+        return str(ident)
+
+
+    @classmethod
+    def _dump_get_many_stmt(cls, expression: sa.ColumnExpressionArgument):
+        return sa.select(cls).filter(expression)
+    
+
+    @classmethod
+    def _dump_columns_stmt(cls, stmt: sa.Select, columns: t.Sequence[str] | None):
+        version = cls._get_version_column().label("row_version")
+
+        if columns is None:
+            return stmt.add_columns(version)
+
+        table_columns = cls.__table__.columns
+        keys = dict.fromkeys([
+            *cls.__keyset_columns__,
+            *[column.key for column in sa.inspect(cls).primary_key],
+            *columns
+        ])
+
+        return stmt.with_only_columns(
+            *[table_columns[key] for key in keys], 
+            version,
+            maintain_column_froms=True
+        )
+
+
+    @classmethod
+    def _dump_keyset_stmt(cls, stmt: sa.Select, cursor: str | None):
+        columns = cls._get_keyset_columns()
+
+        if cursor:
+            values = decode_cursor(cursor)
+
+            if len(values) != len(columns):
+                raise ValueError(f"Invalid cursor: {cursor}")
+
+            stmt = stmt.where(
+                sa.tuple_(*columns) > sa.tuple_(*[sa.literal(value, column.type) for value, column in zip(values, columns)])
+            )
+
+        return stmt.order_by(*columns)
+
+
+    @classmethod
+    def _load_changes_cursor(cls, cursor: str | None) -> tuple[int, int, uuid.UUID] | None:
+        if not cursor:
+            return None
+
+        values = decode_cursor(cursor)
+
+        if len(values) != 3 or not isinstance(values[0], int) or values[1] not in (0, 1) or not isinstance(values[2], uuid.UUID):
+            raise ValueError(f"Invalid cursor: {cursor}")
+
+        return tuple(values)
+
+
+    @classmethod
+    def _dump_upserts_stmt(cls, position: tuple[int, int, uuid.UUID] | None, bound: int, limit: int):
+        return sa.select(cls).where(
+            _dump_changes_expression(cls.version, cls.ident, 1, position),
+            cls.version < bound
+        ).order_by(cls.version, cls.ident).limit(limit)
+    
+
+    @classmethod
+    def _dump_update_stmt(cls, ident: str | uuid.UUID, data: dict[str, t.Any]):
+        return sa.update(cls).where(
+            cls._get_column(ident) == ident
+        ).values(
+            **data
+        )
+
+
+    @classmethod
+    def _dump_delete_stmt(cls, ident: str | uuid.UUID):
+        return sa.delete(cls).where(
+            cls._get_column(ident) == ident
+        )
+
+
+class WelderModel(Base):
+    __tablename__ = "welder_table"
+    __keyset_columns__ = ("kleymo", "ident")
+    __tracked__ = True
+
+    ident: Mapped[uuid.UUID] = sa.Column(sa.UUID(as_uuid=True), primary_key=True, nullable=False, default=uuid.uuid4)
+    kleymo: Mapped[str] = sa.Column(sa.String(4), unique=True, nullable=False)
+    name: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
+    birthday: Mapped[str | None] = sa.Column(sa.Date(), nullable=True)
+    sicil: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
+    passport_number: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
+    nation: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
+    status: Mapped[str] = sa.Column(sa.SMALLINT, default=0)
+    version: Mapped[int] = sa.Column(sa.BigInteger(), nullable=False, server_default=sa.text(CURRENT_VERSION))
+    updated_at: Mapped[datetime] = sa.Column(sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now())
+    certifications: Mapped[list["WelderCertificationModel"]] = relationship("WelderCertificationModel", back_populates="welder")
+    ndts: Mapped[list["NDTModel"]] = relationship("NDTModel", back_populates="welder")
+
+    __table_args__ = (
+        Index("welder_name_trgm_idx", name, postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("welder_version_idx", version, ident),
+    )
+
+
+    @classmethod
+    async def get_profile(cls, conn: AsyncConnection, ident: uuid.UUID | str, ndt_from: date | None = None, ndt_before: date | None = None):
+        stmt = cls._dump_get_profile_stmt(ident, ndt_from, ndt_before)
+        response = await conn.execute(stmt)
+        result = response.mappings().one_or_none()
+
+        return result
+
+
+    @classmethod
+    async def get_qualified(cls, conn: AsyncConnection, expression: sa.ColumnElement, limit: int):
+        stmt = cls._dump_get_qualified_stmt(expression, limit)
+        response = await conn.execute(stmt)
+        result = response.mappings().all()
+
+        return result
+
+
+    @classmethod
+    def _dump_get_many_stmt(cls, expression: sa.ColumnExpressionArgument):
+        if not _references_table(expression, WelderCertificationModel.__table__):
+            return sa.select(cls).filter(expression)
+
+        return sa.select(cls).filter(
+            sa.select(sa.literal(1)).select_from(
+                WelderCertificationModel
+            ).where(
+                WelderCertificationModel.kleymo == cls.kleymo,
+                expression
+            ).exists()
+        )
+
+
+    @classmethod
+    def _dump_get_profile_stmt(cls, ident: str | uuid.UUID, ndt_from: date | None, ndt_before: date | None):
+        certifications = sa.select(
+            cls._dump_json_agg(WelderCertificationModel, WelderCertificationModel.expiration_date_fact.desc())
+        ).where(
+            WelderCertificationModel.kleymo == cls.kleymo
+        )
+
+        ndts = sa.select(
+            cls._dump_json_agg(NDTModel, NDTModel.welding_date.desc())
+        ).where(
+            NDTModel.kleymo == cls.kleymo
+        )
+
+        if ndt_from:
+            ndts = ndts.where(NDTModel.welding_date >= ndt_from)
+
+        if ndt_before:
+            ndts = ndts.where(NDTModel.welding_date <= ndt_before)
+
+        return sa.select(
+            cls,
+            certifications.scalar_subquery().label("certifications"),
+            ndts.scalar_subquery().label("ndts")
+        ).where(
+            cls._get_column(ident) == ident
+        )
+
+
+    @classmethod
+    def _dump_get_qualified_stmt(cls, expression: sa.ColumnElement, limit: int):
+        matched = sa.select(WelderCertificationModel).where(expression).cte("matched")
+
+        valid_until = sa.func.max(matched.c.expiration_date_fact).label("valid_until")
+
+        return sa.select(
+            cls,
+            sa.func.json_agg(
+                aggregate_order_by(matched.table_valued(), matched.c.expiration_date_fact.desc()),
+                type_=JSON
+            ).label("certifications"),
+            valid_until
+        ).join(
+            matched, matched.c.kleymo == cls.kleymo
+        ).group_by(
+            cls.ident
+        ).order_by(
+            valid_until.desc(),
+            sa.func.count().desc(),
+            cls.kleymo
+        ).limit(limit)
+
+
+    @staticmethod
+    def _dump_json_agg(model: type[Base], order_by: sa.ColumnElement):
+        return sa.func.coalesce(
+            sa.func.json_agg(aggregate_order_by(model.__table__.table_valued(), order_by)),
+            sa.literal_column("'[]'::json"),
+            type_=JSON
+        )
+
+
+    @classmethod
+    def _get_column(cls, ident: str | uuid.UUID) -> attributes.InstrumentedAttribute:
+        if is_uuid(ident):
+            return WelderModel.ident
+        
+        return WelderModel.kleymo
+
+
+class WelderCertificationModel(Base):
+    __tablename__ = "welder_certification_table"
+    __keyset_columns__ = ("expiration_date_fact", "ident")
+    __upsert_keys__ = ("kleymo", "certification_number", "certification_date", "expiration_date_fact", "insert")
+    __tracked__ = True
+
+    ident: Mapped[uuid.UUID] = sa.Column(sa.UUID(as_uuid=True), primary_key=True, nullable=False, default=uuid.uuid4)
+    kleymo: Mapped[str] = sa.Column(sa.String(4), sa.ForeignKey("welder_table.kleymo", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
+    job_title: Mapped[str] = sa.Column(sa.String(), nullable=True)
+    certification_number: Mapped[str] = sa.Column(sa.String(), nullable=False)
+    certification_date: Mapped[date] = sa.Column(sa.Date(), nullable=False)
+    expiration_date: Mapped[date] = sa.Column(sa.Date(), nullable=False)
+    expiration_date_fact: Mapped[date] = sa.Column(sa.Date(), nullable=False)
+    insert: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
+    certification_type: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
+    company: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
+    gtd: Mapped[list[str] | None] = sa.Column(ARRAY(sa.String), nullable=True)
+    method: Mapped[str] = sa.Column(sa.String(), nullable=True)
+    details_type: Mapped[list[str] | None] = sa.Column(ARRAY(sa.String), nullable=True)
+    joint_type: Mapped[list[str] | None] = sa.Column(ARRAY(sa.String), nullable=True)
+    welding_materials_groups: Mapped[list[str] | None] = sa.Column(ARRAY(sa.String), nullable=True)
+    welding_materials: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
+    details_thikness_from: Mapped[float | None] = sa.Column(sa.Float(), nullable=True)
+    details_thikness_before: Mapped[float | None] = sa.Column(sa.Float(), nullable=True)
+    outer_diameter_from: Mapped[float | None] = sa.Column(sa.Float(), nullable=True)
+    outer_diameter_before: Mapped[float | None] = sa.Column(sa.Float(), nullable=True)
+    welding_position: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
+    connection_type: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
+    rod_diameter_from: Mapped[float | None] = sa.Column(sa.Float(), nullable=True)
+    rod_diameter_before: Mapped[float | None] = sa.Column(sa.Float(), nullable=True)
+    rod_axis_position: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
+    weld_type: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
+    joint_layer: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
+    sdr: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
+    automation_level: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
+    details_diameter_from: Mapped[float | None] = sa.Column(sa.Float(), nullable=True)
+    details_diameter_before: Mapped[float | None] = sa.Column(sa.Float(), nullable=True)
+    welding_equipment: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
+    version: Mapped[int] = sa.Column(sa.BigInteger(), nullable=False, server_default=sa.text(CURRENT_VERSION))
+    updated_at: Mapped[datetime] = sa.Column(sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now())
+
+    welder: Mapped[WelderModel] = relationship("WelderModel", back_populates="certifications")
+
+    __table_args__ = (
+        Index(
+            "welder_certification_upsert_idx",
+            kleymo,
+            certification_number,
+            certification_date,
+            expiration_date_fact,
+            sa.func.coalesce(insert, sa.literal_column("''")),
+            unique=True
+        ),
+        Index("welder_certification_kleymo_date_idx", kleymo, expiration_date_fact),
+        Index("certification_idx", certification_number, certification_date, expiration_date_fact),
+        Index("welder_certification_keyset_idx", expiration_date_fact, ident),
+        Index("welder_certification_method_date_idx", method, expiration_date_fact),
+        Index("welder_certification_insert_date_idx", insert, expiration_date_fact, postgresql_where=insert.isnot(None)),
+        Index("welder_certification_date_idx", certification_date),
+        Index("welder_certification_gtd_idx", gtd, postgresql_using="gin"),
+        Index("welder_certification_materials_groups_idx", welding_materials_groups, postgresql_using="gin"),
+        Index("welder_certification_version_idx", version, ident),
+        Index(
+            "welder_certification_qualification_idx",
+            method,
+            expiration_date_fact,
+            _numrange(details_thikness_from, details_thikness_before),
+            _numrange(outer_diameter_from, outer_diameter_before),
+            _numrange(rod_diameter_from, rod_diameter_before),
+            postgresql_using="gist"
+        ),
+    )
+
+
+    @classmethod
+    def _get_upsert_elements(cls) -> tuple[str | sa.ColumnElement, ...]:
+        return (
+            cls.kleymo,
+            cls.certification_number,
+            cls.certification_date,
+            cls.expiration_date_fact,
+            sa.func.coalesce(cls.insert, sa.literal_column("''"))
+        )
+
+
+    @classmethod
+    def covers(cls, name: str, value: float) -> sa.ColumnElement:
+        return _numrange(
+            getattr(cls, f"{name}_from"),
+            getattr(cls, f"{name}_before")
+        ).op("@>")(sa.cast(value, sa.Numeric))
+  
+
+class NDTModel(Base):
+    __tablename__ = "ndt_table"
+    __keyset_columns__ = ("welding_date", "ident")
+    __tracked__ = True
+    
+    ident: Mapped[uuid.UUID] = sa.Column(sa.UUID(as_uuid=True), primary_key=True, nullable=False, default=uuid.uuid4)
+    kleymo: Mapped[str] = sa.Column(sa.String(4), sa.ForeignKey("welder_table.kleymo", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
+    company: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
+    subcompany: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
+    project: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
+    welding_date: Mapped[date] = sa.Column(sa.Date(), nullable=False)
+    ndt_type: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
+    total_welded: Mapped[float | None] = sa.Column(sa.Float(), nullable=False, default=0)
+    total_ndt: Mapped[float | None] = sa.Column(sa.Float(), nullable=False, default=0)
+    accepted: Mapped[float | None] = sa.Column(sa.Float(), nullable=False, default=0)
+    rejected: Mapped[float | None] = sa.Column(sa.Float(), nullable=False, default=0)
+    version: Mapped[int] = sa.Column(sa.BigInteger(), nullable=False, server_default=sa.text(CURRENT_VERSION))
+    updated_at: Mapped[datetime] = sa.Column(sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now())
+    
+    welder: Mapped[WelderModel] = relationship("WelderModel", back_populates="ndts")
+
+
+    __table_args__ = (
+        UniqueConstraint("kleymo", "company", "subcompany", "project", "welding_date", "ndt_type"),
+        Index("ndt_kleymo_date_idx", kleymo, welding_date),
+        Index("ndt_keyset_idx", welding_date, ident),
+        Index("ndt_version_idx", version, ident),
+    )
+
+
+class JobModel(Base):
+    __tablename__ = "job_table"
+    __keyset_columns__ = ("created_at", "ident")
+
+    ident: Mapped[uuid.UUID] = sa.Column(sa.UUID(as_uuid=True), primary_key=True, nullable=False, default=uuid.uuid4)
+    kind: Mapped[str] = sa.Column(sa.String(), nullable=False)
+    status: Mapped[str] = sa.Column(sa.String(), nullable=False, default="queued")
+    params: Mapped[dict[str, t.Any]] = sa.Column(JSONB(), nullable=False)
+    progress: Mapped[int] = sa.Column(sa.BigInteger(), nullable=False, default=0)
+    total: Mapped[int | None] = sa.Column(sa.BigInteger(), nullable=True)
+    result: Mapped[dict[str, t.Any] | None] = sa.Column(JSONB(), nullable=True)
+    error: Mapped[str | None] = sa.Column(sa.String(), nullable=True)
+    cancel_requested: Mapped[bool] = sa.Column(sa.Boolean(), nullable=False, default=False)
+    created_at: Mapped[datetime] = sa.Column(sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now())
+    started_at: Mapped[datetime | None] = sa.Column(sa.DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = sa.Column(sa.DateTime(timezone=True), nullable=True)
+    heartbeat_at: Mapped[datetime | None] = sa.Column(sa.DateTime(timezone=True), nullable=True)
+
+
+    __table_args__ = (
+        Index("job_queue_idx", created_at, postgresql_where=status == "queued"),
+        Index("job_running_idx", heartbeat_at, postgresql_where=status == "running"),
+    )
+
+
+    @classmethod
+    async def claim(cls, conn: AsyncConnection) -> sa.RowMapping | None:
+        response = await conn.execute(cls._dump_claim_stmt())
+
+        return response.mappings().one_or_none()
+
+
+    @classmethod
+    async def report(cls, conn: AsyncConnection, ident: uuid.UUID, progress: int, total: int | None = None) -> bool:
+        values: dict[str, t.Any] = {"progress": progress, "heartbeat_at": sa.func.now()}
+
+        if total is not None:
+            values["total"] = total
+
+        stmt = sa.update(cls).where(cls.ident == ident).values(values).returning(cls.cancel_requested)
+
+        return bool((await conn.execute(stmt)).scalar_one_or_none())
+
+
+    @classmethod
+    async def heartbeat(cls, conn: AsyncConnection, idents: t.Sequence[uuid.UUID]) -> list[uuid.UUID]:
+        stmt = sa.update(cls).where(
+            cls.ident.in_(idents),
+            cls.status == "running"
+        ).values(heartbeat_at=sa.func.now()).returning(cls.ident, cls.cancel_requested)
+
+        response = await conn.execute(stmt)
+
+        return [row.ident for row in response if row.cancel_requested]
+
+
+    @classmethod
+    async def finish(
+            cls,
+            conn: AsyncConnection,
+            ident: uuid.UUID,
+            status: str,
+            progress: int | None = None,
+            result: dict[str, t.Any] | None = None,
+            error: str | None = None
+        ) -> None:
+        values: dict[str, t.Any] = {"status": status, "result": result, "error": error, "finished_at": sa.func.now()}
+
+        if progress is not None:
+            values["progress"] = progress
+
+        stmt = sa.update(cls).where(cls.ident == ident).values(values)
+
+        await conn.execute(stmt)
+
+
+    @classmethod
+    async def request_cancel(cls, conn: AsyncConnection, ident: uuid.UUID) -> str | None:
+        queued = cls.status == "queued"
+
+        stmt = sa.update(cls).where(
+            cls.ident == ident,
+            cls.status.in_(("queued", "running"))
+        ).values(
+            cancel_requested=True,
+            status=sa.case((queued, "cancelled"), else_=cls.status),
+            finished_at=sa.case((queued, sa.func.now()), else_=cls.finished_at)
+        ).returning(cls.status)
+
+        return (await conn.execute(stmt)).scalar_one_or_none()
+
+
+    @classmethod
+    async def fail_stale(cls, conn: AsyncConnection, stale_after: float) -> int:
+        stmt = sa.update(cls).where(
+            cls.status == "running",
+            cls.heartbeat_at < sa.func.now() - sa.literal(timedelta(seconds=stale_after), sa.Interval)
+        ).values(
+            status="failed",
+            error="interrupted",
+            finished_at=sa.func.now()
+        )
+
+        return (await conn.execute(stmt)).rowcount
+
+
+    @classmethod
+    def _dump_claim_stmt(cls):
+        candidate = sa.select(cls.ident).where(
+            cls.status == "queued"
+        ).order_by(cls.created_at).limit(1).with_for_update(skip_locked=True).scalar_subquery()
+
+        return sa.update(cls).where(cls.ident == candidate).values(
+            status="running",
+            started_at=sa.func.now(),
+            heartbeat_at=sa.func.now()
+        ).returning(*cls.__table__.columns)
+
+
+class JobFileModel(Base):
+    __tablename__ = "job_file_table"
+
+    job_ident: Mapped[uuid.UUID] = sa.Column(sa.UUID(as_uuid=True), sa.ForeignKey("job_table.ident", ondelete="CASCADE"), primary_key=True, nullable=False)
+    name: Mapped[str] = sa.Column(sa.String(), primary_key=True, nullable=False)
+    seq: Mapped[int] = sa.Column(sa.Integer(), primary_key=True, nullable=False)
+    data: Mapped[bytes] = sa.Column(sa.LargeBinary(), nullable=False)
+
+
+    @classmethod
+    async def read(cls, conn: AsyncConnection, job_ident: uuid.UUID, name: str) -> t.AsyncIterator[bytes]:
+        stmt = sa.select(cls.data).where(
+            cls.job_ident == job_ident,
+            cls.name == name
+        ).order_by(cls.seq)
+
+        async for data in await conn.stream_scalars(stmt):
+            yield data
+
+
+    @classmethod
+    async def remove(cls, conn: AsyncConnection, job_ident: uuid.UUID, name: str) -> None:
+        stmt = sa.delete(cls).where(
+            cls.job_ident == job_ident,
+            cls.name == name
+        )
+
+        await conn.execute(stmt)
+
+
+class TombstoneModel(Base):
+    __tablename__ = "tombstone_table"
+
+    entity: Mapped[str] = sa.Column(sa.String(), primary_key=True, nullable=False)
+    version: Mapped[int] = sa.Column(sa.BigInteger(), primary_key=True, nullable=False, server_default=sa.text(CURRENT_VERSION))
+    ident: Mapped[uuid.UUID] = sa.Column(sa.UUID(as_uuid=True), primary_key=True, nullable=False)
+    deleted_at: Mapped[datetime] = sa.Column(sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now())
+
+
+    @classmethod
+    def _dump_tombstones_stmt(cls, entity: str, position: tuple[int, int, uuid.UUID] | None, bound: int, limit: int):
+        return sa.select(cls.ident, cls.version, cls.deleted_at).where(
+            cls.entity == entity,
+            _dump_changes_expression(cls.version, cls.ident, 0, position),
+            cls.version < bound
+        ).order_by(cls.version, cls.ident).limit(limit)
+
+
+sa.event.listen(
+    Base.metadata,
+    "before_create",
+    sa.DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+)
+
+sa.event.listen(
+    Base.metadata,
+    "before_create",
+    sa.DDL("CREATE EXTENSION IF NOT EXISTS btree_gist")
+)
+
+sa.event.listen(
+    Base.metadata,
+    "before_create",
+    sa.DDL(f"""
+        CREATE OR REPLACE FUNCTION track_row_version() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' AND NEW IS NOT DISTINCT FROM OLD THEN
+                RETURN NEW;
+            END IF;
+
+            NEW.version := {CURRENT_VERSION};
+            NEW.updated_at := now();
+
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+)
+
+sa.event.listen(
+    Base.metadata,
+    "before_create",
+    sa.DDL("""
+        CREATE OR REPLACE FUNCTION record_tombstone() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO tombstone_table (entity, ident) VALUES (TG_TABLE_NAME, OLD.ident) ON CONFLICT DO NOTHING;
+
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+)
+
+for model in (WelderModel, WelderCertificationModel, NDTModel):
+    sa.event.listen(
+        model.__table__,
+        "after_create",
+        sa.DDL(
+            f"CREATE TRIGGER {model.__tablename__}_version_trigger BEFORE INSERT OR UPDATE ON {model.__tablename__} "
+            "FOR EACH ROW EXECUTE FUNCTION track_row_version()"
+        )
+    )
+
+    sa.event.listen(
+        model.__table__,
+        "after_create",
+        sa.DDL(
+            f"CREATE TRIGGER {model.__tablename__}_tombstone_trigger AFTER DELETE ON {model.__tablename__} "
+            "FOR EACH ROW EXECUTE FUNCTION record_tombstone()"
+        )
+    )
@@ -0,0 +1,398 @@
+from collections.abc import Hashable, Iterable, Mapping
+from datetime import date, datetime
+from time import perf_counter
+import asyncio
+import sys
+import typing as t
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.exc import DBAPIError
+import sqlalchemy as sa
+
+from src.models import WelderCertificationModel
+from src.settings import Settings
+from src.shemas import JointRequestShema
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+__all__ = [
+    "CertificationIndex",
+    "certification_index"
+]
+
+
+RANGE_COLUMNS = ("details_thikness", "outer_diameter", "rod_diameter")
+CATEGORY_COLUMNS = ("method", "gtd", "welding_materials_groups")
+
+
+class _Vocabulary:
+    def __init__(self) -> None:
+        self.bits: dict[Hashable, int] = {}
+
+
+    @property
+    def words(self) -> int:
+        return max(len(self.bits) - 1, 0) // 64 + 1
+
+
+    def get(self, value: Hashable) -> int | None:
+        return self.bits.get(value)
+
+
+    def add(self, value: Hashable) -> int:
+        bit = self.bits.get(value)
+
+        if bit is None:
+            bit = self.bits[value] = len(self.bits)
+
+        return bit
+
+
+class CertificationIndex:
+    def __init__(self) -> None:
+        self.built_on: date | None = None
+        self.built_at: datetime | None = None
+        self.build_time = 0.0
+        self.stale = False
+        self._lock = asyncio.Lock()
+        self._building = False
+        self._invalidated = False
+        self._pending: list[sa.ColumnElement | list[uuid.UUID | str]] = []
+        self._reset(0)
+
+
+    @property
+    def enabled(self) -> bool:
+        return np is not None and Settings.CERTIFICATION_INDEX()
+
+
+    @property
+    def ready(self) -> bool:
+        return self.enabled and self.built_on is not None and not self.stale
+
+
+    def supports(self, joint: JointRequestShema) -> bool:
+        return self.ready and joint.welding_position is None and joint.as_of >= self.built_on
+
+
+    async def build(self, conn: AsyncConnection) -> None:
+        async with self._lock:
+            start = perf_counter()
+            today = date.today()
+
+            self._building = True
+            self._invalidated = False
+            self._pending = []
+
+            try:
+                response = await conn.execute(
+                    self._dump_select_stmt(WelderCertificationModel.expiration_date_fact >= today)
+                )
+
+                self.load(response.mappings().all())
+
+                self.built_on = today
+
+                while self._pending:
+                    pending, self._pending = self._pending, []
+
+                    for change in pending:
+                        if isinstance(change, list):
+                            self.remove(change)
+                        else:
+                            await self._apply(conn, change)
+
+            finally:
+                self._building = False
+
+            self.built_at = datetime.now()
+            self.build_time = perf_counter() - start
+            self.stale = self._invalidated
+
+
+    async def refresh(self, conn: AsyncConnection, expression: sa.ColumnElement) -> None:
+        if self._building:
+            self._pending.append(expression)
+            return
+
+        if not self.ready:
+            return
+
+        async with self._lock:
+            await self._apply(conn, expression)
+
+
+    def discard(self, idents: list[uuid.UUID | str]) -> None:
+        if self._building:
+            self._pending.append(idents)
+
+        self.remove(idents)
+
+
+    def invalidate(self) -> None:
+        self.stale = True
+        self._invalidated = True
+
+
+    async def keep_fresh(self, engine: AsyncEngine, interval: float) -> None:
+        """Rebuild every interval: writes made by other worker processes only reach this index through a rebuild."""
+        while True:
+            await asyncio.sleep(interval)
+
+            try:
+                async with engine.connect() as conn:
+                    await self.build(conn)
+            except (DBAPIError, OSError):
+                continue
+
+
+    def load(self, rows: t.Sequence[Mapping[str, t.Any]]) -> None:
+        size = len(rows)
+
+        self._reset(size)
+        self._size = size
+        self._idents = [row["ident"] for row in rows]
+        self._kleymos = [row["kleymo"] for row in rows]
+        self._positions = {ident: position for position, ident in enumerate(self._idents)}
+        self._alive[:size] = True
+
+        self._certification_date[:size] = [row["certification_date"].toordinal() for row in rows]
+        self._expiration_date[:size] = [row["expiration_date_fact"].toordinal() for row in rows]
+
+        for name in RANGE_COLUMNS:
+            lower = self._dump_bound([row[f"{name}_from"] for row in rows], -np.inf)
+            upper = self._dump_bound([row[f"{name}_before"] for row in rows], np.inf)
+
+            self._lower[name][:size] = np.minimum(lower, upper)
+            self._upper[name][:size] = np.maximum(lower, upper)
+
+        for name in CATEGORY_COLUMNS:
+            vocabulary = self._vocabularies[name]
+            positions: list[int] = []
+            bits: list[int] = []
+
+            for position, row in enumerate(rows):
+                for value in self._iter_values(row[name]):
+                    positions.append(position)
+                    bits.append(vocabulary.add(value))
+
+            self._bits[name] = np.zeros((size, vocabulary.words), dtype=np.uint64)
+
+            if bits:
+                bits_array = np.array(bits, dtype=np.uint64)
+
+                np.bitwise_or.at(
+                    self._bits[name],
+                    (np.array(positions, dtype=np.intp), (bits_array // 64).astype(np.intp)),
+                    np.left_shift(np.uint64(1), bits_array % np.uint64(64))
+                )
+
+
+    def remove(self, idents: Iterable[uuid.UUID | str]) -> None:
+        for ident in idents:
+            position = self._positions.pop(self._normalize_ident(ident), None)
+
+            if position is None:
+                continue
+
+            self._alive[position] = False
+            self._idents[position] = None
+            self._kleymos[position] = None
+            self._free.append(position)
+
+
+    def screen(self, joint: JointRequestShema) -> list[uuid.UUID]:
+        size = self._size
+        as_of = joint.as_of.toordinal()
+
+        mask = self._alive[:size] & (self._certification_date[:size] <= as_of) & (self._expiration_date[:size] >= as_of)
+
+        for name, value in (
+            ("method", joint.method),
+            ("welding_materials_groups", joint.welding_materials_group),
+            ("gtd", joint.gtd)
+        ):
+            if value is None:
+                continue
+
+            bit = self._vocabularies[name].get(value)
+
+            if bit is None:
+                return []
+
+            mask &= self._has_bit(name, bit, size)
+
+        for name, value in (
+            ("details_thikness", joint.details_thikness),
+            ("outer_diameter", joint.outer_diameter),
+            ("rod_diameter", joint.rod_diameter)
+        ):
+            if value is None:
+                continue
+
+            mask &= (self._lower[name][:size] <= value) & (self._upper[name][:size] >= value)
+
+        return [self._idents[position] for position in np.flatnonzero(mask)]
+
+
+    def stats(self) -> dict[str, t.Any]:
+        arrays = [
+            self._alive,
+            self._certification_date,
+            self._expiration_date,
+            *self._lower.values(),
+            *self._upper.values(),
+            *self._bits.values()
+        ]
+
+        return {
+            "enabled": self.enabled,
+            "ready": self.ready,
+            "rows": len(self._positions),
+            "capacity": len(self._alive),
+            "array_bytes": sum(array.nbytes for array in arrays) if np is not None else 0,
+            "python_bytes": sys.getsizeof(self._idents) + sys.getsizeof(self._kleymos) + sys.getsizeof(self._positions),
+            "vocabularies": {name: len(vocabulary.bits) for name, vocabulary in self._vocabularies.items()},
+            "build_time": self.build_time,
+            "built_at": self.built_at.isoformat() if self.built_at else None
+        }
+
+
+    def _reset(self, capacity: int) -> None:
+        self._size = 0
+        self._idents: list[uuid.UUID | None] = []
+        self._kleymos: list[str | None] = []
+        self._positions: dict[uuid.UUID, int] = {}
+        self._free: list[int] = []
+        self._vocabularies = {name: _Vocabulary() for name in CATEGORY_COLUMNS}
+
+        if np is None:
+            self._alive = []
+            self._certification_date = self._expiration_date = []
+            self._lower = self._upper = self._bits = {}
+            return
+
+        self._alive = np.zeros(capacity, dtype=np.bool_)
+        self._certification_date = np.zeros(capacity, dtype=np.int32)
+        self._expiration_date = np.zeros(capacity, dtype=np.int32)
+        self._lower = {name: np.full(capacity, -np.inf) for name in RANGE_COLUMNS}
+        self._upper = {name: np.full(capacity, np.inf) for name in RANGE_COLUMNS}
+        self._bits = {name: np.zeros((capacity, 1), dtype=np.uint64) for name in CATEGORY_COLUMNS}
+
+
+    def _put(self, row: Mapping[str, t.Any]) -> None:
+        if self._free:
+            position = self._free.pop()
+        else:
+            position = self._size
+            self._size += 1
+            self._idents.append(None)
+            self._kleymos.append(None)
+
+            if position >= len(self._alive):
+                self._grow(max(position * 2, 64))
+
+        self._idents[position] = row["ident"]
+        self._kleymos[position] = row["kleymo"]
+        self._positions[row["ident"]] = position
+        self._alive[position] = True
+        self._certification_date[position] = row["certification_date"].toordinal()
+        self._expiration_date[position] = row["expiration_date_fact"].toordinal()
+
+        for name in RANGE_COLUMNS:
+            lower = row[f"{name}_from"]
+            upper = row[f"{name}_before"]
+            lower = -np.inf if lower is None else lower
+            upper = np.inf if upper is None else upper
+
+            self._lower[name][position] = min(lower, upper)
+            self._upper[name][position] = max(lower, upper)
+
+        for name in CATEGORY_COLUMNS:
+            vocabulary = self._vocabularies[name]
+            bits = [vocabulary.add(value) for value in self._iter_values(row[name])]
+
+            if vocabulary.words > self._bits[name].shape[1]:
+                self._bits[name] = np.pad(self._bits[name], ((0, 0), (0, vocabulary.words - self._bits[name].shape[1])))
+
+            self._bits[name][position] = 0
+
+            for bit in bits:
+                self._bits[name][position, bit // 64] |= np.uint64(1) << np.uint64(bit % 64)
+
+
+    def _grow(self, capacity: int) -> None:
+        extra = capacity - len(self._alive)
+
+        self._alive = np.concatenate([self._alive, np.zeros(extra, dtype=np.bool_)])
+        self._certification_date = np.concatenate([self._certification_date, np.zeros(extra, dtype=np.int32)])
+        self._expiration_date = np.concatenate([self._expiration_date, np.zeros(extra, dtype=np.int32)])
+
+        for name in RANGE_COLUMNS:
+            self._lower[name] = np.concatenate([self._lower[name], np.full(extra, -np.inf)])
+            self._upper[name] = np.concatenate([self._upper[name], np.full(extra, np.inf)])
+
+        for name in CATEGORY_COLUMNS:
+            self._bits[name] = np.pad(self._bits[name], ((0, extra), (0, 0)))
+
+
+    async def _apply(self, conn: AsyncConnection, expression: sa.ColumnElement) -> None:
+        response = await conn.execute(self._dump_select_stmt(expression))
+
+        for row in response.mappings().all():
+            self.remove([row["ident"]])
+
+            if row["expiration_date_fact"] >= self.built_on:
+                self._put(row)
+
+
+    def _has_bit(self, name: str, bit: int, size: int):
+        words = self._bits[name][:size, bit // 64]
+
+        return (words & (np.uint64(1) << np.uint64(bit % 64))) != 0
+
+
+    @staticmethod
+    def _dump_bound(values: list[float | None], default: float):
+        return np.array([default if value is None else value for value in values], dtype=np.float64)
+
+
+    @staticmethod
+    def _iter_values(value: t.Any) -> list[Hashable]:
+        if value is None:
+            return []
+
+        if isinstance(value, (list, tuple)):
+            return list(value)
+
+        return [value]
+
+
+    @staticmethod
+    def _normalize_ident(ident: uuid.UUID | str) -> uuid.UUID:
+        if isinstance(ident, uuid.UUID):
+            return ident
+
+        return uuid.UUID(ident)
+
+
+    @staticmethod
+    def _dump_select_stmt(expression: sa.ColumnElement):
+        model = WelderCertificationModel
+
+        return sa.select(
+            model.ident,
+            model.kleymo,
+            model.certification_date,
+            model.expiration_date_fact,
+            *[getattr(model, name) for name in CATEGORY_COLUMNS],
+            *[getattr(model, f"{name}_{suffix}") for name in RANGE_COLUMNS for suffix in ("from", "before")]
+        ).where(expression)
+
+
+certification_index = CertificationIndex()
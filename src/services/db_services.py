@@ -1,56 +1,538 @@
-from sqlalchemy import select
-from naks_library.base_db_service import BaseDBService
-
-from src.models import WelderModel, WelderCertificationModel, NDTModel
-from src.shemas import *
-
-
-__all__: list[str] = [
-    "WelderDBService",
-    "WelderCertificationDBService",
-    "NDTDBService"
-]
-
-
-class WelderDBService(BaseDBService[WelderShema, WelderModel, WelderRequestShema]):
-    __shema__ = WelderShema
-    __model__ = WelderModel
-
-
-class WelderCertificationDBService(BaseDBService[WelderCertificationShema, WelderCertificationModel, WelderCertificationRequestShema]):
-    __shema__ = WelderCertificationShema
-    __model__ = WelderCertificationModel
-
-
-    async def select_by_kleymo(self, kleymo: str) -> list[WelderCertificationShema] | None:
-        async with self.uow as uow:
-            stmt = select(self.__model__).where(
-                self.__model__.kleymo == kleymo
-            )
-
-            res = await uow.conn.execute(stmt)
-
-            result = res.scalars().all()
-
-            if result:
-                return [self.__shema__.model_validate(el, from_attributes=True) for el in result]
-
-
-class NDTDBService(BaseDBService[NDTShema, NDTModel, NDTRequestShema]):
-    __shema__ = NDTShema
-    __model__ = NDTModel
-
-
-    async def select_by_kleymo(self, kleymo: str) -> list[NDTShema] | None:
-        async with self.uow as uow:
-
-            stmt = select(self.__model__).where(
-                self.__model__.kleymo == kleymo
-            )
-
-            res = await uow.conn.execute(stmt)
-
-            result = res.scalars().all()
-
-            if result:
-                return [self.__shema__.model_validate(el, from_attributes=True) for el in result]
+from collections.abc import AsyncIterator
+from datetime import date
+import typing as t
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, inspect as sa_inspect
+import sqlalchemy as sa
+from sqlalchemy.exc import DBAPIError
+from asyncpg import PostgresError
+from pydantic import ValidationError
+from naks_library.base_db_service import BaseDBService
+from naks_library import BaseShema
+
+from src.models import Base, WelderModel, WelderCertificationModel, NDTModel
+from src.utils.loaders import BatchLoader
+from src.utils.cache import TTLCache
+from src.utils.etags import dump_result_version
+from src.utils.funcs import dump_validation_errors
+from src.services.certification_index import certification_index
+from src.settings import Settings
+from src.database import replica_engine
+from src.shemas import *
+
+
+__all__: list[str] = [
+    "WelderDBService",
+    "WelderCertificationDBService",
+    "NDTDBService",
+    "get_cache_stats"
+]
+
+
+class BaseExtendedDBService[Shema: BaseShema, Model: Base, RequestShema: BaseSelectRequestShema](BaseDBService[Shema, Model, RequestShema]):
+    __shema__: type[Shema]
+    __create_shema__: type[Shema]
+    __model__: type[Model]
+    __cache__: t.ClassVar[TTLCache | None] = None
+    __cache_aliases__: t.ClassVar[tuple[str, ...]] = ("ident",)
+
+
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(session)
+
+        self._populate_cache = replica_engine is None or session.bind is not replica_engine
+
+
+    async def get(self, ident: str) -> Shema | None:
+        result = await self.get_with_version(ident)
+
+        if result:
+            return result[0]
+
+
+    async def get_with_version(self, ident: str) -> tuple[Shema, str] | None:
+        if self.__cache__ is not None:
+            result = self.__cache__.get(self._dump_cache_key(ident))
+
+            if result is not None:
+                return result
+
+            generation = self.__cache__.generation
+
+        async with self.uow as uow:
+            row = await self.__model__.get_with_version(uow.conn, ident)
+
+        if not row:
+            return None
+
+        result = (self.__shema__.model_validate(row, from_attributes=True), row["row_version"])
+
+        if self.__cache__ is not None and self._populate_cache:
+            self.__cache__.set(
+                [(alias, getattr(result[0], alias)) for alias in self.__cache_aliases__],
+                result,
+                generation
+            )
+
+        return result
+
+
+    async def get_fields_with_version(self, ident: str, fields: t.Sequence[str]) -> tuple[dict[str, t.Any], str] | None:
+        if self.__cache__ is not None:
+            result = self.__cache__.get(self._dump_cache_key(ident))
+
+            if result is not None:
+                return (result[0].model_dump(include=set(fields)), result[1])
+
+        async with self.uow as uow:
+            row = await self.__model__.get_with_version(uow.conn, ident, columns=fields)
+
+        if not row:
+            return None
+
+        return ({field: row[field] for field in fields}, row["row_version"])
+
+
+    async def update(self, ident: str, data: BaseShema) -> None:
+        try:
+            await super().update(ident, data)
+        finally:
+            self._invalidate(ident)
+
+
+    async def delete(self, ident: str) -> None:
+        try:
+            await super().delete(ident)
+        finally:
+            self._invalidate(ident)
+
+
+    async def get_by_idents(self, idents: list[str]) -> list[Shema | None]:
+        async with self.uow as uow:
+            result = await self.__model__.get_by_idents(uow.conn, idents)
+
+            return [
+                self.__shema__.model_validate(el, from_attributes=True) if el else None for el in result
+            ]
+
+
+    def loader(self) -> BatchLoader[str, Shema]:
+        return BatchLoader(self.get_by_idents)
+
+
+    async def select(self, request_shema: RequestShema) -> tuple[list[Shema], int | None, str | None, str]:
+        rows, amount, next_cursor = await self._select_rows(request_shema)
+
+        return (
+            [self.__shema__.model_validate(el, from_attributes=True) for el in rows],
+            amount,
+            next_cursor,
+            self._dump_result_version(rows, amount, next_cursor)
+        )
+
+
+    async def select_fields(self, request_shema: RequestShema, fields: t.Sequence[str]) -> tuple[list[dict[str, t.Any]], int | None, str | None, str]:
+        rows, amount, next_cursor = await self._select_rows(request_shema, columns=list(fields))
+
+        return (
+            [{field: row[field] for field in fields} for row in rows],
+            amount,
+            next_cursor,
+            self._dump_result_version(rows, amount, next_cursor)
+        )
+
+
+    async def select_version(self, request_shema: RequestShema) -> str:
+        rows, amount, next_cursor = await self._select_rows(request_shema, columns=[])
+
+        return self._dump_result_version(rows, amount, next_cursor)
+
+
+    async def changes(self, cursor: str | None, limit: int) -> tuple[list[Shema], list[dict[str, t.Any]], str | None, bool]:
+        async with self.uow as uow:
+            upserts, tombstones, next_cursor, has_more = await self.__model__.get_changes(uow.conn, cursor, limit)
+
+        return (
+            [self.__shema__.model_validate(el, from_attributes=True) for el in upserts],
+            [{"ident": el["ident"], "deleted_at": el["deleted_at"]} for el in tombstones],
+            next_cursor,
+            has_more
+        )
+
+
+    async def count(self, request_shema: RequestShema) -> int:
+        async with self.uow as uow:
+            return await self.__model__.count(uow.conn, self.__model__._dump_get_many_stmt(request_shema.dump_expression()))
+
+
+    async def get_many(self, request_shema: RequestShema) -> tuple[list[Shema], int | None]:
+        async with self.uow as uow:
+            result, amount = await self.__model__.get_many(
+                uow.conn,
+                request_shema.dump_expression(),
+                limit=request_shema.limit,
+                offset=request_shema.offset,
+                count_mode=request_shema.count_mode
+            )
+
+            return (
+                [self.__shema__.model_validate(el, from_attributes=True) for el in result],
+                amount
+            )
+
+
+    async def get_page(self, request_shema: RequestShema) -> tuple[list[Shema], int | None, str | None]:
+        async with self.uow as uow:
+            result, amount, next_cursor = await self.__model__.get_page(
+                uow.conn,
+                request_shema.dump_expression(),
+                limit=request_shema.limit,
+                cursor=request_shema.cursor,
+                count_mode=request_shema.count_mode
+            )
+
+            return (
+                [self.__shema__.model_validate(el, from_attributes=True) for el in result],
+                amount,
+                next_cursor
+            )
+
+
+    async def export(self, request_shema: RequestShema, yield_per: int | None = None) -> AsyncIterator[list[dict[str, t.Any]]]:
+        async with self.uow as uow:
+            partitions = self.__model__.stream(
+                uow.conn,
+                request_shema.dump_expression(),
+                yield_per=yield_per or Settings.EXPORT_YIELD_PER()
+            )
+
+            async for partition in partitions:
+                yield [
+                    self.__shema__.model_validate(el, from_attributes=True).model_dump(mode="json") for el in partition
+                ]
+
+
+    async def bulk_add(self, rows: AsyncIterator[t.Any], chunk_size: int | None = None) -> dict[str, t.Any]:
+        errors: list[dict[str, t.Any]] = []
+
+        inserted = await self.add_chunks(self._iter_chunks(rows, chunk_size, errors), errors)
+
+        return {
+            "inserted": inserted,
+            "rejected": len(errors),
+            "errors": sorted(errors, key=lambda error: error["index"]),
+            "truncated": getattr(rows, "truncated", False)
+        }
+
+
+    async def add_chunks(self, chunks: AsyncIterator[list[tuple[int, dict[str, t.Any]]]], errors: list[dict[str, t.Any]]) -> int:
+        inserted = 0
+
+        async with self.uow as uow:
+            async for chunk in chunks:
+                inserted += await self._write_chunk(uow, chunk, errors)
+
+        return inserted
+
+
+    async def bulk_upsert(self, rows: AsyncIterator[t.Any], chunk_size: int | None = None) -> dict[str, t.Any]:
+        inserted = 0
+        updated = 0
+        unchanged = 0
+        errors: list[dict[str, t.Any]] = []
+
+        async with self.uow as uow:
+            async for chunk in self._iter_chunks(rows, chunk_size, errors):
+                rejected = len(errors)
+
+                chunk_inserted, chunk_updated = await self._upsert_chunk(uow, chunk, errors)
+
+                inserted += chunk_inserted
+                updated += chunk_updated
+                unchanged += len(chunk) - chunk_inserted - chunk_updated - (len(errors) - rejected)
+
+                if chunk_updated:
+                    self._invalidate()
+
+        return {
+            "inserted": inserted,
+            "updated": updated,
+            "unchanged": unchanged,
+            "rejected": len(errors),
+            "errors": sorted(errors, key=lambda error: error["index"]),
+            "truncated": getattr(rows, "truncated", False)
+        }
+
+
+    async def _iter_chunks(self, rows: AsyncIterator[t.Any], chunk_size: int | None, errors: list[dict[str, t.Any]]) -> AsyncIterator[list[tuple[int, dict[str, t.Any]]]]:
+        chunk_size = chunk_size or Settings.BULK_CHUNK_SIZE()
+
+        chunk: list[tuple[int, dict[str, t.Any]]] = []
+        index = 0
+
+        async for row in rows:
+            try:
+                chunk.append((index, self._validate_create_row(row).model_dump()))
+            except ValidationError as e:
+                errors.append({"index": index, "detail": dump_validation_errors(e)})
+
+            index += 1
+
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+
+    async def _select_rows(self, request_shema: RequestShema, columns: list[str] | None = None) -> tuple[t.Sequence[t.Any], int | None, str | None]:
+        async with self.uow as uow:
+            if request_shema.is_keyset:
+                return await self.__model__.get_page(
+                    uow.conn,
+                    request_shema.dump_expression(),
+                    limit=request_shema.limit,
+                    cursor=request_shema.cursor,
+                    count_mode=request_shema.count_mode,
+                    columns=columns
+                )
+
+            rows, amount = await self.__model__.get_many(
+                uow.conn,
+                request_shema.dump_expression(),
+                limit=request_shema.limit,
+                offset=request_shema.offset,
+                count_mode=request_shema.count_mode,
+                columns=columns
+            )
+
+            return (rows, amount, None)
+
+
+    def _dump_result_version(self, rows: t.Sequence[t.Any], amount: int | None, next_cursor: str | None) -> str:
+        key = sa_inspect(self.__model__).primary_key[0].key
+
+        return dump_result_version(rows, key, amount, next_cursor)
+
+
+    def _dump_cache_key(self, ident: str) -> tuple[str, t.Any]:
+        column = self.__model__._get_column(ident)
+
+        try:
+            return (column.key, self.__model__._normalize_ident(column, ident))
+        except ValueError:
+            return (column.key, ident)
+
+
+    def _invalidate(self, ident: str | None = None) -> None:
+        if self.__cache__ is None:
+            return
+
+        if ident is None:
+            self.__cache__.clear()
+        else:
+            self.__cache__.pop(self._dump_cache_key(ident))
+
+
+    def _validate_create_row(self, row: t.Any) -> Shema:
+        if isinstance(row, (bytes, str)):
+            return self.__create_shema__.model_validate_json(row)
+
+        return self.__create_shema__.model_validate(row)
+
+
+    async def _write_chunk(self, uow, chunk: list[tuple[int, dict[str, t.Any]]], errors: list[dict[str, t.Any]]) -> int:
+        data = [el for _, el in chunk]
+
+        try:
+            async with uow.conn.begin_nested():
+                if len(data) >= Settings.BULK_COPY_THRESHOLD():
+                    await self.__model__.copy(data, conn=uow.conn)
+                else:
+                    await self.__model__.create(data, conn=uow.conn)
+
+            inserted = len(data)
+
+        except (DBAPIError, PostgresError):
+            inserted = 0
+
+            for index, el in chunk:
+                try:
+                    async with uow.conn.begin_nested():
+                        await self.__model__.create([el], conn=uow.conn)
+
+                    inserted += 1
+
+                except DBAPIError as e:
+                    errors.append({"index": index, "detail": str(e.orig)})
+
+        await uow.commit()
+
+        return inserted
+
+
+    async def _upsert_chunk(self, uow, chunk: list[tuple[int, dict[str, t.Any]]], errors: list[dict[str, t.Any]]) -> tuple[int, int]:
+        data = [el for _, el in chunk]
+
+        try:
+            async with uow.conn.begin_nested():
+                result = await self.__model__.upsert(data, conn=uow.conn)
+
+        except DBAPIError:
+            result = (0, 0)
+
+            for index, el in chunk:
+                try:
+                    async with uow.conn.begin_nested():
+                        inserted, updated = await self.__model__.upsert([el], conn=uow.conn)
+
+                    result = (result[0] + inserted, result[1] + updated)
+
+                except DBAPIError as e:
+                    errors.append({"index": index, "detail": str(e.orig)})
+
+        await uow.commit()
+
+        return result
+
+
+class WelderDBService(BaseExtendedDBService[WelderShema, WelderModel, WelderRequestShema]):
+    __shema__ = WelderShema
+    __create_shema__ = CreateWelderShema
+    __model__ = WelderModel
+    __cache__ = TTLCache(Settings.CACHE_MAXSIZE(), Settings.CACHE_TTL())
+    __cache_aliases__ = ("ident", "kleymo")
+
+
+    async def get_profile(self, ident: str, ndt_from: date | None = None, ndt_before: date | None = None) -> WelderProfileShema | None:
+        async with self.uow as uow:
+            result = await self.__model__.get_profile(uow.conn, ident, ndt_from, ndt_before)
+
+            if result:
+                return WelderProfileShema.model_validate(result, from_attributes=True)
+
+
+    async def get_qualified(self, joint: JointRequestShema) -> list[QualifiedWelderShema]:
+        expression = joint.dump_expression()
+
+        if certification_index.supports(joint):
+            idents = certification_index.screen(joint)
+
+            if not idents:
+                return []
+
+            expression = sa.and_(
+                expression,
+                WelderCertificationModel.ident == sa.any_(
+                    sa.bindparam("idents", idents, type_=sa.ARRAY(WelderCertificationModel.ident.type))
+                )
+            )
+
+        async with self.uow as uow:
+            result = await self.__model__.get_qualified(uow.conn, expression, joint.limit)
+
+            return [QualifiedWelderShema.model_validate(el, from_attributes=True) for el in result]
+
+
+    def _invalidate(self, ident: str | None = None) -> None:
+        super()._invalidate(ident)
+
+        WelderCertificationDBService.__cache__.clear()
+        NDTDBService.__cache__.clear()
+        certification_index.invalidate()
+
+
+class WelderCertificationDBService(BaseExtendedDBService[WelderCertificationShema, WelderCertificationModel, WelderCertificationRequestShema]):
+    __shema__ = WelderCertificationShema
+    __create_shema__ = CreateWelderCertificationShema
+    __model__ = WelderCertificationModel
+    __cache__ = TTLCache(Settings.CACHE_MAXSIZE(), Settings.CACHE_TTL())
+
+
+    async def add(self, data: CreateWelderCertificationShema) -> None:
+        await super().add(data)
+        await self._refresh_index(self.__model__.ident == data.ident)
+
+
+    async def update(self, ident: str, data: UpdateWelderCertificationShema) -> None:
+        try:
+            await super().update(ident, data)
+        finally:
+            await self._refresh_index(self.__model__.ident == ident)
+
+
+    async def delete(self, ident: str) -> None:
+        try:
+            await super().delete(ident)
+        finally:
+            certification_index.discard([ident])
+
+
+    async def select_by_kleymo(self, kleymo: str) -> list[WelderCertificationShema] | None:
+        async with self.uow as uow:
+            stmt = select(self.__model__).where(
+                self.__model__.kleymo == kleymo
+            )
+
+            res = await uow.conn.execute(stmt)
+
+            result = res.scalars().all()
+
+            if result:
+                return [self.__shema__.model_validate(el, from_attributes=True) for el in result]
+
+
+    async def _write_chunk(self, uow, chunk: list[tuple[int, dict[str, t.Any]]], errors: list[dict[str, t.Any]]) -> int:
+        inserted = await super()._write_chunk(uow, chunk, errors)
+
+        if inserted:
+            await certification_index.refresh(uow.conn, self.__model__.ident.in_([el["ident"] for _, el in chunk]))
+
+        return inserted
+
+
+    async def _upsert_chunk(self, uow, chunk: list[tuple[int, dict[str, t.Any]]], errors: list[dict[str, t.Any]]) -> tuple[int, int]:
+        result = await super()._upsert_chunk(uow, chunk, errors)
+
+        if any(result):
+            await certification_index.refresh(uow.conn, self.__model__.kleymo.in_({el["kleymo"] for _, el in chunk}))
+
+        return result
+
+
+    async def _refresh_index(self, expression: sa.ColumnElement) -> None:
+        if not certification_index.enabled:
+            return
+
+        async with self.uow as uow:
+            await certification_index.refresh(uow.conn, expression)
+
+
+class NDTDBService(BaseExtendedDBService[NDTShema, NDTModel, NDTRequestShema]):
+    __shema__ = NDTShema
+    __create_shema__ = CreateNDTShema
+    __model__ = NDTModel
+    __cache__ = TTLCache(Settings.CACHE_MAXSIZE(), Settings.CACHE_TTL())
+
+
+    async def select_by_kleymo(self, kleymo: str) -> list[NDTShema] | None:
+        async with self.uow as uow:
+
+            stmt = select(self.__model__).where(
+                self.__model__.kleymo == kleymo
+            )
+
+            res = await uow.conn.execute(stmt)
+
+            result = res.scalars().all()
+
+            if result:
+                return [self.__shema__.model_validate(el, from_attributes=True) for el in result]
+
+
+def get_cache_stats() -> dict[str, dict[str, t.Any]]:
+    return {
+        service.__name__: service.__cache__.stats() for service in (WelderDBService, WelderCertificationDBService, NDTDBService)
+    }
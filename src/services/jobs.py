@@ -0,0 +1,339 @@
+from collections.abc import AsyncIterator, Awaitable, Callable
+from tempfile import SpooledTemporaryFile
+from time import monotonic
+import asyncio
+import logging
+import typing as t
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+import sqlalchemy as sa
+
+from src.models import JobModel, JobFileModel
+from src.database import engine, session_maker
+from src.services.db_services import WelderDBService, WelderCertificationDBService, NDTDBService
+from src.services.registry_import import RegistryImport
+from src.utils.export import EXPORT_MEDIA_TYPES, dump_csv, dump_ndjson
+from src.settings import Settings
+from src.shemas import *
+
+
+__all__ = [
+    "JobCancelled",
+    "JobContext",
+    "JobRunner",
+    "job_runner"
+]
+
+
+EXPORT_TARGETS = {
+    "welders": (WelderDBService, WelderRequestShema, WelderShema),
+    "welder_certifications": (WelderCertificationDBService, WelderCertificationRequestShema, WelderCertificationShema),
+    "ndts": (NDTDBService, NDTRequestShema, NDTShema)
+}
+
+
+JOB_FILE_CHUNK_SIZE = 1 << 20
+
+logger = logging.getLogger(__name__)
+
+
+class JobCancelled(Exception): ...
+
+
+class JobContext:
+    def __init__(self, runner: "JobRunner", ident: uuid.UUID) -> None:
+        self.runner = runner
+        self.ident = ident
+        self.progress = 0
+        self._reported_at = 0.0
+
+
+    async def report(self, progress: int, total: int | None = None, force: bool = False) -> None:
+        self.progress = progress
+
+        if not force and monotonic() - self._reported_at < self.runner.progress_interval:
+            return
+
+        self._reported_at = monotonic()
+
+        async with self.runner.engine.begin() as conn:
+            cancel_requested = await JobModel.report(conn, self.ident, progress, total)
+
+        if cancel_requested:
+            raise JobCancelled()
+
+
+type JobHandler = Callable[[JobContext, dict[str, t.Any]], Awaitable[dict[str, t.Any]]]
+
+
+class JobRunner:
+    def __init__(
+            self,
+            engine: AsyncEngine,
+            workers: int,
+            poll_interval: float,
+            progress_interval: float,
+            heartbeat_interval: float,
+            stale_after: float
+        ) -> None:
+        self.engine = engine
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.progress_interval = progress_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self.handlers: dict[str, JobHandler] = {}
+        self._tasks: list[asyncio.Task] = []
+        self._running: dict[uuid.UUID, asyncio.Task] = {}
+        self._wakeup = asyncio.Event()
+
+
+    def register(self, kind: str) -> Callable[[JobHandler], JobHandler]:
+        def decorator(handler: JobHandler) -> JobHandler:
+            self.handlers[kind] = handler
+
+            return handler
+
+        return decorator
+
+
+    async def submit(self, kind: str, params: dict[str, t.Any], files: dict[str, t.BinaryIO] | None = None) -> uuid.UUID:
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+
+        ident = uuid.uuid4()
+
+        async with self.engine.begin() as conn:
+            await JobModel.create(
+                [{"ident": ident, "kind": kind, "status": "queued", "params": params, "progress": 0, "cancel_requested": False}],
+                conn=conn
+            )
+
+            for name, file in (files or {}).items():
+                seq = 0
+
+                while data := await asyncio.to_thread(file.read, JOB_FILE_CHUNK_SIZE):
+                    await JobFileModel.create([{"job_ident": ident, "name": name, "seq": seq, "data": data}], conn=conn)
+                    seq += 1
+
+        self._wakeup.set()
+
+        return ident
+
+
+    async def get(self, ident: uuid.UUID | str) -> sa.RowMapping | None:
+        async with self.engine.connect() as conn:
+            return await JobModel.get(conn, ident)
+
+
+    async def write_file(self, ident: uuid.UUID, name: str, content: AsyncIterator[bytes]) -> None:
+        seq = 0
+
+        try:
+            async for data in content:
+                async with self.engine.begin() as conn:
+                    await JobFileModel.create([{"job_ident": ident, "name": name, "seq": seq, "data": data}], conn=conn)
+
+                seq += 1
+        except BaseException:
+            async with self.engine.begin() as conn:
+                await JobFileModel.remove(conn, ident, name)
+
+            raise
+
+
+    async def read_file(self, ident: uuid.UUID, name: str) -> AsyncIterator[bytes]:
+        async with self.engine.connect() as conn:
+            async for data in JobFileModel.read(conn, ident, name):
+                yield data
+
+
+    async def remove_file(self, ident: uuid.UUID, name: str) -> None:
+        async with self.engine.begin() as conn:
+            await JobFileModel.remove(conn, ident, name)
+
+
+    async def cancel(self, ident: uuid.UUID) -> str | None:
+        async with self.engine.begin() as conn:
+            status = await JobModel.request_cancel(conn, ident)
+
+        task = self._running.get(ident)
+
+        if task is not None:
+            task.cancel()
+
+        return status
+
+
+    async def start(self) -> None:
+        async with self.engine.begin() as conn:
+            await JobModel.fail_stale(conn, self.stale_after)
+
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._heartbeat()))
+
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        self._tasks = []
+
+
+    async def run_next(self) -> bool:
+        async with self.engine.begin() as conn:
+            job = await JobModel.claim(conn)
+
+        if job is None:
+            return False
+
+        await self._run(job)
+
+        return True
+
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                if await self.run_next():
+                    continue
+            except Exception:
+                logger.exception("Job worker failed")
+
+            self._wakeup.clear()
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except TimeoutError:
+                pass
+
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+
+            try:
+                async with self.engine.begin() as conn:
+                    cancelled = await JobModel.heartbeat(conn, list(self._running)) if self._running else []
+
+                    await JobModel.fail_stale(conn, self.stale_after)
+            except Exception:
+                logger.exception("Job heartbeat failed")
+                continue
+
+            for ident in cancelled:
+                task = self._running.get(ident)
+
+                if task is not None:
+                    task.cancel()
+
+
+    async def _run(self, job: sa.RowMapping) -> None:
+        ident = job["ident"]
+        handler = self.handlers.get(job["kind"])
+
+        if handler is None:
+            return await self._finish(ident, "failed", error=f"Unknown job kind: {job['kind']}")
+
+        context = JobContext(self, ident)
+        task = asyncio.create_task(handler(context, job["params"]))
+        result = None
+        error = None
+
+        self._running[ident] = task
+
+        try:
+            result = await task
+            status = "succeeded"
+        except JobCancelled:
+            status = "cancelled"
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                await self._finish(ident, "failed", context.progress, error="interrupted")
+                raise
+
+            status = "cancelled"
+        except Exception as e:
+            status = "failed"
+            error = str(e) or type(e).__name__
+        finally:
+            self._running.pop(ident, None)
+
+        await self._finish(ident, status, context.progress, result, error)
+
+
+    async def _finish(self, ident: uuid.UUID, status: str, progress: int | None = None, result: dict[str, t.Any] | None = None, error: str | None = None) -> None:
+        async with self.engine.begin() as conn:
+            await JobModel.finish(conn, ident, status, progress, result, error)
+
+
+job_runner = JobRunner(
+    engine,
+    Settings.JOBS_WORKERS(),
+    Settings.JOBS_POLL_INTERVAL(),
+    Settings.JOBS_PROGRESS_INTERVAL(),
+    Settings.JOBS_HEARTBEAT_INTERVAL(),
+    Settings.JOBS_STALE_AFTER()
+)
+
+
+@job_runner.register("export")
+async def export_job(context: JobContext, params: dict[str, t.Any]) -> dict[str, t.Any]:
+    service_type, request_shema, shema = EXPORT_TARGETS[params["entity"]]
+    filters = request_shema.model_validate(params["filters"])
+    format = params["format"]
+    processed = 0
+
+    async with session_maker() as session:
+        service = service_type(session)
+
+        await context.report(0, await service.count(filters), force=True)
+
+        async def partitions() -> t.AsyncIterator[list[dict[str, t.Any]]]:
+            nonlocal processed
+
+            async for partition in service.export(filters):
+                processed += len(partition)
+
+                yield partition
+
+                await context.report(processed)
+
+        if format == "csv":
+            content = dump_csv(partitions(), list(shema.model_fields))
+        else:
+            content = dump_ndjson(partitions())
+
+        await context.runner.write_file(context.ident, "result", content)
+
+    return {
+        "rows": processed,
+        "file": f"{params['entity']}.{format}",
+        "media_type": EXPORT_MEDIA_TYPES[format]
+    }
+
+
+@job_runner.register("import")
+async def import_job(context: JobContext, params: dict[str, t.Any]) -> dict[str, t.Any]:
+    try:
+        with SpooledTemporaryFile(JOB_FILE_CHUNK_SIZE) as file:
+            async for data in context.runner.read_file(context.ident, "upload"):
+                await asyncio.to_thread(file.write, data)
+
+            file.seek(0)
+
+            async with session_maker() as session:
+                registry_import = RegistryImport(
+                    session,
+                    params["entity"],
+                    params.get("chunk_size"),
+                    progress=context.report
+                )
+
+                return await registry_import.run(file, params["format"])
+
+    finally:
+        await context.runner.remove_file(context.ident, "upload")
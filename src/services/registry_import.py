@@ -0,0 +1,230 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections.abc import AsyncIterator, Iterator
+from collections import deque
+from pathlib import Path
+from time import perf_counter
+from uuid import uuid4
+import multiprocessing
+import argparse
+import asyncio
+import typing as t
+import csv
+
+from sqlalchemy.ext.asyncio import AsyncSession
+import orjson
+
+from src.services.db_services import WelderCertificationDBService, NDTDBService
+from src.utils.registry import REGISTRY_TARGETS, get_registry_format, iter_registry_rows, read_chunk, validate_chunk
+from src.settings import Settings
+
+
+__all__ = [
+    "ImportPool",
+    "RegistryImport",
+    "import_pool",
+    "IMPORT_SERVICES",
+    "get_rejected_path"
+]
+
+
+IMPORT_SERVICES = {
+    "welder_certifications": WelderCertificationDBService,
+    "ndts": NDTDBService
+}
+
+
+def get_rejected_path(name: str) -> Path:
+    return Settings.IMPORT_REJECTED_DIR() / name
+
+
+class ImportPool:
+    def __init__(self, workers: int) -> None:
+        self.workers = max(workers, 1)
+        self._executor: ProcessPoolExecutor | None = None
+
+
+    def get(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+        return self._executor
+
+
+    def discard(self, executor: ProcessPoolExecutor) -> None:
+        if self._executor is executor:
+            self._executor = None
+
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self.discard(self._executor)
+
+
+import_pool = ImportPool(Settings.IMPORT_WORKERS())
+
+
+class RegistryImport:
+    def __init__(
+            self,
+            session: AsyncSession,
+            kind: str,
+            chunk_size: int | None = None,
+            pool: ImportPool | None = None,
+            progress: t.Callable[[int], t.Awaitable[None]] | None = None
+        ) -> None:
+        self.service = IMPORT_SERVICES[kind](session)
+        self.kind = kind
+        self.chunk_size = chunk_size or Settings.IMPORT_CHUNK_SIZE()
+        self.pool = pool or import_pool
+        self.workers = self.pool.workers
+        self.progress = progress
+        self.rows = 0
+        self.rejected = 0
+        self.rejected_path: Path | None = None
+        self._header: list[str] = []
+        self._rejected_file: t.TextIO | None = None
+        self._rejected_writer = None
+
+
+    async def run(self, file: t.BinaryIO, format: str) -> dict[str, t.Any]:
+        start = perf_counter()
+        rows = iter_registry_rows(file, format)
+        header = await asyncio.to_thread(next, rows, None)
+
+        if header is None:
+            raise ValueError("File is empty")
+
+        columns = REGISTRY_TARGETS[self.kind].map_header(header)
+        errors: list[dict[str, t.Any]] = []
+
+        self._header = [str(cell) if cell is not None else "" for cell in header]
+
+        pool = self.pool.get()
+
+        try:
+            inserted = await self.service.add_chunks(self._iter_valid_chunks(pool, rows, columns, errors), errors)
+        except BrokenProcessPool:
+            self.pool.discard(pool)
+            raise
+        finally:
+            if self._rejected_file is not None:
+                self._rejected_file.close()
+
+        elapsed = perf_counter() - start
+
+        return {
+            "rows": self.rows,
+            "inserted": inserted,
+            "rejected": self.rejected,
+            "elapsed": round(elapsed, 3),
+            "rows_per_second": round(self.rows / elapsed, 1) if elapsed else None,
+            "rejected_file": self.rejected_path.name if self.rejected_path else None
+        }
+
+
+    async def _iter_valid_chunks(
+            self,
+            pool: ProcessPoolExecutor,
+            rows: Iterator[t.Sequence[t.Any]],
+            columns: list[str | None],
+            errors: list[dict[str, t.Any]]
+        ) -> AsyncIterator[list[tuple[int, dict[str, t.Any]]]]:
+        loop = asyncio.get_running_loop()
+        pending: deque[tuple[int, list[tuple[t.Any, ...]], asyncio.Future]] = deque()
+        number = 2
+        exhausted = False
+
+        try:
+            while True:
+                while not exhausted and len(pending) < self.workers * 2:
+                    chunk = await asyncio.to_thread(read_chunk, rows, self.chunk_size)
+
+                    if not chunk:
+                        exhausted = True
+                        break
+
+                    pending.append((number, chunk, loop.run_in_executor(pool, validate_chunk, self.kind, columns, chunk, number)))
+                    number += len(chunk)
+
+                if not pending:
+                    break
+
+                first, chunk, future = pending.popleft()
+                valid, rejected = await future
+                reported = len(errors)
+
+                errors.extend(rejected)
+                self.rows += len(valid) + len(rejected)
+
+                if valid:
+                    yield valid
+
+                self._write_rejected(errors[reported:], first, chunk)
+
+                del errors[reported:]
+
+                if self.progress is not None:
+                    await self.progress(self.rows)
+        finally:
+            for _, _, future in pending:
+                future.cancel()
+
+
+    def _write_rejected(self, errors: list[dict[str, t.Any]], first: int, chunk: list[tuple[t.Any, ...]]) -> None:
+        if not errors:
+            return
+
+        if self._rejected_writer is None:
+            self.rejected_path = get_rejected_path(f"{self.kind}-{uuid4().hex}.csv")
+            self.rejected_path.parent.mkdir(parents=True, exist_ok=True)
+
+            self._rejected_file = open(self.rejected_path, "w", encoding="utf-8-sig", newline="")
+            self._rejected_writer = csv.writer(self._rejected_file)
+            self._rejected_writer.writerow(["row", "error", *self._header])
+
+        for error in sorted(errors, key=lambda error: error["index"]):
+            detail = error["detail"]
+
+            self._rejected_writer.writerow([
+                error["index"],
+                detail if isinstance(detail, str) else orjson.dumps(detail, default=str).decode(),
+                *chunk[error["index"] - first]
+            ])
+
+        self.rejected += len(errors)
+
+
+async def run_import(path: Path, kind: str, chunk_size: int | None, workers: int | None) -> dict[str, t.Any]:
+    from src.database import session_maker
+
+    pool = ImportPool(workers or Settings.IMPORT_WORKERS())
+
+    try:
+        async with session_maker() as session:
+            with open(path, "rb") as file:
+                return await RegistryImport(session, kind, chunk_size, pool).run(file, get_registry_format(path.name))
+    finally:
+        pool.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import a NAKS registry export (CSV or XLSX)")
+    parser.add_argument("kind", choices=list(IMPORT_SERVICES))
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--chunk-size", type=int)
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    summary = asyncio.run(run_import(args.path, args.kind, args.chunk_size, args.workers))
+
+    print(orjson.dumps(summary, option=orjson.OPT_INDENT_2).decode())
+
+    if summary["rejected_file"]:
+        print(f"rejected rows: {get_rejected_path(summary['rejected_file'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,45 +1,253 @@
-import os
-from pathlib import Path
-
-from dotenv import load_dotenv
-
-
-if not os.getenv("MODE"):
-    load_dotenv(f"{Path(os.path.dirname(os.path.abspath(__file__))).parent.parent}/.dev.env")
-
-
-class Settings:
-
-    @classmethod
-    def DB_NAME(cls) -> str:
-        return os.getenv("DATABASE_NAME")
-    
-    
-    @classmethod
-    def DB_PASSWORD(cls) -> str:
-        return os.getenv("DATABASE_PASSWORD")
-    
-
-    @classmethod
-    def HOST(cls) -> str:
-        return os.getenv("HOST")
-    
-
-    @classmethod
-    def USER(cls) -> str:
-        return os.getenv("USER")
-    
-
-    @classmethod
-    def PORT(cls) -> str:
-        return os.getenv("PORT")
-    
-
-    @classmethod
-    def SECRET_KEY(cls) -> str:
-        return os.getenv("SECRET_KEY")
-
-
-    @classmethod
-    def BASE_DIR(cls) -> Path:
-        return Path(os.path.dirname(os.path.abspath(__file__))).parent
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+
+if not os.getenv("MODE"):
+    load_dotenv(f"{Path(os.path.dirname(os.path.abspath(__file__))).parent.parent}/.dev.env")
+
+
+class Settings:
+
+    @classmethod
+    def DB_NAME(cls) -> str:
+        return os.getenv("DATABASE_NAME")
+    
+    
+    @classmethod
+    def DB_PASSWORD(cls) -> str:
+        return os.getenv("DATABASE_PASSWORD")
+    
+
+    @classmethod
+    def HOST(cls) -> str:
+        return os.getenv("HOST")
+    
+
+    @classmethod
+    def USER(cls) -> str:
+        return os.getenv("USER")
+    
+
+    @classmethod
+    def PORT(cls) -> str:
+        return os.getenv("PORT")
+    
+
+    @classmethod
+    def SECRET_KEY(cls) -> str:
+        return os.getenv("SECRET_KEY")
+
+
+    @classmethod
+    def BASE_DIR(cls) -> Path:
+        return Path(os.path.dirname(os.path.abspath(__file__))).parent
+
+
+    @classmethod
+    def MODE(cls) -> str | None:
+        return os.getenv("MODE")
+
+
+    @classmethod
+    def DB_POOL_CLASS(cls) -> str:
+        return os.getenv("DB_POOL_CLASS", "null" if cls.MODE() == "TEST" else "queue").lower()
+
+
+    @classmethod
+    def DB_POOL_SIZE(cls) -> int:
+        return int(os.getenv("DB_POOL_SIZE", 10))
+
+
+    @classmethod
+    def DB_MAX_OVERFLOW(cls) -> int:
+        return int(os.getenv("DB_MAX_OVERFLOW", 5))
+
+
+    @classmethod
+    def DB_POOL_RECYCLE(cls) -> int:
+        return int(os.getenv("DB_POOL_RECYCLE", 1800))
+
+
+    @classmethod
+    def DB_POOL_PRE_PING(cls) -> bool:
+        return os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+
+    @classmethod
+    def DB_POOL_TIMEOUT(cls) -> float:
+        return float(os.getenv("DB_POOL_TIMEOUT", 10))
+
+
+    @classmethod
+    def BULK_CHUNK_SIZE(cls) -> int:
+        return int(os.getenv("BULK_CHUNK_SIZE", 1000))
+
+
+    @classmethod
+    def BULK_COPY_THRESHOLD(cls) -> int:
+        return int(os.getenv("BULK_COPY_THRESHOLD", 100))
+
+
+    @classmethod
+    def EXPORT_YIELD_PER(cls) -> int:
+        return int(os.getenv("EXPORT_YIELD_PER", 1000))
+
+
+    @classmethod
+    def CACHE_MAXSIZE(cls) -> int:
+        return int(os.getenv("CACHE_MAXSIZE", 10000))
+
+
+    @classmethod
+    def CACHE_TTL(cls) -> float:
+        return float(os.getenv("CACHE_TTL", 60))
+
+
+    @classmethod
+    def CERTIFICATION_INDEX(cls) -> bool:
+        return os.getenv("CERTIFICATION_INDEX", "false").lower() in ("1", "true", "yes")
+
+
+    @classmethod
+    def CERTIFICATION_INDEX_REFRESH(cls) -> float:
+        return float(os.getenv("CERTIFICATION_INDEX_REFRESH", 60))
+
+
+    @classmethod
+    def REPLICA_HOST(cls) -> str | None:
+        return os.getenv("REPLICA_HOST")
+
+
+    @classmethod
+    def REPLICA_PORT(cls) -> str:
+        return os.getenv("REPLICA_PORT", cls.PORT())
+
+
+    @classmethod
+    def REPLICA_MAX_LAG(cls) -> float:
+        return float(os.getenv("REPLICA_MAX_LAG", 5))
+
+
+    @classmethod
+    def REPLICA_CHECK_INTERVAL(cls) -> float:
+        return float(os.getenv("REPLICA_CHECK_INTERVAL", 5))
+
+
+    @classmethod
+    def METRICS_ENABLED(cls) -> bool:
+        return os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+
+    @classmethod
+    def SLOW_QUERY_THRESHOLD(cls) -> float:
+        return float(os.getenv("SLOW_QUERY_THRESHOLD", 0.5))
+
+
+    @classmethod
+    def SLOW_QUERY_LOG_PATH(cls) -> Path:
+        return Path(os.getenv("SLOW_QUERY_LOG_PATH", cls.BASE_DIR() / "logs" / "slow_queries.jsonl"))
+
+
+    @classmethod
+    def SLOW_QUERY_LOG_MAX_BYTES(cls) -> int:
+        return int(os.getenv("SLOW_QUERY_LOG_MAX_BYTES", 10 * 1024 * 1024))
+
+
+    @classmethod
+    def SLOW_QUERY_LOG_BACKUPS(cls) -> int:
+        return int(os.getenv("SLOW_QUERY_LOG_BACKUPS", 5))
+
+
+    @classmethod
+    def SLOW_QUERY_EXPLAIN_LIMIT(cls) -> int:
+        return int(os.getenv("SLOW_QUERY_EXPLAIN_LIMIT", 0))
+
+
+    @classmethod
+    def SLOW_QUERY_REDACT(cls) -> list[str]:
+        return [el.strip() for el in os.getenv("SLOW_QUERY_REDACT", "passport_number,sicil,birthday").split(",") if el.strip()]
+
+
+    @classmethod
+    def MAX_BODY_SIZE(cls) -> int:
+        return int(os.getenv("MAX_BODY_SIZE", 1024 * 1024))
+
+
+    @classmethod
+    def MAX_BULK_BODY_SIZE(cls) -> int:
+        return int(os.getenv("MAX_BULK_BODY_SIZE", 256 * 1024 * 1024))
+
+
+    @classmethod
+    def COMPRESSION_ENABLED(cls) -> bool:
+        return os.getenv("COMPRESSION_ENABLED", "true").lower() in ("1", "true", "yes")
+
+
+    @classmethod
+    def COMPRESSION_MIN_SIZE(cls) -> int:
+        return int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+
+
+    @classmethod
+    def COMPRESSION_OFFLOAD_SIZE(cls) -> int:
+        return int(os.getenv("COMPRESSION_OFFLOAD_SIZE", 256 * 1024))
+
+
+    @classmethod
+    def COMPRESSION_LEVELS(cls) -> dict[str, int]:
+        levels = {}
+
+        for encoding in ("gzip", "br", "zstd"):
+            level = os.getenv(f"COMPRESSION_LEVEL_{encoding.upper()}")
+
+            if level:
+                levels[encoding] = int(level)
+
+        return levels
+
+
+    @classmethod
+    def IMPORT_CHUNK_SIZE(cls) -> int:
+        return int(os.getenv("IMPORT_CHUNK_SIZE", 5000))
+
+
+    @classmethod
+    def IMPORT_WORKERS(cls) -> int:
+        return int(os.getenv("IMPORT_WORKERS", os.cpu_count() or 1))
+
+
+    @classmethod
+    def IMPORT_REJECTED_DIR(cls) -> Path:
+        return Path(os.getenv("IMPORT_REJECTED_DIR", cls.BASE_DIR() / "logs" / "imports"))
+
+
+    @classmethod
+    def JOBS_ENABLED(cls) -> bool:
+        return os.getenv("JOBS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+
+    @classmethod
+    def JOBS_WORKERS(cls) -> int:
+        return int(os.getenv("JOBS_WORKERS", 2))
+
+
+    @classmethod
+    def JOBS_POLL_INTERVAL(cls) -> float:
+        return float(os.getenv("JOBS_POLL_INTERVAL", 5))
+
+
+    @classmethod
+    def JOBS_PROGRESS_INTERVAL(cls) -> float:
+        return float(os.getenv("JOBS_PROGRESS_INTERVAL", 1))
+
+
+    @classmethod
+    def JOBS_HEARTBEAT_INTERVAL(cls) -> float:
+        return float(os.getenv("JOBS_HEARTBEAT_INTERVAL", 10))
+
+
+    @classmethod
+    def JOBS_STALE_AFTER(cls) -> float:
+        return float(os.getenv("JOBS_STALE_AFTER", 120))
@@ -1,21 +1,28 @@
-from src.shemas.welder import WelderShema, CreateWelderShema, UpdateWelderShema
-from src.shemas.welder_certification import WelderCertificationShema, CreateWelderCertificationShema, UpdateWelderCertificationShema
-from src.shemas.ndt import NDTShema, CreateNDTShema, UpdateNDTShema
-from src.shemas.request_shemas import BaseRequestShema, WelderCertificationRequestShema, WelderRequestShema, NDTRequestShema
-
-
-__all__: list[str] = [
-    "WelderShema",
-    "CreateWelderShema",
-    "UpdateWelderShema",
-    "WelderCertificationShema",
-    "CreateWelderCertificationShema",
-    "UpdateWelderCertificationShema",
-    "NDTShema",
-    "CreateNDTShema",
-    "UpdateNDTShema",
-    "BaseRequestShema",
-    "WelderCertificationRequestShema",
-    "WelderRequestShema",
-    "NDTRequestShema",
-]
+from src.shemas.welder import WelderShema, CreateWelderShema, UpdateWelderShema, WelderProfileShema, QualifiedWelderShema
+from src.shemas.welder_certification import WelderCertificationShema, CreateWelderCertificationShema, UpdateWelderCertificationShema
+from src.shemas.ndt import NDTShema, CreateNDTShema, UpdateNDTShema
+from src.shemas.job import JobShema
+from src.shemas.request_shemas import BaseRequestShema, BaseSelectRequestShema, IdentsRequestShema, JointRequestShema, WelderCertificationRequestShema, WelderRequestShema, NDTRequestShema
+
+
+__all__: list[str] = [
+    "WelderShema",
+    "CreateWelderShema",
+    "UpdateWelderShema",
+    "WelderProfileShema",
+    "QualifiedWelderShema",
+    "WelderCertificationShema",
+    "CreateWelderCertificationShema",
+    "UpdateWelderCertificationShema",
+    "NDTShema",
+    "CreateNDTShema",
+    "UpdateNDTShema",
+    "JobShema",
+    "BaseRequestShema",
+    "BaseSelectRequestShema",
+    "IdentsRequestShema",
+    "JointRequestShema",
+    "WelderCertificationRequestShema",
+    "WelderRequestShema",
+    "NDTRequestShema",
+]
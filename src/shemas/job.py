@@ -0,0 +1,22 @@
+from datetime import datetime
+from uuid import UUID
+import typing as t
+
+from pydantic import Field
+from naks_library import BaseShema
+
+
+class JobShema(BaseShema):
+    ident: UUID
+    kind: str
+    status: str
+    params: dict[str, t.Any]
+    progress: int = Field(default=0)
+    total: int | None = Field(default=None)
+    result: dict[str, t.Any] | None = Field(default=None)
+    error: str | None = Field(default=None)
+    cancel_requested: bool = Field(default=False)
+    created_at: datetime
+    started_at: datetime | None = Field(default=None)
+    finished_at: datetime | None = Field(default=None)
+    heartbeat_at: datetime | None = Field(default=None)
@@ -1,271 +1,378 @@
-from datetime import datetime, date
-from uuid import UUID
-import typing as t
-
-from naks_library.base_request_shema import *
-from naks_library import to_date, to_datetime, is_kleymo, is_uuid, is_float
-from pydantic import ValidationInfo, Field, field_validator
-
-from src.utils.funcs import (
-    validate_insert, 
-    validate_method,
-    validate_certification_number,
-    validate_name, 
-)
-from src.models import *
-
-__all__ = [
-    "RefreshTokenRequestShema",
-]
-
-
-class WelderCertificationRequestShema(BaseRequestShema):
-    __and_model_columns__ = ["insert", "method", "certification_date", "expiration_date", "expiration_date_fact"]
-    __or_model_columns__ = ["ident", "kleymo", "certification_number"]
-    __models__ = [WelderCertificationModel]
-
-    idents: InFilter | None = Field(default=None, serialization_alias="ident")
-    kleymos: InFilter | None = Field(default=None, serialization_alias="kleymo")
-    certification_numbers: InFilter | None = Field(default=None, serialization_alias="certification_number")
-    inserts: InFilter | None = Field(default=None, serialization_alias="insert")
-    methods: InFilter | None = Field(default=None, serialization_alias="method")
-    certification_date_from: FromFilter | None = Field(default=None, serialization_alias="certification_date")
-    certification_date_before: BeforeFilter | None = Field(default=None, serialization_alias="certification_date")
-    expiration_date_from: FromFilter | None = Field(default=None, serialization_alias="expiration_date")
-    expiration_date_before: BeforeFilter | None = Field(default=None, serialization_alias="expiration_date")
-    expiration_date_fact_from: FromFilter | None = Field(default=None, serialization_alias="expiration_date_fact")
-    expiration_date_fact_before: BeforeFilter | None = Field(default=None, serialization_alias="expiration_date_fact")
-
-
-    @field_validator(
-        "certification_date_from", 
-        "certification_date_before", 
-        "expiration_date_from", 
-        "expiration_date_before", 
-        "expiration_date_fact_from", 
-        "expiration_date_fact_before", 
-        mode="before"
-    )
-    @classmethod
-    def validate_datetime_filters(cls, v: datetime | date | str | None):
-        if v == None:
-            return None
-        
-        if isinstance(v, (datetime, date)):
-            return v
-        
-        return to_datetime(v)
-    
-
-    @field_validator("inserts", mode="before")
-    @classmethod
-    def validate_inserts_filter(cls, v: list[str] | None):
-        if v == None:
-            return None
-        
-        if not isinstance(v, t.Iterable):
-            raise ValueError(f"value must be iterable")
-        
-        for el in v:
-            if not validate_insert(el):
-                v.remove(el)
-        
-        if not v:
-            return None
-        
-        return v
-    
-
-    @field_validator("kleymos", mode="before")
-    @classmethod
-    def validate_kleymos_filter(cls, v: list[str] | None):
-        if v == None:
-            return None
-        
-        if not isinstance(v, t.Iterable):
-            raise ValueError(f"value must be iterable")
-        
-        for el in v:
-            if not is_kleymo(el):
-                v.remove(el)
-        
-        if not v:
-            return None
-        
-        return v
-    
-
-    @field_validator("methods", mode="before")
-    @classmethod
-    def validate_methods_filter(cls, v: list[str] | None):
-        if v == None:
-            return None
-        
-        if not isinstance(v, t.Iterable):
-            raise ValueError(f"value must be iterable")
-        
-        for el in v:
-            if not validate_method(el):
-                v.remove(el)
-        
-        if not v:
-            return None
-        
-        return v
-    
-
-    @field_validator("idents", mode="before")
-    @classmethod
-    def validate_idents_filter(cls, v: list[UUID | str] | None):
-        if v == None:
-            return None
-        
-        if not isinstance(v, t.Iterable):
-            raise ValueError(f"value must be iterable")
-        
-        for el in v:
-            if not is_uuid(el):
-                v.remove(el)
-        
-        if not v:
-            return None
-        
-        return v
-
-
-    @field_validator("certification_numbers", mode="before")
-    @classmethod
-    def validate_certification_numbers_filter(cls, v: list[str] | None):
-        if v == None:
-            return None
-        
-        if not isinstance(v, t.Iterable):
-            raise ValueError(f"value must be iterable")
-        
-        for el in v:
-            if not validate_certification_number(el):
-                v.remove(el)
-        
-        if not v:
-            return None
-        
-        return v
-
-
-class WelderRequestShema(WelderCertificationRequestShema):
-    __and_model_columns__ = WelderCertificationRequestShema.__and_model_columns__ + ["name"]
-    __or_model_columns__ = ["ident", "kleymo", "certification_number"]
-    __models__ = [WelderModel, WelderCertificationModel]
-
-    names: ILikeAnyFilter | None = Field(default=None, serialization_alias="expiration_date_fact")
-    
-
-    @field_validator("names", mode="before")
-    @classmethod
-    def validate_names_filter(cls, v: list[str] | None):
-        if v == None:
-            return None
-        
-        if not isinstance(v, t.Iterable):
-            raise ValueError(f"value must be iterable")
-        
-        for el in v:
-            if not validate_name(el):
-                v.remove(el)
-        
-        if not v:
-            return None
-        
-        return v
-
-
-class NDTRequestShema(BaseRequestShema):
-    __and_model_columns__ = ["welding_date", "total_welded", "total_ndt", "accepted", "rejected"]
-    __or_model_columns__ = ["ident", "kleymo"]
-    __models__ = [NDTModel]
-
-    idents: InFilter | None = Field(default=None, serialization_alias="ident")
-    kleymos: InFilter | None = Field(default=None, serialization_alias="kleymo")
-    welding_date_from: FromFilter | None = Field(default=None, serialization_alias="welding_date")
-    welding_date_before: BeforeFilter | None = Field(default=None, serialization_alias="welding_date")
-    total_welded_from: FromFilter | None = Field(default=None, serialization_alias="total_welded")
-    total_welded_before: BeforeFilter | None = Field(default=None, serialization_alias="total_welded")
-    total_ndt_from: FromFilter | None = Field(default=None, serialization_alias="total_ndt")
-    total_ndt_before: BeforeFilter | None = Field(default=None, serialization_alias="total_ndt")
-    accepted_from: FromFilter | None = Field(default=None, serialization_alias="accepted")
-    accepted_before: BeforeFilter | None = Field(default=None, serialization_alias="accepted")
-    rejected_from: FromFilter | None = Field(default=None, serialization_alias="rejected")
-    rejected_before: BeforeFilter | None = Field(default=None, serialization_alias="rejected")
-    
-
-    @field_validator("kleymos", mode="before")
-    @classmethod
-    def validate_kleymos_filter(cls, v: list[str] | None):
-        if v == None:
-            return None
-        
-        if not isinstance(v, t.Iterable):
-            raise ValueError(f"value must be iterable")
-        
-        for el in v:
-            if not is_kleymo(el):
-                v.remove(el)
-        
-        if not v:
-            return None
-        
-        return v
-
-
-    @field_validator("idents", mode="before")
-    @classmethod
-    def validate_idents_filter(cls, v: list[UUID | str] | None):
-        if v == None:
-            return None
-        
-        if not isinstance(v, t.Iterable):
-            raise ValueError(f"value must be iterable")
-        
-        for el in v:
-            if not is_uuid(el):
-                v.remove(el)
-        
-        if not v:
-            return None
-        
-        return v
-    
-
-    @field_validator(
-        "welding_date_from", 
-        "welding_date_before",
-        mode="before"
-    )
-    @classmethod
-    def validate_datetime_filters(cls, v: datetime | date | str | None):
-        if v == None:
-            return None
-        
-        return to_date(v)
-    
-
-    @field_validator(
-        "total_welded_from",
-        "total_welded_before",
-        "total_ndt_from",
-        "total_ndt_before",
-        "accepted_from",
-        "accepted_before",
-        "rejected_from",
-        "rejected_before",
-        mode="before"
-    )
-    @classmethod
-    def validate_float_filters(cls, v: str | None, info: ValidationInfo):
-        if v == None:
-            return None
-        
-        if not is_float(v):
-            raise ValueError(f"Invalid {info.field_name} {v}")
-        
-        return v
+from datetime import datetime, date
+from uuid import UUID
+import typing as t
+
+from naks_library.base_request_shema import *
+from naks_library import to_date, to_datetime, is_kleymo, is_uuid, is_float
+from pydantic import BaseModel, ValidationInfo, Field, field_validator
+import sqlalchemy as sa
+
+from src.utils.funcs import (
+    validate_insert, 
+    validate_method,
+    validate_certification_number,
+    validate_name, 
+)
+from src.utils.cursors import decode_cursor
+from src.models import *
+
+__all__ = [
+    "RefreshTokenRequestShema",
+]
+
+
+class IdentsRequestShema(BaseModel):
+    idents: list[str] = Field(min_length=1, max_length=1000)
+
+
+    @field_validator("idents")
+    @classmethod
+    def validate_idents(cls, v: list[str]):
+        for el in v:
+            if not (is_uuid(el) or is_kleymo(el)):
+                raise ValueError(f"Invalid ident: {el}")
+        
+        return v
+
+
+class JointRequestShema(BaseModel):
+    method: str
+    welding_materials_group: str | None = Field(default=None)
+    gtd: str | None = Field(default=None)
+    details_thikness: float | None = Field(default=None, ge=0)
+    outer_diameter: float | None = Field(default=None, ge=0)
+    rod_diameter: float | None = Field(default=None, ge=0)
+    welding_position: str | None = Field(default=None)
+    as_of: date = Field(default_factory=date.today)
+    limit: int = Field(default=100, ge=1, le=1000)
+
+
+    @field_validator("method")
+    @classmethod
+    def validate_joint_method(cls, v: str):
+        if validate_method(v):
+            return v
+        
+        raise ValueError(f"Invalid method: {v}")
+
+
+    @field_validator("as_of", mode="before")
+    @classmethod
+    def validate_as_of(cls, v: str | date):
+        return to_date(v)
+
+
+    def dump_expression(self) -> sa.ColumnElement:
+        model = WelderCertificationModel
+
+        expressions = [
+            model.method == self.method,
+            model.certification_date <= self.as_of,
+            model.expiration_date_fact >= self.as_of
+        ]
+
+        if self.welding_materials_group:
+            expressions.append(model.welding_materials_groups.contains([self.welding_materials_group]))
+
+        if self.gtd:
+            expressions.append(model.gtd.contains([self.gtd]))
+
+        if self.details_thikness != None:
+            expressions.append(model.covers("details_thikness", self.details_thikness))
+
+        if self.outer_diameter != None:
+            expressions.append(model.covers("outer_diameter", self.outer_diameter))
+
+        if self.rod_diameter != None:
+            expressions.append(model.covers("rod_diameter", self.rod_diameter))
+
+        if self.welding_position:
+            expressions.append(model.welding_position.icontains(self.welding_position, autoescape=True))
+
+        return sa.and_(*expressions)
+
+
+class BaseSelectRequestShema(BaseRequestShema):
+    cursor: str | None = Field(default=None)
+    count_mode: t.Literal["exact", "estimated", "none"] = Field(default="exact")
+
+
+    @property
+    def is_keyset(self) -> bool:
+        return "cursor" in self.model_fields_set
+
+
+    @field_validator("cursor")
+    @classmethod
+    def validate_cursor(cls, v: str | None):
+        if v == None:
+            return None
+        
+        decode_cursor(v)
+
+        return v
+
+
+class WelderCertificationRequestShema(BaseSelectRequestShema):
+    __and_model_columns__ = ["insert", "method", "certification_date", "expiration_date", "expiration_date_fact"]
+    __or_model_columns__ = ["ident", "kleymo", "certification_number"]
+    __models__ = [WelderCertificationModel]
+
+    idents: InFilter | None = Field(default=None, serialization_alias="ident")
+    kleymos: InFilter | None = Field(default=None, serialization_alias="kleymo")
+    certification_numbers: InFilter | None = Field(default=None, serialization_alias="certification_number")
+    inserts: InFilter | None = Field(default=None, serialization_alias="insert")
+    methods: InFilter | None = Field(default=None, serialization_alias="method")
+    certification_date_from: FromFilter | None = Field(default=None, serialization_alias="certification_date")
+    certification_date_before: BeforeFilter | None = Field(default=None, serialization_alias="certification_date")
+    expiration_date_from: FromFilter | None = Field(default=None, serialization_alias="expiration_date")
+    expiration_date_before: BeforeFilter | None = Field(default=None, serialization_alias="expiration_date")
+    expiration_date_fact_from: FromFilter | None = Field(default=None, serialization_alias="expiration_date_fact")
+    expiration_date_fact_before: BeforeFilter | None = Field(default=None, serialization_alias="expiration_date_fact")
+
+
+    @field_validator(
+        "certification_date_from", 
+        "certification_date_before", 
+        "expiration_date_from", 
+        "expiration_date_before", 
+        "expiration_date_fact_from", 
+        "expiration_date_fact_before", 
+        mode="before"
+    )
+    @classmethod
+    def validate_datetime_filters(cls, v: datetime | date | str | None):
+        if v == None:
+            return None
+        
+        if isinstance(v, (datetime, date)):
+            return v
+        
+        return to_datetime(v)
+    
+
+    @field_validator("inserts", mode="before")
+    @classmethod
+    def validate_inserts_filter(cls, v: list[str] | None):
+        if v == None:
+            return None
+        
+        if not isinstance(v, t.Iterable):
+            raise ValueError(f"value must be iterable")
+        
+        for el in v:
+            if not validate_insert(el):
+                v.remove(el)
+        
+        if not v:
+            return None
+        
+        return v
+    
+
+    @field_validator("kleymos", mode="before")
+    @classmethod
+    def validate_kleymos_filter(cls, v: list[str] | None):
+        if v == None:
+            return None
+        
+        if not isinstance(v, t.Iterable):
+            raise ValueError(f"value must be iterable")
+        
+        for el in v:
+            if not is_kleymo(el):
+                v.remove(el)
+        
+        if not v:
+            return None
+        
+        return v
+    
+
+    @field_validator("methods", mode="before")
+    @classmethod
+    def validate_methods_filter(cls, v: list[str] | None):
+        if v == None:
+            return None
+        
+        if not isinstance(v, t.Iterable):
+            raise ValueError(f"value must be iterable")
+        
+        for el in v:
+            if not validate_method(el):
+                v.remove(el)
+        
+        if not v:
+            return None
+        
+        return v
+    
+
+    @field_validator("idents", mode="before")
+    @classmethod
+    def validate_idents_filter(cls, v: list[UUID | str] | None):
+        if v == None:
+            return None
+        
+        if not isinstance(v, t.Iterable):
+            raise ValueError(f"value must be iterable")
+        
+        for el in v:
+            if not is_uuid(el):
+                v.remove(el)
+        
+        if not v:
+            return None
+        
+        return v
+
+
+    @field_validator("certification_numbers", mode="before")
+    @classmethod
+    def validate_certification_numbers_filter(cls, v: list[str] | None):
+        if v == None:
+            return None
+        
+        if not isinstance(v, t.Iterable):
+            raise ValueError(f"value must be iterable")
+        
+        for el in v:
+            if not validate_certification_number(el):
+                v.remove(el)
+        
+        if not v:
+            return None
+        
+        return v
+
+
+class WelderRequestShema(WelderCertificationRequestShema):
+    __and_model_columns__ = WelderCertificationRequestShema.__and_model_columns__ + ["name"]
+    __or_model_columns__ = ["ident", "kleymo", "certification_number"]
+    __models__ = [WelderModel, WelderCertificationModel]
+
+    names: ILikeAnyFilter | None = Field(default=None, serialization_alias="name")
+    
+
+    @field_validator("names", mode="before")
+    @classmethod
+    def validate_names_filter(cls, v: list[str] | None):
+        if v == None:
+            return None
+        
+        if not isinstance(v, t.Iterable):
+            raise ValueError(f"value must be iterable")
+        
+        for el in v:
+            if not validate_name(el):
+                v.remove(el)
+        
+        if not v:
+            return None
+        
+        return v
+
+
+    def dump_expression(self) -> sa.ColumnElement:
+        if not self.names:
+            return super().dump_expression()
+
+        request = self.model_copy(update={"names": None})
+        request.model_fields_set.discard("names")
+
+        return sa.and_(
+            super(WelderRequestShema, request).dump_expression(),
+            sa.or_(*(WelderModel.name.ilike(name) for name in self.names))
+        )
+
+
+class NDTRequestShema(BaseSelectRequestShema):
+    __and_model_columns__ = ["welding_date", "total_welded", "total_ndt", "accepted", "rejected"]
+    __or_model_columns__ = ["ident", "kleymo"]
+    __models__ = [NDTModel]
+
+    idents: InFilter | None = Field(default=None, serialization_alias="ident")
+    kleymos: InFilter | None = Field(default=None, serialization_alias="kleymo")
+    welding_date_from: FromFilter | None = Field(default=None, serialization_alias="welding_date")
+    welding_date_before: BeforeFilter | None = Field(default=None, serialization_alias="welding_date")
+    total_welded_from: FromFilter | None = Field(default=None, serialization_alias="total_welded")
+    total_welded_before: BeforeFilter | None = Field(default=None, serialization_alias="total_welded")
+    total_ndt_from: FromFilter | None = Field(default=None, serialization_alias="total_ndt")
+    total_ndt_before: BeforeFilter | None = Field(default=None, serialization_alias="total_ndt")
+    accepted_from: FromFilter | None = Field(default=None, serialization_alias="accepted")
+    accepted_before: BeforeFilter | None = Field(default=None, serialization_alias="accepted")
+    rejected_from: FromFilter | None = Field(default=None, serialization_alias="rejected")
+    rejected_before: BeforeFilter | None = Field(default=None, serialization_alias="rejected")
+    
+
+    @field_validator("kleymos", mode="before")
+    @classmethod
+    def validate_kleymos_filter(cls, v: list[str] | None):
+        if v == None:
+            return None
+        
+        if not isinstance(v, t.Iterable):
+            raise ValueError(f"value must be iterable")
+        
+        for el in v:
+            if not is_kleymo(el):
+                v.remove(el)
+        
+        if not v:
+            return None
+        
+        return v
+
+
+    @field_validator("idents", mode="before")
+    @classmethod
+    def validate_idents_filter(cls, v: list[UUID | str] | None):
+        if v == None:
+            return None
+        
+        if not isinstance(v, t.Iterable):
+            raise ValueError(f"value must be iterable")
+        
+        for el in v:
+            if not is_uuid(el):
+                v.remove(el)
+        
+        if not v:
+            return None
+        
+        return v
+    
+
+    @field_validator(
+        "welding_date_from", 
+        "welding_date_before",
+        mode="before"
+    )
+    @classmethod
+    def validate_datetime_filters(cls, v: datetime | date | str | None):
+        if v == None:
+            return None
+        
+        return to_date(v)
+    
+
+    @field_validator(
+        "total_welded_from",
+        "total_welded_before",
+        "total_ndt_from",
+        "total_ndt_before",
+        "accepted_from",
+        "accepted_before",
+        "rejected_from",
+        "rejected_before",
+        mode="before"
+    )
+    @classmethod
+    def validate_float_filters(cls, v: str | None, info: ValidationInfo):
+        if v == None:
+            return None
+        
+        if not is_float(v):
+            raise ValueError(f"Invalid {info.field_name} {v}")
+        
+        return v
@@ -0,0 +1,105 @@
+from collections.abc import Callable, Hashable, Sequence
+from collections import OrderedDict
+from time import monotonic
+import typing as t
+
+
+__all__ = [
+    "TTLCache"
+]
+
+
+class _Entry[V]:
+    __slots__ = ("keys", "value", "expires_at")
+
+    def __init__(self, keys: tuple[Hashable, ...], value: V, expires_at: float) -> None:
+        self.keys = keys
+        self.value = value
+        self.expires_at = expires_at
+
+
+class TTLCache[V]:
+    def __init__(self, maxsize: int, ttl: float, timer: Callable[[], float] = monotonic) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.generation = 0
+        self._data: OrderedDict[Hashable, _Entry[V]] = OrderedDict()
+
+
+    def get(self, key: Hashable) -> V | None:
+        entry = self._data.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if entry.expires_at <= self.timer():
+            self._remove(entry)
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+
+        return entry.value
+
+
+    def set(self, keys: Sequence[Hashable], value: V, generation: int | None = None) -> None:
+        if self.maxsize <= 0:
+            return
+
+        if generation is not None and generation != self.generation:
+            return
+
+        for key in keys:
+            self.pop(key, invalidate=False)
+
+        entry = _Entry(tuple(keys), value, self.timer() + self.ttl)
+
+        for key in entry.keys:
+            self._data[key] = entry
+
+        while len(self._data) > self.maxsize:
+            _, oldest = next(iter(self._data.items()))
+            self._remove(oldest)
+            self.evictions += 1
+
+
+    def pop(self, key: Hashable, invalidate: bool = True) -> V | None:
+        if invalidate:
+            self.generation += 1
+
+        entry = self._data.get(key)
+
+        if entry is None:
+            return None
+
+        self._remove(entry)
+
+        return entry.value
+
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._data.clear()
+
+
+    def stats(self) -> dict[str, t.Any]:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
+
+
+    def _remove(self, entry: _Entry[V]) -> None:
+        for key in entry.keys:
+            if self._data.get(key) is entry:
+                del self._data[key]
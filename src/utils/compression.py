@@ -0,0 +1,268 @@
+from collections.abc import Callable, Mapping
+import asyncio
+import typing as t
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from src.utils.etags import add_etag_encoding
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+__all__ = [
+    "CompressionMiddleware",
+    "get_available_encodings",
+    "negotiate_encoding"
+]
+
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+DEFAULT_LEVELS = {
+    "gzip": 6,
+    "br": 4,
+    "zstd": 3
+}
+
+
+class Compressor(t.Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class GzipCompressor:
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliCompressor:
+    def __init__(self, level: int) -> None:
+        self._compressor = brotli.Compressor(quality=level)
+
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdCompressor:
+    def __init__(self, level: int) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def get_available_encodings() -> dict[str, Callable[[int], Compressor]]:
+    encodings: dict[str, Callable[[int], Compressor]] = {}
+
+    if zstandard is not None:
+        encodings["zstd"] = ZstdCompressor
+
+    if brotli is not None:
+        encodings["br"] = BrotliCompressor
+
+    encodings["gzip"] = GzipCompressor
+
+    return encodings
+
+
+def negotiate_encoding(accept_encoding: str | None, available: t.Sequence[str]) -> str | None:
+    if not accept_encoding:
+        return None
+
+    weights: dict[str, float] = {}
+
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+
+        if not name:
+            continue
+
+        weight = 1.0
+        params = params.strip()
+
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+
+        weights[name] = weight
+
+    best: tuple[float, str] | None = None
+
+    for encoding in available:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+
+        if weight > 0 and (best is None or weight > best[0]):
+            best = (weight, encoding)
+
+    return best[1] if best else None
+
+
+class CompressionMiddleware:
+    def __init__(
+            self,
+            app,
+            minimum_size: int = 1024,
+            levels: Mapping[str, int] | None = None,
+            offload_size: int = 256 * 1024,
+            prefix: str = ""
+        ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = dict(levels or {})
+        self.offload_size = offload_size
+        self.prefix = prefix
+        self.encodings = get_available_encodings()
+
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.prefix):
+            return await self.app(scope, receive, send)
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"), list(self.encodings))
+        responder = CompressionResponder(self, encoding, send)
+
+        await self.app(scope, receive, responder.send)
+
+
+class CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str | None, send) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start: dict[str, t.Any] | None = None
+        self.compressor: Compressor | None = None
+        self.passthrough = False
+
+
+    async def send(self, message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+
+        if self.start is not None:
+            if message["type"] == "http.response.body":
+                return await self._send_first_body(message)
+
+            await self._send(self.start)
+            self.start = None
+            self.passthrough = True
+
+        if self.passthrough or message["type"] != "http.response.body":
+            return await self._send(message)
+
+        more_body = message.get("more_body", False)
+        body = await self._compress(message.get("body", b""), final=not more_body)
+
+        if body or not more_body:
+            await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+
+    async def _send_first_body(self, message) -> None:
+        start, self.start = self.start, None
+        headers = MutableHeaders(scope=start)
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if start["status"] == 304 and "etag" in headers:
+            if self.encoding is not None:
+                headers["ETag"] = add_etag_encoding(headers["etag"], self.encoding)
+
+            headers.add_vary_header("Accept-Encoding")
+
+        if headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES):
+            headers.add_vary_header("Accept-Encoding")
+
+        if self.encoding is None or not self._is_compressible(start["status"], headers) or (not more_body and len(body) < self.middleware.minimum_size):
+            self.passthrough = True
+
+            await self._send(start)
+            return await self._send(message)
+
+        headers["Content-Encoding"] = self.encoding
+
+        if "etag" in headers:
+            headers["ETag"] = add_etag_encoding(headers["etag"], self.encoding)
+
+        self.compressor = self.middleware.encodings[self.encoding](
+            self.middleware.levels.get(self.encoding, DEFAULT_LEVELS[self.encoding])
+        )
+
+        body = await self._compress(body, final=not more_body)
+
+        if more_body:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(len(body))
+
+        await self._send(start)
+        await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+
+    def _is_compressible(self, status: int, headers: MutableHeaders) -> bool:
+        if status < 200 or status in (204, 304) or "content-encoding" in headers:
+            return False
+
+        return headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+
+
+    async def _compress(self, data: bytes, final: bool) -> bytes:
+        if len(data) >= self.middleware.offload_size:
+            return await asyncio.to_thread(self._compress_sync, data, final)
+
+        return self._compress_sync(data, final)
+
+
+    def _compress_sync(self, data: bytes, final: bool) -> bytes:
+        body = self.compressor.compress(data) if data else b""
+
+        if final:
+            body += self.compressor.finish()
+        elif data:
+            body += self.compressor.flush()
+
+        return body
@@ -0,0 +1,57 @@
+from datetime import date, datetime
+from base64 import urlsafe_b64encode, urlsafe_b64decode
+from uuid import UUID
+import typing as t
+
+import orjson
+
+
+__all__ = [
+    "encode_cursor",
+    "decode_cursor"
+]
+
+
+def _dump_value(value: t.Any) -> list:
+    if isinstance(value, UUID):
+        return ["u", value.hex]
+
+    if isinstance(value, datetime):
+        return ["dt", value.isoformat()]
+
+    if isinstance(value, date):
+        return ["d", value.isoformat()]
+
+    return ["v", value]
+
+
+def _load_value(value: list) -> t.Any:
+    kind, raw = value
+
+    match kind:
+        case "u":
+            return UUID(raw)
+        case "dt":
+            return datetime.fromisoformat(raw)
+        case "d":
+            return date.fromisoformat(raw)
+        case "v":
+            return raw
+
+    raise ValueError(f"Invalid cursor value kind: {kind}")
+
+
+def encode_cursor(values: t.Sequence[t.Any]) -> str:
+    return urlsafe_b64encode(
+        orjson.dumps([_dump_value(value) for value in values])
+    ).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list[t.Any]:
+    try:
+        values = orjson.loads(urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+
+        return [_load_value(value) for value in values]
+
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid cursor: {cursor}")
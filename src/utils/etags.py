@@ -0,0 +1,81 @@
+from collections.abc import Sequence, Mapping
+from hashlib import blake2b
+import typing as t
+
+from fastapi import Response
+
+
+__all__ = [
+    "make_etag",
+    "etag_matches",
+    "add_etag_encoding",
+    "not_modified_response",
+    "dump_result_version",
+    "dump_fields_version"
+]
+
+
+ETAG_ENCODINGS = ("gzip", "br", "zstd")
+
+
+def make_etag(version: str) -> str:
+    return f'"{version}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+
+        if candidate == etag or _strip_etag_encoding(candidate) == etag:
+            return True
+
+    return False
+
+
+def add_etag_encoding(etag: str, encoding: str) -> str:
+    if etag.startswith("W/"):
+        return f"W/{add_etag_encoding(etag[2:], encoding)}"
+
+    if not etag.endswith('"'):
+        return etag
+
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def _strip_etag_encoding(etag: str) -> str:
+    for encoding in ETAG_ENCODINGS:
+        if etag.endswith(f'-{encoding}"'):
+            return f'{etag[:-len(encoding) - 2]}"'
+
+    return etag
+
+
+def not_modified_response(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def dump_result_version(rows: Sequence[Mapping[str, t.Any]], key: str, *parts: t.Any) -> str:
+    digest = blake2b(digest_size=16)
+
+    for row in rows:
+        digest.update(f"{row[key]}:{row['row_version']},".encode())
+
+    digest.update(repr(parts).encode())
+
+    return digest.hexdigest()
+
+
+def dump_fields_version(version: str, fields: Sequence[str] | None) -> str:
+    if fields is None:
+        return version
+
+    return f"{version}-{blake2b(','.join(fields).encode(), digest_size=4).hexdigest()}"
@@ -0,0 +1,81 @@
+from collections.abc import AsyncGenerator, AsyncIterator
+import typing as t
+import csv
+import io
+
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+import orjson
+
+
+__all__ = [
+    "EXPORT_MEDIA_TYPES",
+    "dump_ndjson",
+    "dump_csv",
+    "export_response"
+]
+
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8"
+}
+
+
+async def dump_ndjson(partitions: AsyncIterator[list[dict[str, t.Any]]]) -> AsyncIterator[bytes]:
+    async for partition in partitions:
+        yield b"".join(orjson.dumps(row) + b"\n" for row in partition)
+
+
+def _dump_csv_value(value: t.Any) -> t.Any:
+    if isinstance(value, list):
+        return orjson.dumps(value).decode()
+
+    return value
+
+
+async def dump_csv(partitions: AsyncIterator[list[dict[str, t.Any]]], columns: list[str]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(columns)
+
+    async for partition in partitions:
+        writer.writerows([_dump_csv_value(row[column]) for column in columns] for row in partition)
+
+        yield buffer.getvalue().encode()
+
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def export_response(
+        partitions: AsyncGenerator[list[dict[str, t.Any]], None],
+        format: str,
+        columns: list[str],
+        filename: str,
+        background: BackgroundTask | None = None
+    ) -> StreamingResponse:
+    if format == "csv":
+        content = dump_csv(partitions, columns)
+    else:
+        content = dump_ndjson(partitions)
+
+    async def close() -> None:
+        await content.aclose()
+        await partitions.aclose()
+
+        if background is not None:
+            await background()
+
+    return StreamingResponse(
+        content,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{format}"'
+        },
+        background=BackgroundTask(close)
+    )
@@ -1,29 +1,42 @@
-from re import fullmatch
-
-
-def validate_insert(v: str) -> bool:
-    if fullmatch(r"В[0-9]", v):
-        return True
-    
-    return False
-
-
-def validate_method(v: str) -> bool:
-    if fullmatch(r"[A-Яа-я]+", v):
-        return True
-    
-    return False
-
-
-def validate_certification_number(v: str) -> bool:
-    if fullmatch(r"[A-Я]+-[0-9A-Я]+-[IV]+-[0-9]{5}", v):
-        return True
-    
-    return False
-
-
-def validate_name(v: str) -> bool:
-    if fullmatch(r"[A-ЯA-Za-zа-я ]+", v):
-        return True
-    
-    return False
+from re import fullmatch
+import typing as t
+
+from pydantic import ValidationError
+
+
+def validate_insert(v: str) -> bool:
+    if fullmatch(r"В[0-9]", v):
+        return True
+    
+    return False
+
+
+def validate_method(v: str) -> bool:
+    if fullmatch(r"[A-Яа-я]+", v):
+        return True
+    
+    return False
+
+
+def validate_certification_number(v: str) -> bool:
+    if fullmatch(r"[A-Я]+-[0-9A-Я]+-[IV]+-[0-9]{5}", v):
+        return True
+    
+    return False
+
+
+def validate_name(v: str) -> bool:
+    if fullmatch(r"[A-ЯA-Za-zа-я ]+", v):
+        return True
+    
+    return False
+
+
+def dump_validation_errors(err: ValidationError) -> list[dict[str, t.Any]]:
+    return [
+        {
+            "loc": error["loc"],
+            "msg": error["msg"],
+            "type": error["type"]
+        } for error in err.errors()
+    ]
@@ -0,0 +1,75 @@
+from collections.abc import Awaitable, Callable, Hashable, Sequence
+import asyncio
+
+
+__all__ = [
+    "BatchLoader"
+]
+
+
+class BatchLoader[K: Hashable, V]:
+    def __init__(self, batch_fn: Callable[[list[K]], Awaitable[Sequence[V | None]]], max_batch_size: int = 1000) -> None:
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self._futures: dict[K, asyncio.Future[V | None]] = {}
+        self._queue: list[tuple[K, asyncio.Future[V | None]]] = []
+
+
+    def load(self, key: K) -> asyncio.Future[V | None]:
+        if key in self._futures:
+            return self._futures[key]
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        self._futures[key] = future
+        self._queue.append((key, future))
+
+        if len(self._queue) == 1:
+            loop.call_soon(self._schedule_dispatch)
+
+        return future
+
+
+    async def load_many(self, keys: Sequence[K]) -> list[V | None]:
+        return list(await asyncio.gather(*[self.load(key) for key in keys]))
+
+
+    def clear(self, key: K | None = None) -> None:
+        if key is None:
+            self._futures.clear()
+        else:
+            self._futures.pop(key, None)
+
+
+    def _schedule_dispatch(self) -> None:
+        queue, self._queue = self._queue, []
+
+        asyncio.ensure_future(self._dispatch(queue))
+
+
+    async def _dispatch(self, pending: list[tuple[K, asyncio.Future[V | None]]]) -> None:
+        for i in range(0, len(pending), self.max_batch_size):
+            batch = pending[i:i + self.max_batch_size]
+
+            try:
+                values = list(await self.batch_fn([key for key, _ in batch]))
+            except Exception as e:
+                self._resolve(batch, [], e)
+            else:
+                self._resolve(batch, values, ValueError(f"Batch function returned {len(values)} values for {len(batch)} keys"))
+
+
+    def _resolve(self, batch: list[tuple[K, asyncio.Future[V | None]]], values: list[V | None], error: Exception) -> None:
+        for index, (key, future) in enumerate(batch):
+            if future.done():
+                continue
+
+            if index < len(values):
+                future.set_result(values[index])
+                continue
+
+            future.set_exception(error)
+
+            if self._futures.get(key) is future:
+                del self._futures[key]
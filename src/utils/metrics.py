@@ -0,0 +1,230 @@
+from contextvars import ContextVar
+from bisect import bisect_left
+from time import perf_counter
+import typing as t
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+import sqlalchemy as sa
+
+
+__all__ = [
+    "Histogram",
+    "RequestStats",
+    "MetricsRegistry",
+    "MetricsMiddleware",
+    "metrics",
+    "instrument_engine",
+    "record_pool_wait"
+]
+
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: t.Sequence[float]) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+    def dump(self, name: str, labels: str) -> list[str]:
+        lines = []
+        total = 0
+        separator = "," if labels else ""
+
+        for bound, count in zip(self.bounds, self.counts):
+            total += count
+            lines.append(f'{name}_bucket{{{labels}{separator}le="{bound}"}} {total}')
+
+        lines.append(f'{name}_bucket{{{labels}{separator}le="+Inf"}} {self.count}')
+
+        labels = f"{{{labels}}}" if labels else ""
+
+        lines.append(f"{name}_sum{labels} {self.sum}")
+        lines.append(f"{name}_count{labels} {self.count}")
+
+        return lines
+
+
+class RequestStats:
+    __slots__ = ("status", "db_time", "statements", "rows", "pool_wait", "response_bytes")
+
+    def __init__(self) -> None:
+        self.status = 0
+        self.db_time = 0.0
+        self.statements = 0
+        self.rows = 0
+        self.pool_wait = 0.0
+        self.response_bytes = 0
+
+
+class RouteMetrics:
+    __slots__ = ("latency", "db_time", "requests", "errors", "statements", "rows", "pool_wait", "response_bytes")
+
+    def __init__(self, buckets: t.Sequence[float]) -> None:
+        self.latency = Histogram(buckets)
+        self.db_time = Histogram(buckets)
+        self.requests = 0
+        self.errors = 0
+        self.statements = 0
+        self.rows = 0
+        self.pool_wait = 0.0
+        self.response_bytes = 0
+
+
+class MetricsRegistry:
+    def __init__(self, buckets: t.Sequence[float] = LATENCY_BUCKETS, pool_wait_buckets: t.Sequence[float] = POOL_WAIT_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.routes: dict[tuple[str, str], RouteMetrics] = {}
+        self.pool_wait = Histogram(pool_wait_buckets)
+
+
+    def observe(self, method: str, route: str, elapsed: float, stats: RequestStats) -> None:
+        route_metrics = self.routes.get((method, route))
+
+        if route_metrics is None:
+            route_metrics = self.routes[(method, route)] = RouteMetrics(self.buckets)
+
+        route_metrics.latency.observe(elapsed)
+        route_metrics.db_time.observe(stats.db_time)
+        route_metrics.requests += 1
+        route_metrics.statements += stats.statements
+        route_metrics.rows += stats.rows
+        route_metrics.pool_wait += stats.pool_wait
+        route_metrics.response_bytes += stats.response_bytes
+
+        if stats.status >= 500:
+            route_metrics.errors += 1
+
+
+    def render(self) -> str:
+        lines = [
+            "# HELP http_request_duration_seconds Request latency by route.",
+            "# TYPE http_request_duration_seconds histogram"
+        ]
+
+        for (method, route), route_metrics in self.routes.items():
+            lines.extend(route_metrics.latency.dump("http_request_duration_seconds", self._dump_labels(method, route)))
+
+        lines.extend([
+            "# HELP http_request_db_duration_seconds Time spent executing statements per request.",
+            "# TYPE http_request_db_duration_seconds histogram"
+        ])
+
+        for (method, route), route_metrics in self.routes.items():
+            lines.extend(route_metrics.db_time.dump("http_request_db_duration_seconds", self._dump_labels(method, route)))
+
+        for name, kind, attr, description in (
+            ("http_requests_total", "counter", "requests", "Requests by route."),
+            ("http_request_errors_total", "counter", "errors", "Requests answered with a 5xx status."),
+            ("http_request_db_statements_total", "counter", "statements", "Statements executed."),
+            ("http_request_db_rows_total", "counter", "rows", "Rows returned or affected."),
+            ("http_request_pool_wait_seconds_total", "counter", "pool_wait", "Time spent waiting for a pooled connection."),
+            ("http_response_bytes_total", "counter", "response_bytes", "Response body bytes sent."),
+        ):
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+
+            for (method, route), route_metrics in self.routes.items():
+                lines.append(f"{name}{{{self._dump_labels(method, route)}}} {getattr(route_metrics, attr)}")
+
+        lines.extend([
+            "# HELP db_pool_wait_seconds Connection pool checkout wait.",
+            "# TYPE db_pool_wait_seconds histogram",
+            *self.pool_wait.dump("db_pool_wait_seconds", "")
+        ])
+
+        return "\n".join(lines) + "\n"
+
+
+    @staticmethod
+    def _dump_labels(method: str, route: str) -> str:
+        route = route.replace("\\", "\\\\").replace('"', '\\"')
+
+        return f'method="{method}",route="{route}"'
+
+
+metrics = MetricsRegistry()
+
+_current_stats: ContextVar[RequestStats | None] = ContextVar("current_stats", default=None)
+
+
+class MetricsMiddleware:
+    def __init__(self, app, registry: MetricsRegistry = metrics) -> None:
+        self.app = app
+        self.registry = registry
+
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats()
+        token = _current_stats.set(stats)
+        start = perf_counter()
+
+        async def send_wrapper(message) -> None:
+            if message["type"] == "http.response.start":
+                stats.status = message["status"]
+            elif message["type"] == "http.response.body":
+                stats.response_bytes += len(message.get("body", b""))
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            stats.status = 500
+            raise
+        finally:
+            _current_stats.reset(token)
+
+            route = scope.get("route")
+
+            self.registry.observe(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                perf_counter() - start,
+                stats
+            )
+
+
+def record_pool_wait(wait: float) -> None:
+    metrics.pool_wait.observe(wait)
+
+    stats = _current_stats.get()
+
+    if stats is not None:
+        stats.pool_wait += wait
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current_stats.get() is not None:
+        conn.info["metrics_start"] = perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current_stats.get()
+
+    if stats is None:
+        return
+
+    stats.db_time += perf_counter() - conn.info.pop("metrics_start", perf_counter())
+    stats.statements += 1
+    stats.rows += max(cursor.rowcount, 0)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    sa.event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    sa.event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,266 @@
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from functools import cache
+from itertools import chain, islice
+from pathlib import Path
+from uuid import UUID
+import typing as t
+import csv
+import io
+import re
+
+from pydantic import BaseModel, ValidationError
+
+from src.shemas import CreateWelderCertificationShema, CreateNDTShema
+from src.utils.funcs import validate_insert, validate_method, validate_certification_number, dump_validation_errors
+
+
+__all__ = [
+    "RegistryTarget",
+    "REGISTRY_TARGETS",
+    "REGISTRY_FORMATS",
+    "get_registry_format",
+    "iter_registry_rows",
+    "read_chunk",
+    "validate_chunk"
+]
+
+
+REGISTRY_FORMATS = ("csv", "xlsx")
+
+_LIST_SEPARATORS_RE = re.compile(r"[,;]")
+
+
+@dataclass(frozen=True)
+class RegistryTarget:
+    shema: type[BaseModel]
+    aliases: dict[str, str]
+    validators: dict[str, Callable[[str], bool]] = field(default_factory=dict)
+    defaults: dict[str, str] = field(default_factory=dict)
+
+
+    def map_header(self, header: t.Sequence[t.Any]) -> list[str | None]:
+        columns: list[str | None] = []
+
+        for cell in header:
+            name = str(cell).strip().lower() if cell is not None else ""
+            column = name if name in self.shema.model_fields else self.aliases.get(name)
+
+            columns.append(column if column not in columns else None)
+
+        missing = [
+            name for name, info in self.shema.model_fields.items()
+            if info.is_required() and name not in columns and name not in self.defaults
+        ]
+
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+        return columns
+
+
+REGISTRY_TARGETS = {
+    "welder_certifications": RegistryTarget(
+        CreateWelderCertificationShema,
+        {
+            "клеймо": "kleymo",
+            "должность": "job_title",
+            "номер удостоверения": "certification_number",
+            "№ удостоверения": "certification_number",
+            "дата аттестации": "certification_date",
+            "дата окончания": "expiration_date",
+            "действительно до": "expiration_date",
+            "дата окончания (факт)": "expiration_date_fact",
+            "вставка": "insert",
+            "вид аттестации": "certification_type",
+            "организация": "company",
+            "группы технических устройств": "gtd",
+            "гту": "gtd",
+            "способ сварки": "method",
+            "вид деталей": "details_type",
+            "типы швов": "joint_type",
+            "группы свариваемых материалов": "welding_materials_groups",
+            "сварочные материалы": "welding_materials",
+            "толщина деталей от": "details_thikness_from",
+            "толщина деталей до": "details_thikness_before",
+            "наружный диаметр от": "outer_diameter_from",
+            "наружный диаметр до": "outer_diameter_before",
+            "положение при сварке": "welding_position",
+            "вид соединения": "connection_type",
+            "диаметр стержня от": "rod_diameter_from",
+            "диаметр стержня до": "rod_diameter_before",
+            "положение осей стержней": "rod_axis_position",
+            "тип шва": "weld_type",
+            "слой шва": "joint_layer",
+            "степень автоматизации": "automation_level",
+            "диаметр деталей от": "details_diameter_from",
+            "диаметр деталей до": "details_diameter_before",
+            "сварочное оборудование": "welding_equipment"
+        },
+        validators={
+            "certification_number": validate_certification_number,
+            "method": validate_method,
+            "insert": validate_insert
+        },
+        defaults={
+            "expiration_date_fact": "expiration_date"
+        }
+    ),
+    "ndts": RegistryTarget(
+        CreateNDTShema,
+        {
+            "клеймо": "kleymo",
+            "компания": "company",
+            "подразделение": "subcompany",
+            "проект": "project",
+            "дата сварки": "welding_date",
+            "вид контроля": "ndt_type",
+            "сварено": "total_welded",
+            "проконтролировано": "total_ndt",
+            "годно": "accepted",
+            "брак": "rejected"
+        }
+    )
+}
+
+
+def get_registry_format(filename: str | None) -> str:
+    format = Path(filename or "").suffix.lower().lstrip(".")
+
+    if format not in REGISTRY_FORMATS:
+        raise ValueError(f"Unsupported file format: {filename}")
+
+    return format
+
+
+def _iter_csv_rows(file: t.BinaryIO, encoding: str) -> Iterator[t.Sequence[t.Any]]:
+    text = io.TextIOWrapper(file, encoding=encoding, newline="")
+
+    try:
+        first_line = text.readline()
+
+        if not first_line:
+            return
+
+        try:
+            dialect = csv.Sniffer().sniff(first_line, delimiters=";,\t")
+        except csv.Error:
+            dialect = csv.excel
+
+        yield from csv.reader(chain([first_line], text), dialect)
+
+    finally:
+        text.detach()
+
+
+def _iter_xlsx_rows(file: t.BinaryIO) -> Iterator[t.Sequence[t.Any]]:
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def iter_registry_rows(file: t.BinaryIO, format: str, encoding: str = "utf-8-sig") -> Iterator[t.Sequence[t.Any]]:
+    if format == "xlsx":
+        return _iter_xlsx_rows(file)
+
+    return _iter_csv_rows(file, encoding)
+
+
+def read_chunk(rows: Iterator[t.Sequence[t.Any]], size: int) -> list[tuple[t.Any, ...]]:
+    return [tuple(row) for row in islice(rows, size)]
+
+
+@cache
+def _get_field_kinds(shema: type[BaseModel]) -> dict[str, type]:
+    kinds = {}
+
+    for name, info in shema.model_fields.items():
+        kinds[name] = str
+
+        for arg in t.get_args(info.annotation) or (info.annotation,):
+            if t.get_origin(arg) is list:
+                kinds[name] = list
+                break
+
+            if arg in (float, int, date, UUID):
+                kinds[name] = arg
+                break
+
+    return kinds
+
+
+def _dump_cell(kind: type, value: t.Any) -> t.Any:
+    if isinstance(value, str):
+        value = value.strip()
+
+    if value is None or value == "":
+        return None
+
+    if kind is list:
+        if isinstance(value, str):
+            return [el.strip() for el in _LIST_SEPARATORS_RE.split(value) if el.strip()]
+
+        return [str(value)]
+
+    if kind in (float, int) and isinstance(value, str):
+        return value.replace(" ", "").replace(",", ".")
+
+    if kind is date and isinstance(value, datetime):
+        return value.date()
+
+    if kind is str and not isinstance(value, str):
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+
+        if isinstance(value, datetime):
+            return value.date().isoformat()
+
+        return str(value)
+
+    return value
+
+
+def validate_chunk(
+        kind: str,
+        columns: list[str | None],
+        rows: list[tuple[t.Any, ...]],
+        first: int
+    ) -> tuple[list[tuple[int, dict[str, t.Any]]], list[dict[str, t.Any]]]:
+    target = REGISTRY_TARGETS[kind]
+    kinds = _get_field_kinds(target.shema)
+
+    valid: list[tuple[int, dict[str, t.Any]]] = []
+    rejected: list[dict[str, t.Any]] = []
+
+    for number, row in enumerate(rows, first):
+        if all(cell is None or cell == "" for cell in row):
+            continue
+
+        data = {column: _dump_cell(kinds[column], value) for column, value in zip(columns, row) if column}
+
+        for column, source in target.defaults.items():
+            if data.get(column) is None:
+                data[column] = data.get(source)
+
+        errors = [
+            {"loc": (column,), "msg": f"Invalid {column}: {data[column]}", "type": "value_error"}
+            for column, validator in target.validators.items()
+            if isinstance(data.get(column), str) and not validator(data[column])
+        ]
+
+        if errors:
+            rejected.append({"index": number, "detail": errors})
+            continue
+
+        try:
+            valid.append((number, target.shema.model_validate(data).model_dump()))
+        except ValidationError as e:
+            rejected.append({"index": number, "detail": dump_validation_errors(e)})
+
+    return (valid, rejected)
@@ -0,0 +1,66 @@
+from collections.abc import Mapping, Sequence
+from functools import cache
+import typing as t
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+import orjson
+
+
+__all__ = [
+    "get_list_adapter",
+    "select_response",
+    "fields_response",
+    "changes_response"
+]
+
+
+@cache
+def get_list_adapter[Shema: BaseModel](shema: type[Shema]) -> TypeAdapter[list[Shema]]:
+    return TypeAdapter(list[shema])
+
+
+def select_response[Shema: BaseModel](
+        shema: type[Shema],
+        result: Sequence[Shema] | Sequence[dict[str, t.Any]],
+        count: int | None,
+        next_cursor: str | None = None,
+        keyset: bool = False,
+        headers: Mapping[str, str] | None = None,
+        fields: Sequence[str] | None = None
+    ) -> Response:
+    if fields is None:
+        dumped = get_list_adapter(shema).dump_json(list(result))
+    else:
+        dumped = orjson.dumps(result)
+
+    content: dict[str, t.Any] = {
+        "result": orjson.Fragment(dumped),
+        "count": count
+    }
+
+    if keyset:
+        content["next_cursor"] = next_cursor
+
+    return Response(orjson.dumps(content), media_type="application/json", headers=headers)
+
+
+def fields_response(content: dict[str, t.Any], headers: Mapping[str, str] | None = None) -> Response:
+    return Response(orjson.dumps(content), media_type="application/json", headers=headers)
+
+
+def changes_response[Shema: BaseModel](
+        shema: type[Shema],
+        upserts: Sequence[Shema],
+        tombstones: Sequence[dict[str, t.Any]],
+        next_cursor: str | None,
+        has_more: bool
+    ) -> Response:
+    content: dict[str, t.Any] = {
+        "upserts": orjson.Fragment(get_list_adapter(shema).dump_json(list(upserts))),
+        "tombstones": tombstones,
+        "next_cursor": next_cursor,
+        "has_more": has_more
+    }
+
+    return Response(orjson.dumps(content), media_type="application/json")
@@ -0,0 +1,243 @@
+from logging.handlers import RotatingFileHandler
+from contextvars import ContextVar
+from datetime import datetime
+from hashlib import blake2b
+from pathlib import Path
+from time import perf_counter
+import logging
+import re
+import typing as t
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from pydantic import BaseModel
+import sqlalchemy as sa
+import orjson
+
+
+__all__ = [
+    "SlowQueryLog",
+    "QueryContextMiddleware",
+    "set_query_filters",
+    "fingerprint_statement"
+]
+
+
+_PARAMS_RE = re.compile(r"\$\d+(?:\s*,\s*\$\d+)*")
+_NUMBERS_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_STRINGS_RE = re.compile(r"'(?:[^']|'')*'")
+_SPACES_RE = re.compile(r"\s+")
+
+
+class QueryContext:
+    __slots__ = ("scope", "filters")
+
+    def __init__(self, scope: dict[str, t.Any]) -> None:
+        self.scope = scope
+        self.filters: BaseModel | None = None
+
+
+_query_context: ContextVar[QueryContext | None] = ContextVar("query_context", default=None)
+
+
+class QueryContextMiddleware:
+    def __init__(self, app) -> None:
+        self.app = app
+
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        token = _query_context.set(QueryContext(scope))
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _query_context.reset(token)
+
+
+def set_query_filters(filters: BaseModel) -> None:
+    context = _query_context.get()
+
+    if context is not None:
+        context.filters = filters
+
+
+def fingerprint_statement(statement: str) -> tuple[str, str]:
+    shape = _SPACES_RE.sub(" ", statement).strip()
+    shape = _STRINGS_RE.sub("?", shape)
+    shape = _PARAMS_RE.sub("?", shape)
+    shape = _NUMBERS_RE.sub("?", shape)
+
+    return blake2b(shape.encode(), digest_size=8).hexdigest(), shape
+
+
+class SlowQueryLog:
+    def __init__(
+            self,
+            path: Path,
+            threshold: float,
+            max_bytes: int,
+            backups: int,
+            explain_limit: int = 0,
+            redact: t.Sequence[str] = (),
+            max_fingerprints: int = 10000
+        ) -> None:
+        self.path = path
+        self.threshold = threshold
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.explain_limit = explain_limit
+        self.redact = tuple(redact)
+        self.max_fingerprints = max_fingerprints
+        self.explained: dict[str, int] = {}
+        self._logger: logging.Logger | None = None
+
+
+    def instrument(self, engine: AsyncEngine) -> None:
+        sa.event.listen(engine.sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        sa.event.listen(engine.sync_engine, "after_cursor_execute", self._after_cursor_execute)
+
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info["slow_query_start"] = perf_counter()
+
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        duration = perf_counter() - conn.info.pop("slow_query_start", perf_counter())
+
+        if duration < self.threshold:
+            return
+
+        fingerprint, shape = fingerprint_statement(statement)
+
+        entry = {
+            "ts": datetime.now().isoformat(),
+            "fingerprint": fingerprint,
+            "shape": shape,
+            "duration": duration,
+            "rows": cursor.rowcount,
+            "statement": statement,
+            "parameters": self._dump_parameters(parameters, context, executemany),
+            **self._dump_context()
+        }
+
+        if self._should_explain(fingerprint, context, statement, executemany):
+            entry["explain"] = self._explain(conn, statement, parameters)
+
+        self._get_logger().info(orjson.dumps(entry, default=str).decode())
+
+
+    def _dump_context(self) -> dict[str, t.Any]:
+        context = _query_context.get()
+
+        if context is None:
+            return {"route": None, "filters": None}
+
+        route = context.scope.get("route")
+        filters = context.filters
+
+        return {
+            "route": f"{context.scope['method']} {getattr(route, 'path', context.scope['path'])}",
+            "filters": {
+                "shema": type(filters).__name__,
+                "data": self._redact_mapping(filters.model_dump(mode="json", exclude_unset=True))
+            } if filters is not None else None
+        }
+
+
+    def _dump_parameters(self, parameters: t.Any, context, executemany: bool) -> t.Any:
+        if executemany:
+            return {"executemany": len(parameters)}
+
+        if isinstance(parameters, dict):
+            return self._redact_mapping(parameters)
+
+        names = getattr(getattr(context, "compiled", None), "positiontup", None)
+
+        if names is None or len(names) != len(parameters):
+            return ["[redacted]" if self.redact else value for value in parameters]
+
+        return [
+            "[redacted]" if self._is_redacted(name) else value for name, value in zip(names, parameters)
+        ]
+
+
+    def _redact_mapping(self, data: dict[str, t.Any]) -> dict[str, t.Any]:
+        return {
+            key: "[redacted]" if self._is_redacted(key) else value for key, value in data.items()
+        }
+
+
+    def _is_redacted(self, name: str) -> bool:
+        return name.startswith(self.redact) if self.redact else False
+
+
+    def _should_explain(self, fingerprint: str, context, statement: str, executemany: bool) -> bool:
+        if self.explain_limit <= 0 or executemany:
+            return False
+
+        if context is None or context.isinsert or context.isupdate or context.isdelete:
+            return False
+
+        if not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            return False
+
+        count = self.explained.get(fingerprint, 0)
+
+        if count >= self.explain_limit:
+            return False
+
+        if count == 0 and len(self.explained) >= self.max_fingerprints:
+            return False
+
+        self.explained[fingerprint] = count + 1
+
+        return True
+
+
+    def _explain(self, conn, statement: str, parameters: t.Any) -> t.Any:
+        cursor = conn.connection.cursor()
+
+        try:
+            cursor.execute("SAVEPOINT slow_query_explain")
+
+            try:
+                cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters)
+                plan = cursor.fetchone()[0]
+            finally:
+                cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+                cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+
+            return orjson.loads(plan) if isinstance(plan, (str, bytes)) else plan
+
+        except Exception as e:
+            return {"error": str(e)}
+
+        finally:
+            cursor.close()
+
+
+    def _get_logger(self) -> logging.Logger:
+        if self._logger is not None:
+            return self._logger
+
+        self._logger = logging.getLogger(f"src.slow_queries.{self.path}")
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+
+        if not self._logger.handlers:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+            handler = RotatingFileHandler(
+                self.path,
+                maxBytes=self.max_bytes,
+                backupCount=self.backups,
+                encoding="utf-8",
+                delay=True
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+
+            self._logger.addHandler(handler)
+
+        return self._logger
@@ -1,295 +1,793 @@
-import typing as t
-import json
-
-import pytest
-from naks_library import BaseShema
-
-from services.db_services import *
-from client import client
-from shemas import *
-
-
-class BaseTestCRUDEndpoints[Shema: BaseShema]:
-    __shema__: type[Shema]
-
-    def test_add(self, api_path, shema: Shema):
-        res = client.post(api_path, json=shema.model_dump(mode="json"))
-
-        assert res.status_code == 200
-
-
-    def test_get(self, api_path: str, shema: Shema): 
-        res = client.get(api_path)
-
-        assert shema == type(shema).model_validate(json.loads(res.text)) 
-
-    
-    def test_update(self, api_path: str, data: Shema):
-        res = client.patch(api_path, json=data.model_dump(mode="json", exclude_unset=True))
-
-        assert res.status_code == 200
-
-        shema = client.get(api_path)
-
-        assert shema.status_code == 200
-
-        shema = self.__shema__.model_validate(json.loads(shema.text)).model_dump()
-
-        for key, value in data.model_dump(exclude_unset=True).items():
-            assert shema[key] == value
-
-
-    def test_delete(self, api_path: str, shema: Shema): 
-        res = client.delete(f"{api_path}/{shema.ident.hex}")
-
-        assert res.status_code == 200
-
-        res = client.get(f"{api_path}/{shema.ident.hex}")
-
-        assert "not found" in json.loads(res.text)["detail"]
-        
-        res = client.post(api_path, json=shema.model_dump(mode="json"))
-
-        assert res.status_code == 200
-
-
-class TestWelderCRUDEndpoints(BaseTestCRUDEndpoints[WelderShema]):
-    __shema__ = WelderShema
-
-    @pytest.mark.parametrize(
-            "index",
-            [0, 1, 2, 3, 4]
-    )
-    @pytest.mark.usefixtures("welders")
-    def test_add(self, index: int, welders: list[WelderShema]):
-        welder = welders[index]
-
-        return super().test_add(
-            f"/api/v1/welders",
-            welder
-        )
-
-
-    @pytest.mark.parametrize(
-            "index",
-            [0, 1, 2, 3]
-    )
-    @pytest.mark.usefixtures("welders")
-    def test_get(self, index: int, welders: list[WelderShema]):
-        welder = welders[index]
-
-        return super().test_get(
-            f"/api/v1/welders/{welder.ident.hex}",
-            welder
-        )
-
-
-    @pytest.mark.parametrize(
-            "index",
-            [0, 1, 2, 3]
-    )
-    @pytest.mark.usefixtures("welders")
-    def test_get_by_kleymo(self, index: int, welders: list[WelderShema]):
-        welder = welders[index]
-
-        return super().test_get(
-            f"/api/v1/welders/{welder.kleymo}",
-            welder
-        )
-    
-
-    @pytest.mark.parametrize(
-        "ident, data",
-        [
-            (
-                "095898d1419641b3adf45af287aad3e7", 
-                {
-                    "kleymo": "8M8S",
-                    "name": "Йадав Аджай",
-                    "birthday": "2000.01.01",
-                    "passport_number": "55442233",
-                }
-            ),
-            (
-                "01ES", 
-                {
-                    "name": "Моханан Сануп",
-                    "sicil": "126542",
-                    "nation": "RUS",
-                }
-            )
-        ]
-    )
-    def test_update(self, ident: str, data: dict[str, t.Any]):
-        return super().test_update(
-            f"/api/v1/welders/{ident}",
-            UpdateWelderShema.model_validate(data)
-        )
-
-
-    @pytest.mark.parametrize(
-            "index",
-            [0, 1, 2, 3]
-    )
-    @pytest.mark.usefixtures("welders")
-    def test_delete(self, index: int, welders: list[WelderShema]):
-        welder = welders[index]
-
-        return super().test_delete(
-            f"/api/v1/welders",
-            welder
-        )
-
-
-class TestWelderCertificationCRUDEndpoints(BaseTestCRUDEndpoints[WelderCertificationShema]):
-    __shema__ = WelderCertificationShema
-
-    @pytest.mark.parametrize(
-            "index",
-            [0, 1, 2, 3]
-    )
-    @pytest.mark.usefixtures("welder_certifications")
-    def test_add(self, index: int, welder_certifications: list[WelderCertificationShema]): 
-        certification = welder_certifications[index]
-
-        return super().test_add(
-            f"/api/v1/welder-certifications",
-            certification
-        )
-
-
-    @pytest.mark.parametrize(
-            "index",
-            [0, 1, 2, 3]
-    )
-    @pytest.mark.usefixtures("welder_certifications")
-    def test_get(self, index: int, welder_certifications: list[WelderCertificationShema]):
-        certification = welder_certifications[index]
-
-        return super().test_get(
-            f"/api/v1/welder-certifications/{certification.ident.hex}",
-            certification
-        )
-    
-
-    @pytest.mark.parametrize(
-            "ident, data",
-            [
-                (
-                    "dc628e8a800b47aeb8701b4994b5de20", 
-                    {
-                        "details_thikness_from": 2,
-                        "joint_type": [
-                            "УШ",
-                            "СШ"
-                        ],
-                        "kleymo": "01E0",
-                    }
-                ),
-                (
-                    "46a9381ae8cb4143958152bf25c30fbe", 
-                    {
-                        "welding_materials_groups": [
-                            "M01",
-                            "M03+M011",
-                            "M03"
-                        ],
-                        "outer_diameter_from": 157.0,
-                        "expiration_date_fact": "2022-04-05",
-                    }
-                )
-            ]
-    )
-    def test_update(self, ident: str, data: dict[str, t.Any]):
-        return super().test_update(
-            f"/api/v1/welder-certifications/{ident}",
-            UpdateWelderCertificationShema.model_validate(data)
-        )
-
-
-    @pytest.mark.parametrize(
-            "index",
-            [0, 1, 2, 3]
-    )
-    @pytest.mark.usefixtures("welder_certifications")
-    def test_delete(self, index: int, welder_certifications: list[WelderCertificationShema]):
-        certification = welder_certifications[index]
-
-        return super().test_delete(
-            f"/api/v1/welder-certifications",
-            certification
-        )
-
-
-class TestNDTCRUDEndpoints(BaseTestCRUDEndpoints[NDTShema]):
-    __shema__ = NDTShema
-
-    @pytest.mark.parametrize(
-            "index",
-            [0, 1, 2, 3, 4]
-    )
-    @pytest.mark.usefixtures("ndts")
-    def test_add(self, index: int, ndts: list[NDTShema]):
-        ndt = ndts[index]
-
-        return super().test_add(
-            f"/api/v1/ndts",
-            ndt
-        )
-
-
-    @pytest.mark.parametrize(
-            "index",
-            [0, 1, 2, 3]
-    )
-    @pytest.mark.usefixtures("ndts")
-    def test_get(self, index: int, ndts: list[NDTShema]):
-        ndt = ndts[index]
-
-        return super().test_get(
-            f"/api/v1/ndts/{ndt.ident.hex}",
-            ndt
-        )
-    
-
-    @pytest.mark.parametrize(
-            "ident, data",
-            [
-                (
-                    "6aaadee3fd7a45b4b26477f7ce573ff6", 
-                    {
-                        "total_welded": 4255.0,
-                        "total_ndt": 306.0,
-                        "accepted": 30118.0,
-                    }
-                ),
-                (
-                    "95b61f9d1b1c4dc2b79cce036d85f527", 
-                    {
-                        "company": "PIRAM",
-                        "subcompany": "PIRAMITd122",
-                        "project": "AWP1Bdwe",
-                        "welding_date": "2022-05-17"
-                    }
-                )
-            ]
-    )
-    def test_update(self, ident: str, data: dict[str, t.Any]):
-        return super().test_update(
-            f"/api/v1/ndts/{ident}",
-            UpdateNDTShema.model_validate(data)
-        )
-
-
-    @pytest.mark.parametrize(
-            "index",
-            [0, 1, 2, 3]
-    )
-    @pytest.mark.usefixtures("ndts")
-    def test_delete(self, index: int, ndts: list[NDTShema]):
-        ndt = ndts[index]
-
-        return super().test_delete(
-            f"/api/v1/ndts",
-            ndt
-        )
+from asyncio import run
+import typing as t
+import json
+from uuid import UUID, uuid4
+
+import pytest
+from naks_library import BaseShema
+
+from services.db_services import *
+from services.jobs import JobRunner
+from database import engine
+from models import JobModel
+from client import client
+from shemas import *
+
+
+class BaseTestCRUDEndpoints[Shema: BaseShema]:
+    __shema__: type[Shema]
+
+    def test_add(self, api_path, shema: Shema):
+        res = client.post(api_path, json=shema.model_dump(mode="json"))
+
+        assert res.status_code == 200
+
+
+    def test_get(self, api_path: str, shema: Shema): 
+        res = client.get(api_path)
+
+        assert shema == type(shema).model_validate(json.loads(res.text)) 
+
+    
+    def test_update(self, api_path: str, data: Shema):
+        res = client.patch(api_path, json=data.model_dump(mode="json", exclude_unset=True))
+
+        assert res.status_code == 200
+
+        shema = client.get(api_path)
+
+        assert shema.status_code == 200
+
+        shema = self.__shema__.model_validate(json.loads(shema.text)).model_dump()
+
+        for key, value in data.model_dump(exclude_unset=True).items():
+            assert shema[key] == value
+
+
+    def test_delete(self, api_path: str, shema: Shema): 
+        res = client.delete(f"{api_path}/{shema.ident.hex}")
+
+        assert res.status_code == 200
+
+        res = client.get(f"{api_path}/{shema.ident.hex}")
+
+        assert "not found" in json.loads(res.text)["detail"]
+        
+        res = client.post(api_path, json=shema.model_dump(mode="json"))
+
+        assert res.status_code == 200
+
+
+class TestWelderCRUDEndpoints(BaseTestCRUDEndpoints[WelderShema]):
+    __shema__ = WelderShema
+
+    @pytest.mark.parametrize(
+            "index",
+            [0, 1, 2, 3, 4]
+    )
+    @pytest.mark.usefixtures("welders")
+    def test_add(self, index: int, welders: list[WelderShema]):
+        welder = welders[index]
+
+        return super().test_add(
+            f"/api/v1/welders",
+            welder
+        )
+
+
+    @pytest.mark.parametrize(
+            "index",
+            [0, 1, 2, 3]
+    )
+    @pytest.mark.usefixtures("welders")
+    def test_get(self, index: int, welders: list[WelderShema]):
+        welder = welders[index]
+
+        return super().test_get(
+            f"/api/v1/welders/{welder.ident.hex}",
+            welder
+        )
+
+
+    @pytest.mark.parametrize(
+            "index",
+            [0, 1, 2, 3]
+    )
+    @pytest.mark.usefixtures("welders")
+    def test_get_by_kleymo(self, index: int, welders: list[WelderShema]):
+        welder = welders[index]
+
+        return super().test_get(
+            f"/api/v1/welders/{welder.kleymo}",
+            welder
+        )
+    
+
+    @pytest.mark.parametrize(
+        "ident, data",
+        [
+            (
+                "095898d1419641b3adf45af287aad3e7", 
+                {
+                    "kleymo": "8M8S",
+                    "name": "Йадав Аджай",
+                    "birthday": "2000.01.01",
+                    "passport_number": "55442233",
+                }
+            ),
+            (
+                "01ES", 
+                {
+                    "name": "Моханан Сануп",
+                    "sicil": "126542",
+                    "nation": "RUS",
+                }
+            )
+        ]
+    )
+    def test_update(self, ident: str, data: dict[str, t.Any]):
+        return super().test_update(
+            f"/api/v1/welders/{ident}",
+            UpdateWelderShema.model_validate(data)
+        )
+
+
+    @pytest.mark.parametrize(
+            "index",
+            [0, 1, 2, 3]
+    )
+    @pytest.mark.usefixtures("welders")
+    def test_delete(self, index: int, welders: list[WelderShema]):
+        welder = welders[index]
+
+        return super().test_delete(
+            f"/api/v1/welders",
+            welder
+        )
+
+
+class TestWelderCertificationCRUDEndpoints(BaseTestCRUDEndpoints[WelderCertificationShema]):
+    __shema__ = WelderCertificationShema
+
+    @pytest.mark.parametrize(
+            "index",
+            [0, 1, 2, 3]
+    )
+    @pytest.mark.usefixtures("welder_certifications")
+    def test_add(self, index: int, welder_certifications: list[WelderCertificationShema]): 
+        certification = welder_certifications[index]
+
+        return super().test_add(
+            f"/api/v1/welder-certifications",
+            certification
+        )
+
+
+    @pytest.mark.parametrize(
+            "index",
+            [0, 1, 2, 3]
+    )
+    @pytest.mark.usefixtures("welder_certifications")
+    def test_get(self, index: int, welder_certifications: list[WelderCertificationShema]):
+        certification = welder_certifications[index]
+
+        return super().test_get(
+            f"/api/v1/welder-certifications/{certification.ident.hex}",
+            certification
+        )
+    
+
+    @pytest.mark.parametrize(
+            "ident, data",
+            [
+                (
+                    "dc628e8a800b47aeb8701b4994b5de20", 
+                    {
+                        "details_thikness_from": 2,
+                        "joint_type": [
+                            "УШ",
+                            "СШ"
+                        ],
+                        "kleymo": "01E0",
+                    }
+                ),
+                (
+                    "46a9381ae8cb4143958152bf25c30fbe", 
+                    {
+                        "welding_materials_groups": [
+                            "M01",
+                            "M03+M011",
+                            "M03"
+                        ],
+                        "outer_diameter_from": 157.0,
+                        "expiration_date_fact": "2022-04-05",
+                    }
+                )
+            ]
+    )
+    def test_update(self, ident: str, data: dict[str, t.Any]):
+        return super().test_update(
+            f"/api/v1/welder-certifications/{ident}",
+            UpdateWelderCertificationShema.model_validate(data)
+        )
+
+
+    @pytest.mark.parametrize(
+            "index",
+            [0, 1, 2, 3]
+    )
+    @pytest.mark.usefixtures("welder_certifications")
+    def test_delete(self, index: int, welder_certifications: list[WelderCertificationShema]):
+        certification = welder_certifications[index]
+
+        return super().test_delete(
+            f"/api/v1/welder-certifications",
+            certification
+        )
+
+
+class TestNDTCRUDEndpoints(BaseTestCRUDEndpoints[NDTShema]):
+    __shema__ = NDTShema
+
+    @pytest.mark.parametrize(
+            "index",
+            [0, 1, 2, 3, 4]
+    )
+    @pytest.mark.usefixtures("ndts")
+    def test_add(self, index: int, ndts: list[NDTShema]):
+        ndt = ndts[index]
+
+        return super().test_add(
+            f"/api/v1/ndts",
+            ndt
+        )
+
+
+    @pytest.mark.parametrize(
+            "index",
+            [0, 1, 2, 3]
+    )
+    @pytest.mark.usefixtures("ndts")
+    def test_get(self, index: int, ndts: list[NDTShema]):
+        ndt = ndts[index]
+
+        return super().test_get(
+            f"/api/v1/ndts/{ndt.ident.hex}",
+            ndt
+        )
+    
+
+    @pytest.mark.parametrize(
+            "ident, data",
+            [
+                (
+                    "6aaadee3fd7a45b4b26477f7ce573ff6", 
+                    {
+                        "total_welded": 4255.0,
+                        "total_ndt": 306.0,
+                        "accepted": 30118.0,
+                    }
+                ),
+                (
+                    "95b61f9d1b1c4dc2b79cce036d85f527", 
+                    {
+                        "company": "PIRAM",
+                        "subcompany": "PIRAMITd122",
+                        "project": "AWP1Bdwe",
+                        "welding_date": "2022-05-17"
+                    }
+                )
+            ]
+    )
+    def test_update(self, ident: str, data: dict[str, t.Any]):
+        return super().test_update(
+            f"/api/v1/ndts/{ident}",
+            UpdateNDTShema.model_validate(data)
+        )
+
+
+    @pytest.mark.parametrize(
+            "index",
+            [0, 1, 2, 3]
+    )
+    @pytest.mark.usefixtures("ndts")
+    def test_delete(self, index: int, ndts: list[NDTShema]):
+        ndt = ndts[index]
+
+        return super().test_delete(
+            f"/api/v1/ndts",
+            ndt
+        )
+
+
+@pytest.mark.parametrize(
+    "api_path",
+    [
+        "/api/v1/welders/select",
+        "/api/v1/welder-certifications/select",
+        "/api/v1/ndts/select",
+    ]
+)
+def test_select_keyset_pagination(api_path: str):
+    res = client.post(api_path, json={})
+
+    assert res.status_code == 200
+
+    expected = [el["ident"] for el in json.loads(res.text)["result"]]
+
+    idents = []
+    cursor = None
+
+    while True:
+        res = client.post(api_path, json={"limit": 2, "cursor": cursor})
+
+        assert res.status_code == 200
+
+        page = json.loads(res.text)
+        idents += [el["ident"] for el in page["result"]]
+        cursor = page["next_cursor"]
+
+        if not cursor:
+            break
+
+    assert sorted(idents) == sorted(expected)
+    assert len(set(idents)) == len(idents)
+
+
+@pytest.mark.parametrize(
+    "api_path, filters",
+    [
+        ("/api/v1/welders/select", {"kleymos": ["01ES", "8M8S"]}),
+        ("/api/v1/welder-certifications/select", {"kleymos": ["01E0"]}),
+        ("/api/v1/ndts/select", {"kleymos": ["11F9"]}),
+    ]
+)
+def test_select_count_modes(api_path: str, filters: dict):
+    res = client.post(api_path, json=filters | {"count_mode": "exact"})
+
+    assert res.status_code == 200
+
+    page = json.loads(res.text)
+
+    assert page["count"] == len(page["result"])
+
+    res = client.post(api_path, json=filters | {"count_mode": "none", "limit": 1})
+
+    assert res.status_code == 200
+    assert json.loads(res.text)["count"] is None
+
+    res = client.post(api_path, json=filters | {"count_mode": "estimated"})
+
+    assert res.status_code == 200
+    assert isinstance(json.loads(res.text)["count"], int)
+
+
+def test_welders_bulk_add():
+    res = client.post(
+        "/api/v1/welders/bulk",
+        json=[
+            {"kleymo": "ZZ01", "name": "Bulk One"},
+            {"kleymo": "bad", "name": "Bulk Bad"},
+            {"kleymo": "ZZ02", "name": "Bulk Two"},
+        ]
+    )
+
+    assert res.status_code == 200
+
+    report = json.loads(res.text)
+
+    assert report["inserted"] == 2
+    assert [error["index"] for error in report["errors"]] == [1]
+
+    res = client.post(
+        "/api/v1/welders/bulk?chunk_size=1",
+        content=b'{"kleymo": "ZZ01", "name": "Bulk One"}\n{"kleymo": "ZZ03", "name": "Bulk Three"}\n',
+        headers={"content-type": "application/x-ndjson"}
+    )
+
+    assert res.status_code == 200
+
+    report = json.loads(res.text)
+
+    assert report["inserted"] == 1
+    assert [error["index"] for error in report["errors"]] == [0]
+
+    for kleymo in ["ZZ01", "ZZ02", "ZZ03"]:
+        assert client.delete(f"/api/v1/welders/{kleymo}").status_code == 200
+
+
+def test_bulk_ndjson_size_limit(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("MAX_BULK_BODY_SIZE", "48")
+
+    content = b'{"kleymo": "ZZ04", "name": "Bulk Four"}\n{"kleymo": "ZZ05", "name": "Bulk Five"}\n'
+
+    res = client.post("/api/v1/welders/bulk", content=content, headers={"content-type": "application/x-ndjson"})
+
+    assert res.status_code == 413
+
+    res = client.post("/api/v1/welders/bulk", content=(line for line in [content]), headers={"content-type": "application/x-ndjson"})
+
+    assert res.status_code == 200
+
+    report = json.loads(res.text)
+
+    assert report["truncated"]
+    assert report["inserted"] == 0
+
+
+def test_welder_certifications_bulk_upsert(welders: list[WelderShema], welder_certifications: list[WelderCertificationShema]):
+    client.post("/api/v1/welders/bulk", json=[el.model_dump(mode="json") for el in welders])
+
+    certifications = [el.model_dump(mode="json", exclude={"ident"}) for el in welder_certifications][10:15]
+
+    res = client.put("/api/v1/welder-certifications/bulk", json=certifications)
+
+    assert res.status_code == 200
+
+    report = json.loads(res.text)
+
+    assert report["inserted"] + report["updated"] + report["unchanged"] == len(certifications)
+
+    certifications[0]["company"] = "upsert company"
+
+    res = client.put("/api/v1/welder-certifications/bulk", json=certifications)
+
+    assert res.status_code == 200
+
+    report = json.loads(res.text)
+
+    assert report["inserted"] == 0
+    assert report["updated"] == 1
+    assert report["unchanged"] == len(certifications) - 1
+
+
+@pytest.mark.parametrize(
+    "api_path",
+    [
+        "/api/v1/welders",
+        "/api/v1/welder-certifications",
+        "/api/v1/ndts",
+    ]
+)
+def test_export(api_path: str):
+    res = client.post(f"{api_path}/select", json={})
+
+    assert res.status_code == 200
+
+    expected = json.loads(res.text)["result"]
+
+    res = client.post(f"{api_path}/export", json={})
+
+    assert res.status_code == 200
+    assert res.headers["content-type"] == "application/x-ndjson"
+
+    rows = [json.loads(line) for line in res.text.splitlines()]
+
+    assert sorted(row["ident"] for row in rows) == sorted(row["ident"] for row in expected)
+
+    res = client.post(f"{api_path}/export?format=csv", json={})
+
+    assert res.status_code == 200
+    assert len(res.text.splitlines()) == len(expected) + 1
+
+
+def test_welder_profile(welders: list[WelderShema]):
+    welder = welders[4]
+
+    res = client.get(f"/api/v1/welders/{welder.kleymo}/profile")
+
+    assert res.status_code == 200
+
+    profile = WelderProfileShema.model_validate(json.loads(res.text))
+
+    assert profile.ident == welder.ident
+    assert all(el.kleymo == welder.kleymo for el in profile.certifications + profile.ndts)
+
+    res = client.get(f"/api/v1/welders/{welder.kleymo}/profile?ndt_from=2100-01-01")
+
+    assert res.status_code == 200
+    assert json.loads(res.text)["ndts"] == []
+
+
+def test_welders_batch(welders: list[WelderShema]):
+    idents = [welders[4].ident.hex, "ZZZZ", welders[4].kleymo]
+
+    res = client.post("/api/v1/welders/batch", json={"idents": idents})
+
+    assert res.status_code == 200
+
+    result = json.loads(res.text)
+
+    assert [el["ident"] if el else None for el in result["result"]] == [str(welders[4].ident), None, str(welders[4].ident)]
+    assert result["missing"] == ["ZZZZ"]
+
+
+def test_conditional_get(welders: list[WelderShema]):
+    api_path = f"/api/v1/welders/{welders[4].ident.hex}"
+
+    res = client.get(api_path)
+
+    assert res.status_code == 200
+
+    etag = res.headers["etag"]
+
+    res = client.get(api_path, headers={"If-None-Match": etag})
+
+    assert res.status_code == 304
+
+    res = client.patch(api_path, json={"nation": "ETG"})
+
+    assert res.status_code == 200
+
+    res = client.get(api_path, headers={"If-None-Match": etag})
+
+    assert res.status_code == 200
+    assert res.headers["etag"] != etag
+
+
+def test_conditional_select():
+    res = client.post("/api/v1/welder-certifications/select", json={"limit": 5})
+
+    assert res.status_code == 200
+
+    etag = res.headers["etag"]
+
+    res = client.post("/api/v1/welder-certifications/select", json={"limit": 5}, headers={"If-None-Match": etag})
+
+    assert res.status_code == 304
+
+    res = client.post("/api/v1/welder-certifications/select", json={"limit": 4}, headers={"If-None-Match": etag})
+
+    assert res.status_code == 200
+
+
+def test_qualified_welders(welder_certifications: list[WelderCertificationShema]):
+    certification = next(
+        el for el in welder_certifications 
+        if el.method and el.details_thikness_from != None and el.details_thikness_before != None
+    )
+
+    joint = {
+        "method": certification.method,
+        "details_thikness": (certification.details_thikness_from + certification.details_thikness_before) / 2,
+        "as_of": certification.certification_date.isoformat()
+    }
+
+    res = client.post("/api/v1/welders/qualified", json=joint)
+
+    assert res.status_code == 200
+
+    result = [QualifiedWelderShema.model_validate(el) for el in json.loads(res.text)]
+
+    assert certification.kleymo in [el.kleymo for el in result]
+    assert [el.valid_until for el in result] == sorted((el.valid_until for el in result), reverse=True)
+
+    for welder in result:
+        for el in welder.certifications:
+            assert el.method == certification.method
+            assert el.certification_date <= certification.certification_date <= el.expiration_date_fact
+
+    grouped = next(el for el in welder_certifications if el.method and el.gtd and el.welding_materials_groups)
+    grouped_joint = {
+        "method": grouped.method,
+        "gtd": grouped.gtd[0],
+        "welding_materials_group": grouped.welding_materials_groups[0],
+        "as_of": grouped.certification_date.isoformat()
+    }
+
+    res = client.post("/api/v1/welders/qualified", json=grouped_joint)
+
+    assert res.status_code == 200
+
+    result = [QualifiedWelderShema.model_validate(el) for el in json.loads(res.text)]
+
+    assert grouped.kleymo in [el.kleymo for el in result]
+
+    for welder in result:
+        for el in welder.certifications:
+            assert grouped.gtd[0] in el.gtd
+            assert grouped.welding_materials_groups[0] in el.welding_materials_groups
+
+    res = client.post("/api/v1/welders/qualified", json={**grouped_joint, "gtd": "missing group"})
+
+    assert res.status_code == 200
+    assert json.loads(res.text) == []
+
+    res = client.post("/api/v1/welders/qualified", json={**joint, "details_thikness": -1})
+
+    assert res.status_code == 400
+
+
+def test_read_primary_override(welders: list[WelderShema]):
+    welder = welders[7]
+
+    res = client.get(f"/api/v1/welders/{welder.ident.hex}", headers={"X-Read-Primary": "true"})
+
+    assert res.status_code == 200
+    assert WelderShema.model_validate(json.loads(res.text)).ident == welder.ident
+
+
+def test_metrics(welders: list[WelderShema]):
+    client.get(f"/api/v1/welders/{welders[2].ident.hex}")
+
+    res = client.get("/metrics")
+
+    assert res.status_code == 200
+    assert 'route="/api/v1/welders/{ident}"' in res.text
+    assert "http_request_db_statements_total" in res.text
+
+
+@pytest.mark.parametrize(
+    "api_path, shema",
+    [
+        ("/api/v1/welders/select", WelderShema),
+        ("/api/v1/welder-certifications/select", WelderCertificationShema),
+        ("/api/v1/ndts/select", NDTShema)
+    ]
+)
+def test_select_response_encoding(api_path: str, shema: type[BaseShema]):
+    res = client.post(api_path, json={"limit": 20})
+
+    assert res.status_code == 200
+    assert res.headers["content-type"] == "application/json"
+
+    content = json.loads(res.content)
+
+    assert res.content == json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    assert list(content) == ["result", "count"]
+    assert [list(el) for el in content["result"]] == [list(shema.model_fields) for _ in content["result"]]
+
+
+def test_request_body_validation(monkeypatch: pytest.MonkeyPatch):
+    res = client.post("/api/v1/welders/select", content=b"{\"limit\": ")
+
+    assert res.status_code == 400
+
+    monkeypatch.setenv("MAX_BODY_SIZE", "16")
+
+    res = client.post("/api/v1/welders/select", json={"names": ["Иванов Иван"], "limit": 10})
+
+    assert res.status_code == 413
+
+
+def test_sparse_fieldsets(welders: list[WelderShema]):
+    welder = welders[2]
+
+    res = client.get(f"/api/v1/welders/{welder.kleymo}", params={"fields": "name,kleymo"})
+
+    assert res.status_code == 200
+    assert res.json() == {"kleymo": welder.kleymo, "name": welder.name}
+
+    etag = res.headers["etag"]
+
+    assert client.get(f"/api/v1/welders/{welder.kleymo}", headers={"If-None-Match": etag}).status_code == 200
+    assert client.get(f"/api/v1/welders/{welder.kleymo}", params={"fields": "kleymo,name"}, headers={"If-None-Match": etag}).status_code == 304
+
+    res = client.post("/api/v1/welder-certifications/select", params={"fields": "kleymo,method"}, json={"limit": 5})
+
+    assert res.status_code == 200
+    assert [list(el) for el in res.json()["result"]] == [["kleymo", "method"] for _ in res.json()["result"]]
+
+    res = client.post("/api/v1/ndts/select", params={"fields": "kleymo,password"}, json={"limit": 5})
+
+    assert res.status_code == 400
+
+
+def test_registry_import(welders: list[WelderShema]):
+    client.post("/api/v1/welders/bulk", json=[el.model_dump(mode="json") for el in welders])
+
+    content = "\n".join([
+        "Клеймо;Номер удостоверения;Дата аттестации;Действительно до;Способ сварки;ГТУ",
+        f"{welders[0].kleymo};АЦСТ-1А-I-00001;2021-02-01;2023-02-01;РД;ГДО, КО",
+        f"{welders[0].kleymo};invalid;2021-02-01;2023-02-01;РД;ГДО"
+    ]).encode()
+
+    res = client.post("/api/v1/welder-certifications/import", files={"file": ("registry.csv", content, "text/csv")})
+
+    assert res.status_code == 200
+
+    report = json.loads(res.text)
+
+    assert report["rows"] == 2
+    assert report["inserted"] == 1
+    assert report["rejected"] == 1
+
+    res = client.get(f"/api/v1/imports/rejected/{report['rejected_file']}")
+
+    assert res.status_code == 200
+    assert "invalid" in res.text
+
+    res = client.post("/api/v1/ndts/import", files={"file": ("registry.txt", content, "text/plain")})
+
+    assert res.status_code == 400
+
+
+def test_export_job():
+    res = client.post("/api/v1/welders/export/jobs", params={"format": "csv"}, json={"limit": 10})
+
+    assert res.status_code == 202
+
+    ident = json.loads(res.text)["ident"]
+
+    res = client.get(f"/api/v1/jobs/{ident}")
+
+    assert res.status_code == 200
+    assert json.loads(res.text)["params"]["entity"] == "welders"
+
+    assert client.get(f"/api/v1/jobs/{ident}/result").status_code == 400
+    assert client.post(f"/api/v1/jobs/{ident}/cancel").status_code == 200
+    assert json.loads(client.get(f"/api/v1/jobs/{ident}").text)["status"] == "cancelled"
+    assert client.post(f"/api/v1/jobs/{ident}/cancel").status_code == 400
+
+
+def test_changes(welders: list[WelderShema]):
+    client.post("/api/v1/welders/bulk", json=[el.model_dump(mode="json") for el in welders])
+
+    cursor = None
+    synced = set()
+
+    while True:
+        res = client.get("/api/v1/welders/changes", params={"cursor": cursor, "limit": 50} if cursor else {"limit": 50})
+
+        assert res.status_code == 200
+
+        page = json.loads(res.text)
+        synced.update(el["ident"] for el in page["upserts"])
+        cursor = page["next_cursor"]
+
+        if not page["has_more"]:
+            break
+
+    assert {el.ident.hex for el in welders} <= {UUID(ident).hex for ident in synced}
+
+    welder = welders[3]
+
+    client.patch(f"/api/v1/welders/{welder.ident.hex}", json={"name": "changed name"})
+    client.delete(f"/api/v1/welders/{welders[4].ident.hex}")
+
+    page = json.loads(client.get("/api/v1/welders/changes", params={"cursor": cursor}).text)
+
+    assert [UUID(el["ident"]) for el in page["upserts"]] == [welder.ident]
+    assert page["upserts"][0]["name"] == "changed name"
+    assert [UUID(el["ident"]) for el in page["tombstones"]] == [welders[4].ident]
+    assert client.get("/api/v1/welders/changes", params={"cursor": "invalid"}).status_code == 400
+
+
+def test_job_result_file():
+    ident = uuid4()
+    runner = JobRunner(engine, 1, 0.1, 0, 60, 120)
+
+    async def content():
+        yield b"kleymo\n"
+        yield b"A1B2\n"
+
+    async def add_job():
+        async with engine.begin() as conn:
+            await JobModel.create(
+                [{
+                    "ident": ident,
+                    "kind": "export",
+                    "status": "succeeded",
+                    "params": {},
+                    "progress": 1,
+                    "cancel_requested": False,
+                    "result": {"rows": 1, "file": "welders.csv", "media_type": "text/csv; charset=utf-8"}
+                }],
+                conn=conn
+            )
+
+        await runner.write_file(ident, "result", content())
+
+    run(add_job())
+
+    res = client.get(f"/api/v1/jobs/{ident.hex}/result")
+
+    assert res.status_code == 200
+    assert res.content == b"kleymo\nA1B2\n"
+    assert 'filename="welders.csv"' in res.headers["Content-Disposition"]
+
+
+def test_update_welder_null_kleymo(welders: list[WelderShema]):
+    res = client.patch(f"/api/v1/welders/{welders[5].ident.hex}", json={"kleymo": None})
+
+    assert res.status_code == 400
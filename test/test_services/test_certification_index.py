@@ -0,0 +1,118 @@
+from datetime import date
+import asyncio
+import uuid
+
+import pytest
+import sqlalchemy as sa
+
+pytest.importorskip("numpy")
+
+from src.services.certification_index import CertificationIndex
+from src.shemas import JointRequestShema
+
+
+def make_row(**data) -> dict:
+    row = {
+        "ident": uuid.uuid4(),
+        "kleymo": "01ES",
+        "certification_date": date(2024, 1, 1),
+        "expiration_date_fact": date(2026, 1, 1),
+        "method": "РД",
+        "gtd": ["ТТ"],
+        "welding_materials_groups": ["M01"],
+        "details_thikness_from": 3.0,
+        "details_thikness_before": 12.0,
+        "outer_diameter_from": 25.0,
+        "outer_diameter_before": None,
+        "rod_diameter_from": None,
+        "rod_diameter_before": None
+    }
+
+    return row | data
+
+
+def test_screen() -> None:
+    rows = [
+        make_row(),
+        make_row(kleymo="8M8S", method="РАД"),
+        make_row(kleymo="A1B2", details_thikness_from=12.0, details_thikness_before=3.0, gtd=["ГДО", "ТТ"]),
+        make_row(kleymo="C3D4", welding_materials_groups=["M11"]),
+        make_row(kleymo="E5F6", expiration_date_fact=date(2024, 6, 1)),
+    ]
+
+    index = CertificationIndex()
+    index.load(rows)
+
+    joint = JointRequestShema(
+        method="РД",
+        welding_materials_group="M01",
+        gtd="ТТ",
+        details_thikness=10,
+        outer_diameter=159,
+        as_of="2025-01-01"
+    )
+
+    assert index.screen(joint) == [rows[0]["ident"], rows[2]["ident"]]
+    assert index.screen(joint.model_copy(update={"details_thikness": 20})) == []
+    assert index.screen(joint.model_copy(update={"gtd": "НГДО"})) == []
+
+    index.remove([str(rows[0]["ident"])])
+
+    assert index.screen(joint) == [rows[2]["ident"]]
+    assert index.stats()["rows"] == 4
+
+
+class FakeResponse:
+    def __init__(self, rows: list[dict]) -> None:
+        self.rows = rows
+
+
+    def mappings(self) -> "FakeResponse":
+        return self
+
+
+    def all(self) -> list[dict]:
+        return self.rows
+
+
+class FakeConnection:
+    def __init__(self, rows: list[dict]) -> None:
+        self.rows = rows
+        self.executing = asyncio.Event()
+        self.resume = asyncio.Event()
+
+
+    async def execute(self, stmt) -> FakeResponse:
+        rows = list(self.rows)
+
+        if not self.executing.is_set():
+            self.executing.set()
+            await self.resume.wait()
+
+        return FakeResponse(rows)
+
+
+@pytest.mark.asyncio
+async def test_refresh_during_build(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("CERTIFICATION_INDEX", "true")
+
+    rows = [make_row(expiration_date_fact=date(2099, 1, 1)), make_row(kleymo="A1B2", expiration_date_fact=date(2099, 1, 1))]
+    conn = FakeConnection(rows[:1])
+    index = CertificationIndex()
+    index.invalidate()
+
+    build = asyncio.create_task(index.build(conn))
+
+    await conn.executing.wait()
+
+    conn.rows = rows
+    await index.refresh(conn, sa.true())
+    index.discard([rows[0]["ident"]])
+
+    conn.resume.set()
+    await build
+
+    joint = JointRequestShema(method="РД")
+
+    assert index.ready
+    assert index.screen(joint) == [rows[1]["ident"]]
@@ -0,0 +1,102 @@
+import asyncio
+import io
+
+import pytest
+
+from services.jobs import JobRunner
+from database import engine
+from models import JobModel
+
+
+@pytest.mark.asyncio
+async def test_job_runner() -> None:
+    runner = JobRunner(engine, 1, 0.1, 0, 60, 120)
+
+    @runner.register("echo")
+    async def echo(context, params: dict) -> dict:
+        await context.report(1, 2)
+
+        return {"value": params["value"]}
+
+    @runner.register("fail")
+    async def fail(context, params: dict) -> dict:
+        raise ValueError("job failed")
+
+    @runner.register("cancel")
+    async def cancel(context, params: dict) -> dict:
+        await context.report(1, force=True)
+
+        async with engine.begin() as conn:
+            await JobModel.request_cancel(conn, context.ident)
+
+        await context.report(2, force=True)
+
+        return {}
+
+    @runner.register("read")
+    async def read(context, params: dict) -> dict:
+        return {"data": b"".join([data async for data in runner.read_file(context.ident, "upload")]).decode()}
+
+    with pytest.raises(ValueError):
+        await runner.submit("missing", {})
+
+    ident = await runner.submit("echo", {"value": 5})
+
+    assert (await runner.get(ident))["status"] == "queued"
+    assert await runner.run_next()
+
+    job = await runner.get(ident)
+
+    assert job["status"] == "succeeded"
+    assert job["result"] == {"value": 5}
+    assert (job["progress"], job["total"]) == (1, 2)
+
+    ident = await runner.submit("fail", {})
+
+    assert await runner.run_next()
+    assert (await runner.get(ident))["error"] == "job failed"
+
+    ident = await runner.submit("cancel", {})
+
+    assert await runner.run_next()
+    assert (await runner.get(ident))["status"] == "cancelled"
+
+    ident = await runner.submit("echo", {"value": 1})
+
+    assert await runner.cancel(ident) == "cancelled"
+    assert await runner.cancel(ident) == None
+    assert not await runner.run_next()
+
+    ident = await runner.submit("read", {}, {"upload": io.BytesIO(b"registry")})
+
+    assert await runner.run_next()
+    assert (await runner.get(ident))["result"] == {"data": "registry"}
+
+
+class FailingEngine:
+    def __init__(self) -> None:
+        self.calls = 0
+
+
+    def begin(self):
+        self.calls += 1
+
+        raise RuntimeError("database is unavailable")
+
+
+@pytest.mark.asyncio
+async def test_job_runner_survives_errors() -> None:
+    failing_engine = FailingEngine()
+    runner = JobRunner(failing_engine, 1, 0.01, 0, 0.01, 120)
+
+    tasks = [asyncio.create_task(runner._work()), asyncio.create_task(runner._heartbeat())]
+
+    await asyncio.sleep(0.1)
+
+    assert not any(task.done() for task in tasks)
+    assert failing_engine.calls > 2
+
+    for task in tasks:
+        task.cancel()
+
+    await asyncio.gather(*tasks, return_exceptions=True)
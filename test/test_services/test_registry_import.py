@@ -0,0 +1,15 @@
+from services.registry_import import ImportPool
+
+
+def test_import_pool():
+    pool = ImportPool(1)
+    executor = pool.get()
+
+    assert pool.get() is executor
+    assert executor.submit(sum, [1, 2]).result() == 3
+
+    pool.shutdown()
+
+    assert pool.get() is not executor
+
+    pool.shutdown()
@@ -0,0 +1,13 @@
+from sqlalchemy.dialects import postgresql
+
+from shemas import WelderRequestShema
+
+
+def test_welder_names_filter():
+    request = WelderRequestShema.model_validate({"names": ["Иванов Иван", "Петров Петр"], "kleymos": ["01ES"]})
+
+    sql = str(request.dump_expression().compile(dialect=postgresql.dialect()))
+
+    assert sql.count("welder_table.name ILIKE") == 2
+    assert "ANY" not in sql
+    assert "kleymo" in sql
@@ -0,0 +1,62 @@
+from src.utils.cache import TTLCache
+
+
+class FakeTimer:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_aliases_share_entry() -> None:
+    cache = TTLCache[str](maxsize=10, ttl=60)
+
+    cache.set([("ident", 1), ("kleymo", "01ES")], "welder")
+
+    assert cache.get(("kleymo", "01ES")) == "welder"
+    assert cache.get(("ident", 1)) == "welder"
+
+    cache.pop(("kleymo", "01ES"))
+
+    assert cache.get(("ident", 1)) is None
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_ttl() -> None:
+    timer = FakeTimer()
+    cache = TTLCache[str](maxsize=10, ttl=5, timer=timer)
+
+    cache.set(["a"], "value")
+    timer.now = 4
+
+    assert cache.get("a") == "value"
+
+    timer.now = 5
+
+    assert cache.get("a") is None
+
+
+def test_cache_lru_eviction() -> None:
+    cache = TTLCache[int](maxsize=2, ttl=60)
+
+    cache.set(["a"], 1)
+    cache.set(["b"], 2)
+    cache.get("a")
+    cache.set(["c"], 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_skips_stale_generation() -> None:
+    cache = TTLCache[int](maxsize=2, ttl=60)
+
+    generation = cache.generation
+    cache.pop("a")
+    cache.set(["a"], 1, generation)
+
+    assert cache.get("a") is None
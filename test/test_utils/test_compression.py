@@ -0,0 +1,104 @@
+import gzip
+import zlib
+
+import pytest
+
+from src.utils.compression import CompressionMiddleware, negotiate_encoding
+from src.utils.etags import add_etag_encoding, etag_matches
+
+
+def make_app(chunks: list[bytes], content_type: bytes = b"application/json"):
+    async def app(scope, receive, send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", content_type), (b"etag", b'"abc"')]
+        })
+
+        for index, chunk in enumerate(chunks):
+            await send({"type": "http.response.body", "body": chunk, "more_body": index < len(chunks) - 1})
+
+    return app
+
+
+async def call(app, accept_encoding: bytes | None) -> list[dict]:
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message) -> None:
+        messages.append(message)
+
+    scope = {"type": "http", "path": "/api/v1/welders/select", "headers": [(b"accept-encoding", accept_encoding)] if accept_encoding else []}
+
+    await app(scope, receive, send)
+
+    return messages
+
+
+def test_negotiate_encoding() -> None:
+    assert negotiate_encoding(None, ["br", "gzip"]) == None
+    assert negotiate_encoding("gzip, deflate", ["br", "gzip"]) == "gzip"
+    assert negotiate_encoding("gzip;q=0.5, br", ["br", "gzip"]) == "br"
+    assert negotiate_encoding("gzip, br", ["br", "gzip"]) == "br"
+    assert negotiate_encoding("*;q=0.1, gzip;q=0", ["gzip"]) == None
+    assert negotiate_encoding("identity", ["gzip"]) == None
+
+
+def test_etag_encoding() -> None:
+    etag = add_etag_encoding('"abc"', "gzip")
+
+    assert etag == '"abc-gzip"'
+    assert etag_matches(etag, '"abc"')
+    assert not etag_matches('"abc-deflate"', '"abc"')
+
+
+@pytest.mark.asyncio
+async def test_compression_middleware() -> None:
+    body = b'{"result": [' + b'{"kleymo": "A1B2"},' * 1000 + b"]}"
+
+    messages = await call(CompressionMiddleware(make_app([body]), prefix="/api/v1"), b"gzip")
+    headers = dict(messages[0]["headers"])
+
+    assert headers[b"content-encoding"] == b"gzip"
+    assert headers[b"etag"] == b'"abc-gzip"'
+    assert int(headers[b"content-length"]) == len(messages[1]["body"])
+    assert gzip.decompress(messages[1]["body"]) == body
+
+    messages = await call(CompressionMiddleware(make_app([b"{}"]), prefix="/api/v1"), b"gzip")
+
+    assert b"content-encoding" not in dict(messages[0]["headers"])
+    assert dict(messages[0]["headers"])[b"vary"] == b"Accept-Encoding"
+    assert messages[1]["body"] == b"{}"
+
+    for accept_encoding in (b"identity", None):
+        messages = await call(CompressionMiddleware(make_app([body]), prefix="/api/v1"), accept_encoding)
+        headers = dict(messages[0]["headers"])
+
+        assert b"content-encoding" not in headers
+        assert headers[b"vary"] == b"Accept-Encoding"
+        assert messages[1]["body"] == body
+
+    messages = await call(CompressionMiddleware(make_app([body], b"application/octet-stream")), b"gzip")
+
+    assert b"content-encoding" not in dict(messages[0]["headers"])
+    assert b"vary" not in dict(messages[0]["headers"])
+
+
+@pytest.mark.asyncio
+async def test_compression_middleware_streaming() -> None:
+    chunks = [b"kleymo,name\n", b"A1B2,Ivanov Ivan\n" * 1000, b"C3D4,Petrov Petr\n" * 1000]
+
+    messages = await call(CompressionMiddleware(make_app(chunks, b"text/csv"), offload_size=1024), b"gzip")
+    headers = dict(messages[0]["headers"])
+
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+    assert messages[-1]["more_body"] == False
+    assert zlib.decompress(b"".join(el["body"] for el in messages[1:]), 31) == b"".join(chunks)
+
+    decompressor = zlib.decompressobj(31)
+
+    for message, chunk in zip(messages[1:], chunks):
+        assert decompressor.decompress(message["body"]) == chunk
@@ -0,0 +1,27 @@
+from datetime import date, datetime
+from uuid import uuid4
+
+import pytest
+
+from src.utils.cursors import encode_cursor, decode_cursor
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [date(2024, 1, 31), uuid4()],
+        ["01ES", uuid4()],
+        [datetime(2024, 5, 1, 12, 30), 15, 1.5],
+    ]
+)
+def test_cursor_roundtrip(values: list) -> None:
+    assert decode_cursor(encode_cursor(values)) == values
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    ["", "not a cursor", encode_cursor([1])[:-2] + "!!"]
+)
+def test_invalid_cursor(cursor: str) -> None:
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
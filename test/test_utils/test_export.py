@@ -0,0 +1,27 @@
+from starlette.background import BackgroundTask
+import pytest
+
+from src.utils.export import export_response
+
+
+@pytest.mark.asyncio
+async def test_export_response_closes_partitions():
+    closed = []
+
+    async def partitions():
+        try:
+            for ident in range(10):
+                yield [{"ident": ident}]
+        finally:
+            closed.append("partitions")
+
+    async def close_session():
+        closed.append("session")
+
+    response = export_response(partitions(), "ndjson", ["ident"], "rows", BackgroundTask(close_session))
+
+    assert await anext(response.body_iterator) == b'{"ident":0}\n'
+
+    await response.background()
+
+    assert closed == ["partitions", "session"]
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from src.utils.loaders import BatchLoader
+
+
+@pytest.mark.asyncio
+async def test_batch_loader_coalesces_loads() -> None:
+    calls: list[list[int]] = []
+
+    async def batch_fn(keys: list[int]) -> list[int | None]:
+        calls.append(keys)
+        return [key * 2 if key > 0 else None for key in keys]
+
+    loader = BatchLoader(batch_fn, max_batch_size=3)
+
+    result = await loader.load_many([1, 2, 1, 3, 4, -1])
+
+    assert result == [2, 4, 2, 6, 8, None]
+    assert calls == [[1, 2, 3], [4, -1]]
+
+    assert await loader.load(2) == 4
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_loader_propagates_errors() -> None:
+    async def batch_fn(keys: list[int]) -> list[int]:
+        raise RuntimeError("db is down")
+
+    loader = BatchLoader(batch_fn)
+
+    with pytest.raises(RuntimeError):
+        await loader.load(1)
+
+
+@pytest.mark.asyncio
+async def test_batch_loader_runs_batches_sequentially() -> None:
+    active = 0
+    overlapped = False
+
+    async def batch_fn(keys: list[int]) -> list[int]:
+        nonlocal active, overlapped
+
+        active += 1
+        overlapped = overlapped or active > 1
+
+        await asyncio.sleep(0)
+
+        active -= 1
+
+        return keys[:-1] if 5 in keys else keys
+
+    loader = BatchLoader(batch_fn, max_batch_size=2)
+    futures = [loader.load(key) for key in range(6)]
+
+    loader.clear(0)
+
+    result = await asyncio.gather(*futures, return_exceptions=True)
+
+    assert not overlapped
+    assert result[:5] == [0, 1, 2, 3, 4]
+    assert isinstance(result[5], ValueError)
+
+    assert await loader.load(1) == 1
@@ -0,0 +1,39 @@
+from src.utils.metrics import Histogram, MetricsRegistry, RequestStats
+
+
+def test_histogram() -> None:
+    histogram = Histogram([0.1, 1.0])
+
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+
+    assert histogram.dump("latency", 'route="/"') == [
+        'latency_bucket{route="/",le="0.1"} 2',
+        'latency_bucket{route="/",le="1.0"} 3',
+        'latency_bucket{route="/",le="+Inf"} 4',
+        'latency_sum{route="/"} 3.65',
+        'latency_count{route="/"} 4',
+    ]
+
+
+def test_registry_render() -> None:
+    registry = MetricsRegistry(buckets=[0.1], pool_wait_buckets=[0.01])
+    stats = RequestStats()
+    stats.status = 500
+    stats.statements = 2
+    stats.rows = 10
+    stats.response_bytes = 128
+
+    registry.observe("GET", "/api/v1/welders/{ident}", 0.2, stats)
+    registry.observe("GET", "/api/v1/welders/{ident}", 0.05, RequestStats())
+
+    text = registry.render()
+    labels = 'method="GET",route="/api/v1/welders/{ident}"'
+
+    assert f"http_requests_total{{{labels}}} 2" in text
+    assert f"http_request_errors_total{{{labels}}} 1" in text
+    assert f"http_request_db_statements_total{{{labels}}} 2" in text
+    assert f"http_request_db_rows_total{{{labels}}} 10" in text
+    assert f"http_response_bytes_total{{{labels}}} 128" in text
+    assert f'http_request_duration_seconds_bucket{{{labels},le="0.1"}} 1' in text
+    assert 'db_pool_wait_seconds_count 0' in text
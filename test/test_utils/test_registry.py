@@ -0,0 +1,59 @@
+from datetime import date, datetime
+import io
+
+import pytest
+
+from src.utils.registry import REGISTRY_TARGETS, get_registry_format, iter_registry_rows, read_chunk, validate_chunk
+
+
+def test_get_registry_format() -> None:
+    assert get_registry_format("registry.CSV") == "csv"
+    assert get_registry_format("registry.xlsx") == "xlsx"
+
+    with pytest.raises(ValueError):
+        get_registry_format("registry.json")
+
+
+def test_map_header() -> None:
+    target = REGISTRY_TARGETS["welder_certifications"]
+
+    columns = target.map_header(["Клеймо", "certification_number", "Дата аттестации", "Действительно до", "Примечание", "клеймо"])
+
+    assert columns == ["kleymo", "certification_number", "certification_date", "expiration_date", None, None]
+
+    with pytest.raises(ValueError):
+        target.map_header(["Клеймо", "Дата аттестации"])
+
+
+def test_validate_chunk() -> None:
+    file = io.BytesIO("\n".join([
+        "Клеймо;Номер удостоверения;Дата аттестации;Действительно до;ГТУ;Толщина деталей от",
+        "A1B2;АЦСТ-1А-I-00001;2021-02-01;2023-02-01;ГДО, КО;2,5",
+        ";;;;;",
+        "A1B2;invalid;2021-02-01;2023-02-01;ГДО;",
+        "A1B2;АЦСТ-1А-I-00002;not a date;2023-02-01;;"
+    ]).encode())
+
+    rows = iter_registry_rows(file, "csv")
+    columns = REGISTRY_TARGETS["welder_certifications"].map_header(next(rows))
+
+    valid, rejected = validate_chunk("welder_certifications", columns, read_chunk(rows, 10), 2)
+
+    assert [number for number, _ in valid] == [2]
+    assert [error["index"] for error in rejected] == [4, 5]
+
+    row = valid[0][1]
+
+    assert row["gtd"] == ["ГДО", "КО"]
+    assert row["details_thikness_from"] == 2.5
+    assert row["expiration_date_fact"] == row["expiration_date"] == date(2023, 2, 1)
+
+
+def test_validate_chunk_cell_types() -> None:
+    columns = REGISTRY_TARGETS["ndts"].map_header(["Клеймо", "Дата сварки", "Сварено"])
+
+    valid, rejected = validate_chunk("ndts", columns, [("A1B2", datetime(2024, 5, 1), 12)], 2)
+
+    assert rejected == []
+    assert valid[0][1]["welding_date"] == date(2024, 5, 1)
+    assert valid[0][1]["total_welded"] == 12
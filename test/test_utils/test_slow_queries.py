@@ -0,0 +1,48 @@
+import json
+
+from src.utils.slow_queries import SlowQueryLog, fingerprint_statement
+
+
+class FakeCompiled:
+    positiontup = ["kleymo_1", "passport_number_1"]
+
+
+class FakeContext:
+    compiled = FakeCompiled()
+    isinsert = isupdate = isdelete = False
+
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self.info = {}
+
+
+class FakeCursor:
+    rowcount = 3
+
+
+def test_fingerprint_statement() -> None:
+    first, shape = fingerprint_statement("SELECT * FROM welder_table\n WHERE kleymo IN ($1, $2) LIMIT 10")
+    second, _ = fingerprint_statement("SELECT * FROM welder_table WHERE kleymo IN ($1) LIMIT 25")
+
+    assert first == second
+    assert shape == "SELECT * FROM welder_table WHERE kleymo IN (?) LIMIT ?"
+
+
+def test_slow_query_log(tmp_path) -> None:
+    path = tmp_path / "slow.jsonl"
+    log = SlowQueryLog(path, threshold=0, max_bytes=1024 * 1024, backups=1, redact=["passport_number"])
+
+    conn = FakeConnection()
+    statement = "SELECT * FROM welder_table WHERE kleymo = $1 AND passport_number = $2"
+
+    log._before_cursor_execute(conn, FakeCursor(), statement, ("01ES", "T15563212"), FakeContext(), False)
+    log._after_cursor_execute(conn, FakeCursor(), statement, ("01ES", "T15563212"), FakeContext(), False)
+
+    entry = json.loads(path.read_text().splitlines()[0])
+
+    assert entry["parameters"] == ["01ES", "[redacted]"]
+    assert entry["rows"] == 3
+    assert entry["route"] is None
+    assert entry["fingerprint"] == fingerprint_statement(statement)[0]
+    assert "explain" not in entry